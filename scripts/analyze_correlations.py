@@ -2,6 +2,11 @@ import re
 import os
 from collections import Counter
 
+# --- CONFIGURATION ---
+# Aggregate counts by family of near-duplicate words (see word_families.py), so that
+# variants like 'qokeedy'/'qokedy' count towards the same keyword.
+USE_WORD_FAMILIES = False
+
 def load_lexicon(filename="roots.txt"):
     """Loads the core roots lexicon into a set for fast lookups."""
     try:
@@ -34,6 +39,11 @@ def analyze_correlations(sections_dir="sections"):
     if not core_roots:
         return
 
+    families = {}
+    if USE_WORD_FAMILIES:
+        from word_families import load_families
+        families = load_families() or {}
+
     section_files = [f for f in os.listdir(sections_dir) if f.endswith('.txt')]
     if not section_files:
         print(f"❌ ERROR: No section files found in the '{sections_dir}' directory.")
@@ -48,15 +58,22 @@ def analyze_correlations(sections_dir="sections"):
         section_data[section_name] = {
             "words": words,
             "word_count": len(words),
-            "freq_dist": Counter(words)
+            "freq_dist": Counter(families.get(w, w) for w in words)
         }
 
+    # Roots are counted under their family's head, as the words are. Roots of the same family
+    # are one keyword, labelled with every root it covers
+    keywords = {}
+    for root in sorted(core_roots):
+        keywords.setdefault(families.get(root, root), []).append(root)
+
     # Step 2: For each root, calculate its relevance score for each section
     results = {section_name: {} for section_name in section_data}
     
-    for root in core_roots:
+    for family, roots in keywords.items():
+        root = family if roots == [family] else f"{family} (family of {', '.join(roots)})"
         # Calculate the total occurrences of the root across the entire manuscript
-        total_root_occurrences = sum(section['freq_dist'][root] for section in section_data.values())
+        total_root_occurrences = sum(section['freq_dist'][family] for section in section_data.values())
         total_words_in_manuscript = sum(section['word_count'] for section in section_data.values())
         
         if total_root_occurrences == 0:
@@ -70,7 +87,7 @@ def analyze_correlations(sections_dir="sections"):
                 continue
                 
             # Calculate the root's frequency within this specific section
-            section_freq = data['freq_dist'][root] / data['word_count']
+            section_freq = data['freq_dist'][family] / data['word_count']
             
             # Calculate the relevance score (a simple TF-IDF-like logic)
             # A score > 1 means the root is more frequent in this section than average.
@@ -0,0 +1,285 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from calculate_lift_final import (CONTEXT_TO_TEST, ROOTS_FILE, TRANSCRIPTION_FILE, extract_context_words,
+                                  find_longest_root, load_lexicon)
+from deep_cleaning_voynich import load_line_folios
+
+# --- CONFIGURATION ---
+REFERENCE_FILE = "voynich_super_clean.txt"
+FILES_TO_COMPARE = [
+    "generated_clean_normal_temp.txt",
+    "generated_clean_low_temp.txt",
+    "generated_clean_high_temp.txt"
+]
+N_BOOTSTRAP = 2000
+RAREFY_WORDS = 5000   # Type counts are compared as expected distinct words in a sample of this many words.
+CONFIDENCE = 0.95
+BLOCK = "line"        # 'line' or 'folio' (folios need the original transcription).
+RANDOM_SEED = 2024
+WORKERS = 4
+OUTPUT_DIR = "bootstrap"
+
+class EncodedCorpus:
+    """
+    A corpus encoded once as integer word ids, grouped into resampling blocks (lines or
+    folios). Per-type tables (length, first/last character, character counts, longest
+    root) turn a vector of word counts into every statistic with a few matrix operations.
+    """
+    def __init__(self, filename, block=BLOCK, roots=None):
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = [line.split() for line in f.read().split('\n')]
+
+        if block == "folio":
+            folios = load_line_folios(TRANSCRIPTION_FILE, [" ".join(words) for words in lines])
+            if set(folios) == {'unknown'}:
+                print("⚠️ Warning: Folios unavailable, falling back to line blocks.")
+                block_keys = list(range(len(lines)))
+            else:
+                block_keys = folios
+        else:
+            block_keys = list(range(len(lines)))
+
+        # Group consecutive lines with the same key into one block
+        blocks, previous = [], object()
+        for key, words in zip(block_keys, lines):
+            if key != previous or not blocks:
+                blocks.append([])
+                previous = key
+            blocks[-1].extend(words)
+        blocks = [b for b in blocks if b]
+
+        tokens = [w for b in blocks for w in b]
+        self.vocab, self.tokens = np.unique(np.array(tokens), return_inverse=True)
+        self.vocab = self.vocab.tolist()
+        self.index = {w: i for i, w in enumerate(self.vocab)}
+        self.block_lengths = np.array([len(b) for b in blocks])
+        self.block_starts = np.concatenate([[0], np.cumsum(self.block_lengths)[:-1]])
+        # Bigrams never span two blocks, since resampled blocks are not adjacent in the text
+        self.same_block = np.ones(len(self.tokens), dtype=bool)
+        self.same_block[np.cumsum(self.block_lengths) - 1] = False
+
+        self.alphabet = sorted({c for w in self.vocab for c in w})
+        char_index = {c: i for i, c in enumerate(self.alphabet)}
+        self.lengths = np.array([len(w) for w in self.vocab])
+        self.first_char = np.array([char_index[w[0]] for w in self.vocab])
+        self.last_char = np.array([char_index[w[-1]] for w in self.vocab])
+        self.char_matrix = np.zeros((len(self.vocab), len(self.alphabet)))
+        for i, word in enumerate(self.vocab):
+            for c in word:
+                self.char_matrix[i, char_index[c]] += 1
+        self.root_of = None
+        if roots:
+            root_index = {r: i for i, r in enumerate(roots)}
+            self.root_of = np.array([root_index.get(find_longest_root(w, roots), -1) for w in self.vocab])
+        print(f"✅ '{filename}' encoded: {len(self.tokens)} words in {len(blocks)} {block} blocks.")
+
+    def sample_positions(self, blocks):
+        """Returns the token positions of a list of block indices, concatenated."""
+        lengths = self.block_lengths[blocks]
+        offsets = np.repeat(self.block_starts[blocks] - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return offsets + np.arange(lengths.sum())
+
+class StatisticSpec:
+    """
+    The statistics printed by analyze_voynich.full_analysis (plus the lift of
+    calculate_lift_final), with the top words/bigrams/characters fixed by the reference
+    corpus so every corpus is measured on the same items.
+    """
+    def __init__(self, reference, top_words=20, top_bigrams=10, top_chars=5):
+        counts = np.bincount(reference.tokens, minlength=len(reference.vocab))
+        self.top_words = [reference.vocab[i] for i in np.argsort(-counts, kind='stable')[:top_words]]
+        pairs = reference.tokens[:-1] * len(reference.vocab) + reference.tokens[1:]
+        pair_keys, pair_counts = np.unique(pairs[reference.same_block[:-1]], return_counts=True)
+        best = pair_keys[np.argsort(-pair_counts, kind='stable')[:top_bigrams]]
+        self.top_bigrams = [(reference.vocab[k // len(reference.vocab)], reference.vocab[k % len(reference.vocab)])
+                            for k in best]
+        starts = np.bincount(reference.first_char, weights=counts, minlength=len(reference.alphabet))
+        ends = np.bincount(reference.last_char, weights=counts, minlength=len(reference.alphabet))
+        self.top_starts = [reference.alphabet[i] for i in np.argsort(-starts, kind='stable')[:top_chars]]
+        self.top_ends = [reference.alphabet[i] for i in np.argsort(-ends, kind='stable')[:top_chars]]
+
+    def names(self, with_lift=False):
+        names = [f"types_per_{RAREFY_WORDS}_words", "avg_word_length", "entropy"]
+        names += [f"freq('{w}')" for w in self.top_words]
+        names += [f"start('{c}')" for c in self.top_starts]
+        names += [f"end('{c}')" for c in self.top_ends]
+        names += [f"bigram('{a} {b}')" for a, b in self.top_bigrams]
+        if with_lift:
+            names.append(f"lift('{CONTEXT_TO_TEST['target_root']}')")
+        return names
+
+def _lookup(corpus, items):
+    return np.array([corpus.index.get(item, -1) for item in items])
+
+def rarefied_types(counts, sample_size=RAREFY_WORDS):
+    """
+    Expected number of distinct words in a random sample of `sample_size` words drawn without
+    replacement (rarefaction): sum over types of 1 - C(N - N_i, n) / C(N, n), so corpora of
+    different sizes are compared on the same sample size. Its interval comes from subsampled_types.
+    """
+    counts = counts[counts > 0].astype(np.int64)
+    total = int(counts.sum())
+    n = min(sample_size, total)
+    log_factorial = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, total + 1)))])
+    def log_choose(a, b):
+        return log_factorial[a] - log_factorial[b] - log_factorial[np.maximum(a - b, 0)]
+    rest = total - counts
+    log_missing = np.where(rest >= n, log_choose(rest, n) - log_choose(total, n), -np.inf)
+    return float(np.sum(1 - np.exp(log_missing)))
+
+def subsampled_types(corpus, rng, sample_size=RAREFY_WORDS):
+    """
+    Distinct words in the first `sample_size` words of randomly ordered blocks, drawn without
+    replacement. Resampling blocks with replacement repeats lines and so always loses types;
+    subsampling whole blocks keeps the block structure without repeats.
+    """
+    order = rng.permutation(len(corpus.block_lengths))
+    needed = np.searchsorted(np.cumsum(corpus.block_lengths[order]), min(sample_size, len(corpus.tokens))) + 1
+    positions = corpus.sample_positions(order[:needed])[:sample_size]
+    return len(np.unique(corpus.tokens[positions]))
+
+def compute_statistics(corpus, spec, positions, lift_context=None):
+    """Computes the statistic vector of the tokens at `positions` (a resample or the whole corpus)."""
+    tokens = corpus.tokens[positions]
+    counts = np.bincount(tokens, minlength=len(corpus.vocab)).astype(np.float64)
+    total = counts.sum()
+
+    char_counts = counts @ corpus.char_matrix
+    p_char = char_counts[char_counts > 0] / char_counts.sum()
+    starts = np.bincount(corpus.first_char, weights=counts, minlength=len(corpus.alphabet)) / total
+    ends = np.bincount(corpus.last_char, weights=counts, minlength=len(corpus.alphabet)) / total
+    char_ids = {c: i for i, c in enumerate(corpus.alphabet)}
+
+    word_ids = _lookup(corpus, spec.top_words)
+    word_freq = np.where(word_ids >= 0, counts[word_ids] / total, 0.0)
+
+    # Bigrams within resampled blocks: consecutive positions that were consecutive in the text
+    adjacent = corpus.same_block[positions[:-1]] & (positions[1:] == positions[:-1] + 1)
+    pairs = tokens[:-1][adjacent] * len(corpus.vocab) + tokens[1:][adjacent]
+    first_ids, second_ids = _lookup(corpus, [a for a, _ in spec.top_bigrams]), _lookup(corpus, [b for _, b in spec.top_bigrams])
+    bigram_keys = first_ids * len(corpus.vocab) + second_ids
+    bigram_freq = np.array([np.count_nonzero(pairs == k) if f >= 0 and s >= 0 else 0
+                            for k, f, s in zip(bigram_keys, first_ids, second_ids)]) / max(len(pairs), 1)
+
+    values = [
+        rarefied_types(counts),
+        counts @ corpus.lengths / total,
+        -np.sum(p_char * np.log2(p_char)),
+        *word_freq,
+        *(starts[char_ids[c]] if c in char_ids else 0.0 for c in spec.top_starts),
+        *(ends[char_ids[c]] if c in char_ids else 0.0 for c in spec.top_ends),
+        *bigram_freq,
+    ]
+    if lift_context is not None:
+        target, context_hits, context_total = lift_context
+        baseline_hits = counts[corpus.root_of == target].sum()
+        values.append((context_hits / context_total) / (baseline_hits / total) if baseline_hits else 0.0)
+    return np.array(values, dtype=np.float64)
+
+# --- Process-pool helpers: each worker receives the encoded corpus once, at start-up ---
+_worker_state = None
+
+def _init_worker(corpus, spec, lift):
+    global _worker_state
+    _worker_state = (corpus, spec, lift)
+
+def _bootstrap_chunk(args):
+    """Runs `n` replicates with an independent, reproducible random stream."""
+    seed_sequence, n = args
+    corpus, spec, lift = _worker_state
+    rng = np.random.default_rng(seed_sequence)
+    n_blocks = len(corpus.block_lengths)
+    results = []
+    for _ in range(n):
+        positions = corpus.sample_positions(rng.integers(0, n_blocks, n_blocks))
+        lift_context = None
+        if lift is not None:
+            # The context (label words) is resampled word by word alongside the baseline
+            target, context_roots = lift
+            sample = context_roots[rng.integers(0, len(context_roots), len(context_roots))]
+            lift_context = (target, np.count_nonzero(sample == target), len(sample))
+        values = compute_statistics(corpus, spec, positions, lift_context)
+        values[0] = subsampled_types(corpus, rng)
+        results.append(values)
+    return np.array(results)
+
+def load_lift_context(corpus, roots):
+    """Returns (target root id, root id of every context word) for CONTEXT_TO_TEST, or None."""
+    try:
+        with open(TRANSCRIPTION_FILE, 'r', encoding='utf-8') as f:
+            transcription_lines = f.readlines()
+    except FileNotFoundError:
+        print(f"⚠️ Warning: '{TRANSCRIPTION_FILE}' not found. The lift score will not be bootstrapped.")
+        return None
+    if CONTEXT_TO_TEST['target_root'] not in roots:
+        return None
+    root_index = {r: i for i, r in enumerate(roots)}
+    # Empty entries count towards the context size, as in calculate_lift_final.py
+    context_words = extract_context_words(transcription_lines, CONTEXT_TO_TEST['folio_prefix'])
+    if not context_words:
+        return None
+    context_roots = np.array([root_index.get(find_longest_root(w, roots), -1) if w else -1 for w in context_words])
+    return root_index[CONTEXT_TO_TEST['target_root']], context_roots
+
+def bootstrap(corpus, spec, lift=None, n_bootstrap=N_BOOTSTRAP, workers=WORKERS, seed=RANDOM_SEED):
+    """
+    Returns (point estimates, lower bounds, upper bounds) of every statistic, using a block
+    bootstrap spread across a process pool with one seeded random stream per chunk.
+    """
+    all_positions = np.arange(len(corpus.tokens))
+    point_lift = None
+    if lift is not None:
+        target, context_roots = lift
+        point_lift = (target, np.count_nonzero(context_roots == target), len(context_roots))
+    point = compute_statistics(corpus, spec, all_positions, point_lift)
+
+    chunks = workers * 4
+    sizes = [n_bootstrap // chunks + (i < n_bootstrap % chunks) for i in range(chunks)]
+    streams = np.random.SeedSequence(seed).spawn(chunks)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(corpus, spec, lift)) as pool:
+        replicates = np.vstack([r for r in pool.map(_bootstrap_chunk, zip(streams, sizes)) if len(r)])
+
+    alpha = (1 - CONFIDENCE) / 2
+    low, high = np.quantile(replicates, [alpha, 1 - alpha], axis=0)
+    return point, low, high
+
+def save_intervals(names, columns, filename):
+    """Writes one row per statistic with the estimate and CI of every corpus."""
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["statistic"] + [f"{label} {part}" for label, _ in columns for part in ("estimate", "ci_low", "ci_high")])
+        for i, name in enumerate(names):
+            row = [name]
+            for _, (point, low, high) in columns:
+                row += [f"{point[i]:.6g}", f"{low[i]:.6g}", f"{high[i]:.6g}"] if i < len(point) else ["", "", ""]
+            writer.writerow(row)
+    print(f"\n✅ Confidence intervals saved to '{filename}'")
+
+if __name__ == "__main__":
+    roots = load_lexicon(ROOTS_FILE)
+    reference = EncodedCorpus(REFERENCE_FILE, roots=roots)
+    spec = StatisticSpec(reference)
+    lift = load_lift_context(reference, roots) if roots else None
+
+    print(f"\n--- 🎲 Bootstrapping {N_BOOTSTRAP} {BLOCK} resamples per corpus ({CONFIDENCE:.0%} CIs) ---")
+    columns = [(REFERENCE_FILE, bootstrap(reference, spec, lift))]
+    for filename in FILES_TO_COMPARE:
+        if os.path.exists(filename):
+            columns.append((filename, bootstrap(EncodedCorpus(filename), spec)))
+        else:
+            print(f"⚠️ Warning: '{filename}' not found.")
+
+    names = spec.names(with_lift=lift is not None)
+    print(f"\n{'Statistic':<26}" + "".join(f" | {os.path.basename(label)[:30]:<30}" for label, _ in columns))
+    for i, name in enumerate(names):
+        cells = []
+        for _, (point, low, high) in columns:
+            cells.append(f"{point[i]:.4g} [{low[i]:.4g}, {high[i]:.4g}]" if i < len(point) else "-")
+        print(f"{name:<26}" + "".join(f" | {cell:<30}" for cell in cells))
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    save_intervals(names, columns, os.path.join(OUTPUT_DIR, "confidence_intervals.csv"))
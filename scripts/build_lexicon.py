@@ -7,6 +7,8 @@ import re
 COMMON_PREFIXES = ['ch', 'qo', 'sh', 'ok', 'da', 'o', 'c', 'q', 's', 'd']
 COMMON_SUFFIXES = ['dy', 'in', 'ey', 'ol', 'ar', 'y', 'n', 'l', 'r', 'm']
 MINIMUM_FREQUENCY = 15  # We ignore morphemes that appear fewer than 15 times to reduce noise.
+# Count each family of near-duplicate words once, through its head word (see word_families.py).
+USE_WORD_FAMILIES = False
 
 def load_words(filename="voynich_super_clean.txt"):
     """Loads the corpus and returns a list of unique words."""
@@ -68,6 +70,12 @@ def save_lexicon(counter, filename, header):
 
 if __name__ == "__main__":
     words = load_words()
+    if words and USE_WORD_FAMILIES:
+        from word_families import load_families
+        families = load_families()
+        if families:
+            words = sorted({families.get(w, w) for w in words})
+            print(f"👪 Analyzing {len(words)} word families instead of individual words.")
     if words:
         prefix_counter = Counter()
         root_counter = Counter()
@@ -29,6 +29,45 @@ def find_longest_root(word, roots):
             return root
     return None
 
+def extract_context_words(transcription_lines, folio_prefix):
+    """Extracts the words of every label line of a folio (e.g. 'f70r1') from the transcription."""
+    context_words = []
+    label_regex = re.compile(r'<' + re.escape(folio_prefix) + r'\..*?>\s*(.*)')
+    for line in transcription_lines:
+        match = label_regex.search(line)
+        if match:
+            label_text = match.group(1)
+            cleaned_text = re.sub(r'<!.*?>|[\?!,]', '', label_text).strip()
+            context_words.extend(cleaned_text.split('.'))
+    return context_words
+
+def compute_lift(target_root, context_words, all_roots, baseline_root_counts, baseline_total):
+    """
+    Computes the lift of a root in a context against the baseline root counts.
+    Returns a dict of the counts, frequencies and lift, or None if it cannot be computed.
+    """
+    context_root_counts = Counter(find_longest_root(w, all_roots) for w in context_words if w)
+    observed_in_context = context_root_counts.get(target_root, 0)
+    expected_in_baseline = baseline_root_counts.get(target_root, 0)
+
+    if expected_in_baseline == 0 or not context_words:
+        return None
+
+    observed_freq = observed_in_context / len(context_words)
+    expected_freq = expected_in_baseline / baseline_total
+
+    # Prevent division by zero if observed_freq is 0
+    lift_score = observed_freq / expected_freq if observed_freq else 0
+    return {
+        "target_root": target_root,
+        "context_words": len(context_words),
+        "observed_in_context": observed_in_context,
+        "expected_in_baseline": expected_in_baseline,
+        "observed_freq": observed_freq,
+        "expected_freq": expected_freq,
+        "lift": lift_score,
+    }
+
 def calculate_final_lift(context_info):
     """Calculates the statistical lift using a precise, line-by-line context extraction method."""
     print(f"--- Final Statistical Lift for '{context_info['target_root']}' in '{context_info['name']}' ---")
@@ -53,34 +92,19 @@ def calculate_final_lift(context_info):
         print(f"❌ ERROR: Transcription file '{TRANSCRIPTION_FILE}' not found.")
         return
         
-    context_words = []
-    label_regex = re.compile(r'<' + re.escape(context_info['folio_prefix']) + r'\..*?>\s*(.*)')
-    for line in transcription_lines:
-        match = label_regex.search(line)
-        if match:
-            label_text = match.group(1)
-            cleaned_text = re.sub(r'<!.*?>|[\?!,]', '', label_text).strip()
-            context_words.extend(cleaned_text.split('.'))
-    
-    context_root_counts = Counter(find_longest_root(w, all_roots) for w in context_words if w)
+    context_words = extract_context_words(transcription_lines, context_info['folio_prefix'])
 
     # 3. Calculate Frequencies
     target_root = context_info['target_root']
-    observed_in_context = context_root_counts.get(target_root, 0)
-    expected_in_baseline = baseline_root_counts.get(target_root, 0)
-
-    if expected_in_baseline == 0 or not context_words:
+    result = compute_lift(target_root, context_words, all_roots, baseline_root_counts, len(baseline_words))
+    if result is None:
         print("Cannot calculate lift: root not found in baseline or context is empty.")
         return
-
-    observed_freq = observed_in_context / len(context_words)
-    expected_freq = expected_in_baseline / len(baseline_words)
-
-    # Prevent division by zero if observed_freq is 0
-    if observed_freq == 0:
-        lift_score = 0
-    else:
-        lift_score = observed_freq / expected_freq
+    observed_in_context = result["observed_in_context"]
+    expected_in_baseline = result["expected_in_baseline"]
+    observed_freq = result["observed_freq"]
+    expected_freq = result["expected_freq"]
+    lift_score = result["lift"]
 
     print("\n--- Quantitative Analysis Results ---")
     print(f"  Target Root:          '{target_root}'")
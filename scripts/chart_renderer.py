@@ -0,0 +1,262 @@
+import csv
+import glob
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Figures are drawn through matplotlib.figure.Figure, never pyplot, so importing this module
+# leaves the matplotlib backend of the importing script untouched
+import matplotlib.style
+from matplotlib.figure import Figure
+
+# --- CONFIGURATION ---
+CHART_DIR = "charts"
+MANIFEST_FILE = os.path.join(CHART_DIR, "render_manifest.json")   # Data hash of every rendered chart.
+REFERENCE_FILE = "voynich_super_clean.txt"
+CORPUS_PATTERNS = [
+    REFERENCE_FILE,
+    "generated_*.txt",
+    os.path.join("sweeps", "*", "generated_temp_*.txt"),
+    os.path.join("distill", "*", "generated_temp_*.txt"),
+]
+TEMPERATURE_LABELS = {"normal": 0.7, "low": 0.5, "high": 1.2}   # As in lstm_model.py.
+LIFT_TABLE = "lift_scores.csv"   # Appendix A scores (data/lift_scores.csv), seeded by generate_lift_chart.py if missing.
+TOP_N = 25
+SHEET_COLUMNS = 4
+SHEET_FILE = os.path.join(CHART_DIR, "frequency_sheet.png")
+DPI = 300
+WORKERS = 4
+
+def _draw_frequency(ax, data, compact=False):
+    """Bar chart of the most frequent words, as drawn by analyze_voynich.visualize_frequencies."""
+    positions = range(len(data["labels"]))
+    ax.bar(positions, data["values"], color='#008080')
+    ax.set_xticks(positions, data["labels"], rotation=45, ha='right', fontsize=7 if compact else None)
+    ax.set_title(data["title"], fontsize=10 if compact else 16)
+    if not compact:
+        ax.set_xlabel(f"Top {len(data['labels'])} Most Frequent Words", fontsize=12)
+        ax.set_ylabel("Frequency", fontsize=12)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+def _draw_lift(ax, data, compact=False):
+    """Lift scores as bars, one color per group of roots, with the no-correlation baseline."""
+    position = 0
+    for series in data["series"]:
+        positions = range(position, position + len(series["labels"]))
+        ax.bar(positions, series["values"], color=series["color"], label=series["name"])
+        position += len(series["labels"])
+    labels = [label for series in data["series"] for label in series["labels"]]
+    ax.set_xticks(range(len(labels)), labels)
+    # Anything above this line has a positive correlation.
+    ax.axhline(y=1.0, color='r', linestyle='--', linewidth=1.5, label='Baseline (No Correlation)')
+    ax.set_title(data["title"], fontsize=10 if compact else 16)
+    ax.set_xlabel('Core Root', fontsize=12)
+    ax.set_ylabel('Statistical Lift Score', fontsize=12)
+    values = [v for series in data["series"] for v in series["values"]]
+    ax.set_ylim(bottom=0, top=max(values + [1.0]) * 1.15)
+    ax.legend()
+
+def _draw_curves(ax, data, compact=False):
+    """One line per series ({"name", "x", "y"}) on shared axes, optionally log-scaled."""
+    for series in data["series"]:
+        ax.plot(series["x"], series["y"], label=series["name"])
+    if data.get("log_x"):
+        ax.set_xscale("log")
+    if data.get("log_y"):
+        ax.set_yscale("log")
+    ax.set_title(data["title"], fontsize=10 if compact else 14)
+    ax.set_xlabel(data["xlabel"], fontsize=9 if compact else 12)
+    ax.set_ylabel(data["ylabel"], fontsize=9 if compact else 12)
+    ax.grid(linestyle='--', alpha=0.7)
+    if data.get("legend", not compact):
+        ax.legend(fontsize=7 if compact else 9)
+
+# Every template is drawn into a figure created once per worker and cleared between charts.
+TEMPLATES = {
+    "frequency": {"figsize": (12, 7), "style": "default", "draw": _draw_frequency, "bbox_inches": None},
+    "lift": {"figsize": (10, 6), "style": "seaborn-v0_8-whitegrid", "draw": _draw_lift, "bbox_inches": "tight"},
+    "curves": {"figsize": (10, 7), "style": "default", "draw": _draw_curves, "bbox_inches": None},
+}
+SHEET_PANEL_SIZE = (4.5, 3.2)
+
+_figures = {}
+
+def _figure(key, figsize, rows=1, columns=1):
+    """Returns the reusable (figure, axes) of a template in this process, with cleared axes."""
+    if key not in _figures:
+        figure = Figure(figsize=figsize)
+        axes = figure.subplots(rows, columns, squeeze=False).flatten()
+        _figures[key] = (figure, axes)
+    figure, axes = _figures[key]
+    for ax in axes:
+        ax.cla()
+        ax.set_visible(True)
+    return figure, axes
+
+def chart_hash(job):
+    """Hash of everything a chart is drawn from, so an unchanged chart is not redrawn."""
+    payload = json.dumps({"job": job, "dpi": DPI}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def render_chart(job):
+    """
+    Draws one chart job ({"template", "output", "data"}) and saves it. A "sheet" job draws
+    the panels of one template as small multiples in a single figure.
+    Returns the output path, or None if the chart failed.
+    """
+    try:
+        if job["template"] == "sheet":
+            data = job["data"]
+            template = TEMPLATES[data["panel_template"]]
+            columns = min(data["columns"], len(data["panels"]))
+            rows = -(-len(data["panels"]) // columns)
+            with matplotlib.style.context(template["style"]):
+                figure, axes = _figure(("sheet", data["panel_template"], rows, columns),
+                                       (SHEET_PANEL_SIZE[0] * columns, SHEET_PANEL_SIZE[1] * rows + 0.6),
+                                       rows, columns)
+                for ax, panel in zip(axes, data["panels"]):
+                    template["draw"](ax, panel, compact=True)
+                for ax in axes[len(data["panels"]):]:
+                    ax.set_visible(False)
+                figure.suptitle(data["title"], fontsize=16)
+                figure.tight_layout()
+                figure.savefig(job["output"], dpi=DPI)
+        else:
+            template = TEMPLATES[job["template"]]
+            with matplotlib.style.context(template["style"]):
+                figure, (ax,) = _figure(job["template"], template["figsize"])
+                template["draw"](ax, job["data"])
+                if template["bbox_inches"] is None:
+                    figure.tight_layout()
+                figure.savefig(job["output"], dpi=DPI, bbox_inches=template["bbox_inches"])
+        return job["output"]
+    except Exception as e:
+        print(f"❌ Charting error for '{job['output']}': {e}")
+        return None
+
+def load_manifest(filename=MANIFEST_FILE):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def render_charts(jobs, workers=WORKERS, manifest_file=MANIFEST_FILE):
+    """
+    Renders a batch of chart jobs across a process pool. Charts whose data hash matches the
+    manifest (and whose file still exists) are skipped. Returns the paths rendered.
+    """
+    manifest = load_manifest(manifest_file)
+    hashes = {job["output"]: chart_hash(job) for job in jobs}
+    todo = [job for job in jobs if manifest.get(job["output"]) != hashes[job["output"]]
+            or not os.path.exists(job["output"])]
+    if len(todo) < len(jobs):
+        print(f"⏭️ {len(jobs) - len(todo)} of {len(jobs)} charts unchanged, skipped.")
+    for directory in {os.path.dirname(job["output"]) for job in todo}:
+        os.makedirs(directory or ".", exist_ok=True)
+
+    if workers > 1 and len(todo) > 1:
+        # Large chunks let each worker reuse its figures over many charts
+        chunksize = max(1, len(todo) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(render_chart, todo, chunksize=chunksize))
+    else:
+        rendered = [render_chart(job) for job in todo]
+
+    for output in rendered:
+        if output:
+            manifest[output] = hashes[output]
+            print(f"✅ Chart saved as '{output}'")
+    os.makedirs(os.path.dirname(manifest_file) or ".", exist_ok=True)
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return [output for output in rendered if output]
+
+def describe_corpus(filename):
+    """A readable description of a corpus file, e.g. 'Generated Text, Temp 0.7'."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    if os.path.basename(filename) == REFERENCE_FILE:
+        description = 'Original "Super-Clean" Text'
+    elif match := re.fullmatch(r'generated_(\w+?)_(normal|low|high)_temp', stem):
+        kind = [] if match.group(1) == "clean" else [match.group(1)]
+        description = ", ".join(["Generated Text"] + kind + [f"Temp {TEMPERATURE_LABELS[match.group(2)]}"])
+    elif match := re.fullmatch(r'generated_temp_([\d.]+)', stem):
+        description = f"Generated Text, Temp {match.group(1)}"
+    else:
+        description = stem
+    directory = os.path.basename(os.path.dirname(filename))
+    return f"{description}\n{directory}" if directory else description
+
+def frequency_job(word_counts, filename, top_n=TOP_N, chart_dir=CHART_DIR):
+    """The word-frequency chart job of a corpus, from its word counts."""
+    common_words = word_counts.most_common(top_n)
+    name = os.path.splitext(os.path.normpath(filename))[0].replace(os.sep, "_")
+    return {
+        "template": "frequency",
+        "output": os.path.join(chart_dir, f"frequency_chart_{name}.png"),
+        "data": {
+            "title": f"Word Frequency Distribution ({describe_corpus(filename)})",
+            "corpus": describe_corpus(filename),
+            "labels": [w for w, _ in common_words],
+            "values": [c for _, c in common_words],
+        }
+    }
+
+def sheet_job(jobs, title, output, columns=SHEET_COLUMNS):
+    """Small multiples: the charts of several jobs of one template side by side in one figure."""
+    panels = [dict(job["data"], title=job["data"].get("corpus", job["data"]["title"])) for job in jobs]
+    return {
+        "template": "sheet",
+        "output": output,
+        "data": {"title": title, "panel_template": jobs[0]["template"], "panels": panels, "columns": columns},
+    }
+
+LIFT_TITLE = 'Statistical Lift Score of Planetary Roots in Zodiacal Contexts'
+
+def lift_chart_job(rows, title=LIFT_TITLE, output=os.path.join(CHART_DIR, "lift_score_chart.png")):
+    """The lift chart job from lift table rows ({"root", "group", "lift"}), bars grouped by group."""
+    colors = {"Planetary Roots": '#008080', "Neutral Control Root": 'grey'}
+    series = {}
+    for row in rows:
+        entry = series.setdefault(row["group"], {"name": row["group"], "color": colors.get(row["group"], '#4c72b0'),
+                                                 "labels": [], "values": []})
+        entry["labels"].append(row["root"])
+        entry["values"].append(round(float(row["lift"]), 4))
+    return {
+        "template": "lift",
+        "output": output,
+        "data": {"title": title, "series": list(series.values())},
+    }
+
+def read_lift_table(filename=LIFT_TABLE):
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    except FileNotFoundError:
+        return None
+
+def _word_frequencies(filename, top_n=TOP_N):
+    """Worker: the top word counts of a corpus."""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return Counter(dict(Counter(f.read().split()).most_common(top_n)))
+
+if __name__ == "__main__":
+    files = sorted({f for pattern in CORPUS_PATTERNS for f in glob.glob(pattern)},
+                   key=lambda f: (f != REFERENCE_FILE, f))
+    print(f"--- 📊 Rendering charts for {len(files)} corpora ({WORKERS} workers) ---")
+    with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+        tables = list(pool.map(_word_frequencies, files))
+
+    jobs = [frequency_job(counts, f) for f, counts in zip(files, tables) if counts]
+    if len(jobs) > 1:
+        jobs.append(sheet_job(jobs, "Word Frequency Distributions", SHEET_FILE))
+    lift_rows = read_lift_table()
+    if lift_rows:
+        jobs.append(lift_chart_job(lift_rows))
+    else:
+        print(f"⚠️ Lift table '{LIFT_TABLE}' not found; run generate_lift_chart.py for the lift chart.")
+    rendered = render_charts(jobs)
+    print(f"\n✅ {len(rendered)} charts rendered.")
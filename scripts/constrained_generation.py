@@ -0,0 +1,110 @@
+import time
+
+import numpy as np
+
+from nearest_word_index import enumerate_legal_words
+from validate_word import VoynichValidator
+
+# --- CONFIGURATION ---
+BENCHMARK_CHARACTERS = 5000   # Characters generated per mode when comparing throughput.
+TEMPERATURES = [("normal", 0.7), ("low", 0.5), ("high", 1.2)]
+START_SEED = "daiin "
+MASKED_LOGIT = -1e9           # Added to the logits of forbidden characters.
+
+class GrammarAutomaton:
+    """
+    A prefix-closed trie of every legal word. Each node is a state of the partial word
+    being generated; the characters allowed from a state are its children, plus a word
+    separator when the node completes a legal word. Masks are cached per state.
+    """
+    FREE = -1  # Unconstrained state, used after a seed word that is not in the language.
+
+    def __init__(self, words, vocab):
+        self.vocab = list(vocab)
+        self.separators = [c for c in self.vocab if c.isspace()]
+        self.children = [{}]
+        self.terminal = [False]
+        for word in words:
+            node = 0
+            for char in word:
+                if char not in self.children[node]:
+                    self.children[node][char] = len(self.children)
+                    self.children.append({})
+                    self.terminal.append(False)
+                node = self.children[node][char]
+            self.terminal[node] = True
+        self.start_state = 0
+        self._masks = {}
+        print(f"✅ Grammar automaton built: {len(words)} words, {len(self.children)} states.")
+
+    def step(self, state, char):
+        """Returns the state reached after emitting `char`."""
+        if char.isspace():
+            return self.start_state
+        if state == self.FREE:
+            return self.FREE
+        return self.children[state].get(char, self.FREE)
+
+    def feed(self, state, text):
+        for char in text:
+            state = self.step(state, char)
+        return state
+
+    def allowed(self, state):
+        """Returns the characters that may follow a state."""
+        if state == self.FREE:
+            return set(self.vocab)
+        allowed = set(self.children[state])
+        if self.terminal[state]:
+            allowed.update(self.separators)
+        return allowed
+
+    def logit_mask(self, state):
+        """Returns (and caches) an additive logit mask over the vocabulary for a state."""
+        mask = self._masks.get(state)
+        if mask is None:
+            allowed = self.allowed(state)
+            mask = np.array([0.0 if c in allowed else MASKED_LOGIT for c in self.vocab], dtype=np.float32)
+            self._masks[state] = mask
+        return mask
+
+def build_automaton(validator, vocab):
+    """Builds the automaton over the legal language enumerated from lexicon/ and rules/."""
+    legal_words = enumerate_legal_words(validator)
+    # Words using a character the model cannot produce are unreachable anyway
+    legal_words = {w for w in legal_words if set(w) <= set(vocab)}
+    return GrammarAutomaton(sorted(legal_words), vocab)
+
+def valid_word_rate(text, validator):
+    """Returns (valid words, total words) according to the validator."""
+    words = text.split()
+    return sum(1 for w in words if validator.check_word(w)[0]), len(words)
+
+if __name__ == "__main__":
+    # TensorFlow is only needed to actually generate
+    from lstm_model import generate_text, load_trained_model, load_vocabulary, reset_model_states
+
+    validator = VoynichValidator()
+    if validator.is_ready:
+        text, vocab, char2idx, idx2char = load_vocabulary()
+        model = load_trained_model(len(vocab))
+        automaton = build_automaton(validator, vocab)
+
+        print("\n--- ⚖️ Throughput of valid text per CPU-second (temp 1.2) ---")
+        for label, constraint in [("free", None), ("constrained", automaton)]:
+            reset_model_states(model)
+            started = time.process_time()
+            sample = generate_text(model, START_SEED, char2idx, idx2char, BENCHMARK_CHARACTERS, 1.2,
+                                   automaton=constraint)
+            elapsed = time.process_time() - started
+            valid, total = valid_word_rate(sample, validator)
+            print(f"  {label:<12} | {valid}/{total} valid words | {valid / elapsed:.1f} valid words per CPU-second")
+
+        for label, temperature in TEMPERATURES:
+            print(f"\nGenerating constrained text at {label} temperature ({temperature})...")
+            reset_model_states(model)
+            generated = generate_text(model, START_SEED, char2idx, idx2char, temp=temperature, automaton=automaton)
+            output_file = f"generated_constrained_{label}_temp.txt"
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(generated)
+            print(f"✅ Text at temp {temperature} saved to '{output_file}'.")
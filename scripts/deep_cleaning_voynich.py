@@ -1,6 +1,65 @@
 import re
 import os
 
+def parse_folio(line):
+    """Returns the folio of a transcription line (e.g. 'f70r1' for '<f70r1.3,@Lz;H>'), or None."""
+    match = re.match(r'\s*<(f\d+[rv]\d*)[.>]', line)
+    return match.group(1) if match else None
+
+def clean_line(line):
+    """
+    Applies the deep-cleaning rules to a single transcription line.
+    Returns the cleaned text, or None if the line holds no text.
+    """
+    # Skip lines that are entirely comments or empty
+    if line.strip().startswith('#') or not line.strip():
+        return None
+
+    # Isolate the textual part of the line (everything after the first '>')
+    try:
+        text_part = line.split('>', 1)[1]
+    except IndexError:
+        # If a line has no '>', it might be a stray comment or error, skip it
+        return None
+
+    # --- AGGRESSIVE CLEANING RULES ---
+    # Remove all bracketed content: [source], <tag>, {illegible}, (comment)
+    cleaned_line = re.sub(r'\[.*?\]', '', text_part)
+    cleaned_line = re.sub(r'<[^>]*>', '', cleaned_line)
+    cleaned_line = re.sub(r'\{.*?\}', '', cleaned_line)
+    cleaned_line = re.sub(r'\(.*?\)', '', cleaned_line)
+
+    # Remove special characters used for notes or errors
+    cleaned_line = re.sub(r'[!%$?\'*,]', '', cleaned_line)
+
+    # Standardize word separators: replace dots with spaces
+    cleaned_line = cleaned_line.replace('.', ' ')
+
+    # Remove any resulting multiple spaces and strip whitespace from ends
+    cleaned_line = re.sub(r'\s+', ' ', cleaned_line).strip()
+
+    return cleaned_line or None
+
+def load_line_folios(transcription_file, clean_lines):
+    """
+    Re-runs the deep-cleaning rules on the original transcription to recover the folio
+    of every line of the cleaned corpus. Returns a list aligned with `clean_lines`
+    ('unknown' where the files cannot be matched).
+    """
+    try:
+        with open(transcription_file, 'r', encoding='utf-8') as f:
+            located = [(parse_folio(line), clean_line(line)) for line in f]
+    except FileNotFoundError:
+        print(f"⚠️ Warning: Transcription file '{transcription_file}' not found. Folios will be 'unknown'.")
+        return ['unknown'] * len(clean_lines)
+
+    located = [(folio, text) for folio, text in located if text]
+    if [text for _, text in located] != clean_lines:
+        print(f"⚠️ Warning: '{transcription_file}' does not match the cleaned corpus line by line. "
+              "Folios will be 'unknown'.")
+        return ['unknown'] * len(clean_lines)
+    return [folio or 'unknown' for folio, _ in located]
+
 def final_deep_cleaner(source_file: str, destination_file: str):
     """
     Performs a final, robust cleanup of the Voynich transcription file,
@@ -17,33 +76,7 @@ def final_deep_cleaner(source_file: str, destination_file: str):
 
         cleaned_text_lines = []
         for line in lines:
-            # Skip lines that are entirely comments or empty
-            if line.strip().startswith('#') or not line.strip():
-                continue
-
-            # Isolate the textual part of the line (everything after the first '>')
-            try:
-                text_part = line.split('>', 1)[1]
-            except IndexError:
-                # If a line has no '>', it might be a stray comment or error, skip it
-                continue
-
-            # --- AGGRESSIVE CLEANING RULES ---
-            # Remove all bracketed content: [source], <tag>, {illegible}, (comment)
-            cleaned_line = re.sub(r'\[.*?\]', '', text_part)
-            cleaned_line = re.sub(r'<[^>]*>', '', cleaned_line)
-            cleaned_line = re.sub(r'\{.*?\}', '', cleaned_line)
-            cleaned_line = re.sub(r'\(.*?\)', '', cleaned_line)
-
-            # Remove special characters used for notes or errors
-            cleaned_line = re.sub(r'[!%$?\'*,]', '', cleaned_line)
-
-            # Standardize word separators: replace dots with spaces
-            cleaned_line = cleaned_line.replace('.', ' ')
-
-            # Remove any resulting multiple spaces and strip whitespace from ends
-            cleaned_line = re.sub(r'\s+', ' ', cleaned_line).strip()
-
+            cleaned_line = clean_line(line)
             if cleaned_line:
                 cleaned_text_lines.append(cleaned_line)
 
@@ -0,0 +1,250 @@
+import csv
+import os
+import time
+
+import numpy as np
+
+from analyze_voynich import text_statistics
+from sweep_lstm import job_name
+
+# --- CONFIGURATION ---
+# Students trained on the soft predictions of the notebook's 1024-unit LSTM (the teacher).
+STUDENTS = [
+    {"cell": "lstm", "embedding_dim": 128, "rnn_units": 256},
+    {"cell": "gru", "embedding_dim": 128, "rnn_units": 256},
+    {"cell": "lstm", "embedding_dim": 64, "rnn_units": 128},
+    {"cell": "gru", "embedding_dim": 64, "rnn_units": 128},
+]
+DISTILL_TEMPERATURE = 2.0  # Softens the teacher's logits so the students also learn its "second choices".
+ALPHA = 0.7                # Weight of the soft (teacher) loss; the rest goes to the true next character.
+STUDENT_EPOCHS = 20
+SEQ_LENGTH = 100
+BATCH_SIZE = 64
+TEACHER_BATCH_SIZE = 256   # Sequences scored per teacher forward pass.
+TEMPERATURES = [0.7]       # Sampling temperatures at which students are compared with the teacher.
+NUM_GENERATE = 50000
+START_SEED = "daiin "
+# A student is "indistinguishable" when, for every compared statistic, its median distance to the
+# teacher's samples is within the NOISE_QUANTILE of the distances between the teacher's own samples.
+# With 10 samples and the 95% quantile, a fresh teacher sample passes about 93% of the time
+# (simulated with resampled corpus words); fewer samples make the thresholds too noisy.
+TEACHER_SAMPLES = 10
+NOISE_QUANTILE = 0.95
+COMPARED_STATS = ("entropy_diff", "avg_word_length_diff", "word_js")
+DISTILL_DIR = "distill"
+RESULTS_FILE = os.path.join(DISTILL_DIR, "results.csv")
+
+def js_divergence(counts_a, counts_b):
+    """Jensen-Shannon divergence (in bits, 0 to 1) between two frequency Counters."""
+    keys = list(set(counts_a) | set(counts_b))
+    p = np.array([counts_a.get(k, 0) for k in keys], dtype=np.float64)
+    q = np.array([counts_b.get(k, 0) for k in keys], dtype=np.float64)
+    p, q = p / p.sum(), q / q.sum()
+    m = (p + q) / 2
+    def kl(x):
+        nonzero = x > 0
+        return np.sum(x[nonzero] * np.log2(x[nonzero] / m[nonzero]))
+    return float((kl(p) + kl(q)) / 2)
+
+def compare_statistics(reference, stats, top_n=20):
+    """
+    Distances between the text_statistics of two texts: absolute differences of entropy and
+    average word length, relative difference of vocabulary size, Jensen-Shannon divergence of
+    the word frequencies and the share of the reference's top words missing from the other top list.
+    """
+    reference_top = {w for w, _ in reference["word_counts"].most_common(top_n)}
+    top = {w for w, _ in stats["word_counts"].most_common(top_n)}
+    return {
+        "entropy_diff": abs(stats["entropy"] - reference["entropy"]),
+        "avg_word_length_diff": abs(stats["avg_word_length"] - reference["avg_word_length"]),
+        "unique_words_diff": abs(stats["unique_words"] - reference["unique_words"]) / reference["unique_words"],
+        "word_js": js_divergence(reference["word_counts"], stats["word_counts"]),
+        "top_words_missed": len(reference_top - top) / len(reference_top),
+    }
+
+def noise_thresholds(teacher_stats, quantile=NOISE_QUANTILE):
+    """The quantile of every compared distance over all pairs of teacher samples."""
+    pairs = [compare_statistics(a, b) for i, a in enumerate(teacher_stats) for b in teacher_stats[i + 1:]]
+    return {key: float(np.quantile([pair[key] for pair in pairs], quantile)) for key in COMPARED_STATS}
+
+def median_distances(teacher_stats, stats):
+    """Median distance of one sample to every teacher sample, per statistic."""
+    distances = [compare_statistics(reference, stats) for reference in teacher_stats]
+    return {key: float(np.median([d[key] for d in distances])) for key in distances[0]}
+
+def is_indistinguishable(distances, thresholds):
+    """True when no compared (median) distance exceeds the teacher's own sampling-noise threshold."""
+    return all(distances[key] <= thresholds[key] for key in COMPARED_STATS)
+
+def make_sequences(text_as_int, seq_length=SEQ_LENGTH):
+    """The notebook's (input, target) character sequences, unshuffled: two (sequences, seq_length) arrays."""
+    count = len(text_as_int) // (seq_length + 1)
+    chunks = np.asarray(text_as_int[:count * (seq_length + 1)]).reshape(count, seq_length + 1)
+    return chunks[:, :-1], chunks[:, 1:]
+
+def teacher_logits(teacher, inputs, cache_file=None):
+    """Teacher logits for every input sequence, cached on disk since the teacher is the slow part."""
+    if cache_file and os.path.exists(cache_file):
+        logits = np.load(cache_file)
+        if logits.shape[:2] == inputs.shape:
+            print(f"✅ Teacher logits loaded from '{cache_file}'.")
+            return logits
+    print(f"🧑‍🏫 Scoring {len(inputs)} sequences with the teacher...")
+    logits = teacher.predict(inputs, batch_size=TEACHER_BATCH_SIZE, verbose=0).astype(np.float32)
+    if cache_file:
+        np.save(cache_file, logits)
+        print(f"✅ Teacher logits saved to '{cache_file}'.")
+    return logits
+
+def distillation_loss(temperature=DISTILL_TEMPERATURE, alpha=ALPHA):
+    """
+    Keras loss for targets packed as [true next character id, teacher logits...] along the
+    last axis: alpha * T^2 * KL(teacher_T || student_T) + (1 - alpha) * cross-entropy.
+    The T^2 factor keeps the soft-loss gradients on the same scale for any temperature.
+    """
+    import tensorflow as tf
+
+    def loss(packed, logits):
+        labels = tf.cast(packed[..., 0], tf.int32)
+        soft_targets = tf.nn.softmax(packed[..., 1:] / temperature)
+        log_student = tf.nn.log_softmax(logits / temperature)
+        log_teacher = tf.math.log(soft_targets + 1e-12)
+        soft = tf.reduce_sum(soft_targets * (log_teacher - log_student), axis=-1) * temperature ** 2
+        hard = tf.keras.losses.sparse_categorical_crossentropy(labels, logits, from_logits=True)
+        return alpha * soft + (1 - alpha) * hard
+    return loss
+
+def train_student(config, inputs, targets, logits, vocab_size, distill_dir=DISTILL_DIR, epochs=STUDENT_EPOCHS):
+    """Trains one student on the teacher's logits (skipped when its final checkpoint exists)."""
+    import tensorflow as tf
+    from lstm_model import BUFFER_SIZE, build_model, checkpoint_path
+
+    student_dir = os.path.join(distill_dir, job_name(config))
+    if os.path.exists(checkpoint_path(epochs, student_dir)):
+        print(f"✅ Student '{job_name(config)}' already trained.")
+        return student_dir
+    os.makedirs(student_dir, exist_ok=True)
+
+    packed = np.concatenate([targets[..., None].astype(np.float32), logits], axis=-1)
+    dataset = tf.data.Dataset.from_tensor_slices((inputs, packed))
+    dataset = dataset.shuffle(BUFFER_SIZE).batch(BATCH_SIZE, drop_remainder=True)
+    # Sequences are shuffled, so the student is trained without carrying state between batches
+    model = build_model(vocab_size, config["embedding_dim"], config["rnn_units"], BATCH_SIZE,
+                        stateful=False, cell=config["cell"])
+    model.compile(optimizer='adam', loss=distillation_loss())
+    callbacks = [
+        tf.keras.callbacks.ModelCheckpoint(filepath=os.path.join(student_dir, "ckpt_{epoch}.weights.h5"),
+                                           save_weights_only=True),
+        tf.keras.callbacks.CSVLogger(os.path.join(student_dir, "training_log.csv"))
+    ]
+    print(f"\n🎓 Training student '{job_name(config)}' ({model.count_params()} parameters)...")
+    model.fit(dataset, epochs=epochs, callbacks=callbacks, verbose=2)
+    return student_dir
+
+def sample(model, char2idx, idx2char, temperature, output_file, num_generate=NUM_GENERATE):
+    """Generates one sample. Returns (text_statistics of the sample, characters per second)."""
+    from lstm_model import generate_text, reset_model_states
+
+    reset_model_states(model)
+    started = time.perf_counter()
+    generated = generate_text(model, START_SEED, char2idx, idx2char, num_generate, temperature)
+    elapsed = time.perf_counter() - started
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(generated)
+    return text_statistics(generated.split()), len(generated) / elapsed
+
+def evaluate(students, vocab_size, char2idx, idx2char, temperatures=TEMPERATURES, distill_dir=DISTILL_DIR,
+             teacher_samples=TEACHER_SAMPLES):
+    """
+    Samples the teacher several times and every student once at each temperature. Each sample
+    is compared with every teacher sample; the teacher's pairwise distances set the thresholds.
+    Returns one result row per model and temperature.
+    """
+    from lstm_model import build_model, checkpoint_path, load_trained_model
+
+    teacher = load_trained_model(vocab_size)
+    rows = []
+    for temperature in temperatures:
+        print(f"\n--- 🌡️ Temperature {temperature} ---")
+        teacher_stats, speeds = [], []
+        for i in range(teacher_samples):
+            stats, speed = sample(teacher, char2idx, idx2char, temperature,
+                                  os.path.join(distill_dir, f"teacher_temp_{temperature}_{i}.txt"))
+            teacher_stats.append(stats)
+            speeds.append(speed)
+        teacher_speed = float(np.median(speeds))
+        thresholds = noise_thresholds(teacher_stats)
+        # Calibration: how often a teacher sample passes against the other teacher samples
+        self_passes = [is_indistinguishable(median_distances(teacher_stats[:i] + teacher_stats[i + 1:], stats),
+                                            thresholds) for i, stats in enumerate(teacher_stats)]
+        teacher_distances = {key: float(np.median([compare_statistics(a, b)[key]
+                                                   for i, a in enumerate(teacher_stats) for b in teacher_stats[i + 1:]]))
+                             for key in compare_statistics(teacher_stats[0], teacher_stats[1])}
+        rows.append({"model": "teacher", "parameters": teacher.count_params(), "temperature": temperature,
+                     "chars_per_second": round(teacher_speed, 1), "speedup": 1.0,
+                     **{key: round(value, 5) for key, value in teacher_distances.items()},
+                     "indistinguishable": all(self_passes)})
+        print(f"Teacher: {teacher_speed:.0f} chars/s, thresholds ({NOISE_QUANTILE:.0%} of {teacher_samples} samples' "
+              f"pairwise distances): " + ", ".join(f"{key} {value:.4f}" for key, value in thresholds.items()))
+        print(f"Teacher samples passing against the others: {sum(self_passes)}/{len(self_passes)}")
+
+        for config in students:
+            name = job_name(config)
+            model = build_model(vocab_size, config["embedding_dim"], config["rnn_units"], cell=config["cell"])
+            model.load_weights(checkpoint_path(STUDENT_EPOCHS, os.path.join(distill_dir, name)))
+            stats, speed = sample(model, char2idx, idx2char, temperature,
+                                  os.path.join(distill_dir, name, f"generated_temp_{temperature}.txt"))
+            distances = median_distances(teacher_stats, stats)
+            rows.append({"model": name, "parameters": model.count_params(), "temperature": temperature,
+                         "chars_per_second": round(speed, 1), "speedup": round(speed / teacher_speed, 2),
+                         **{key: round(value, 5) for key, value in distances.items()},
+                         "indistinguishable": is_indistinguishable(distances, thresholds)})
+            print(f"{name}: {speed:.0f} chars/s, median word JS to the teacher {distances['word_js']:.4f} bits")
+    return rows
+
+def save_results(rows, filename=RESULTS_FILE):
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ Results table saved to '{filename}' ({len(rows)} rows)")
+
+if __name__ == "__main__":
+    from lstm_model import load_trained_model, load_vocabulary
+
+    print(f"--- ⚗️ Distilling the 1024-unit LSTM into {len(STUDENTS)} students ---")
+    os.makedirs(DISTILL_DIR, exist_ok=True)
+    text, vocab, char2idx, idx2char = load_vocabulary()
+    inputs, targets = make_sequences(np.array([char2idx[c] for c in text]))
+
+    # 1. Soft targets from the teacher, scored in large non-stateful batches
+    teacher = load_trained_model(len(vocab), batch_size=TEACHER_BATCH_SIZE, stateful=False)
+    logits = teacher_logits(teacher, inputs, os.path.join(DISTILL_DIR, "teacher_logits.npy"))
+    del teacher
+
+    # 2. Students
+    for config in STUDENTS:
+        train_student(config, inputs, targets, logits, len(vocab))
+
+    # 3. Speed and statistical comparison with the teacher
+    rows = evaluate(STUDENTS, len(vocab), char2idx, idx2char)
+    save_results(rows)
+
+    print(f"\n{'Model':<45} | {'Params':>9} | {'Temp':>4} | {'chars/s':>8} | {'Speedup':>7} | "
+          f"{'Entropy diff':>12} | {'Word JS':>7} | Same?")
+    print("-" * 118)
+    for row in rows:
+        print(f"{row['model']:<45} | {row['parameters']:>9} | {row['temperature']:>4} | "
+              f"{row['chars_per_second']:>8.0f} | {row['speedup']:>6.1f}x | {row['entropy_diff']:>12.4f} | "
+              f"{row['word_js']:>7.4f} | {'✅' if row['indistinguishable'] else '❌'}")
+
+    # The smallest student that matches the teacher at every temperature
+    passing = [config for config in STUDENTS
+               if all(row["indistinguishable"] for row in rows if row["model"] == job_name(config))]
+    parameters = {row["model"]: row["parameters"] for row in rows}
+    if passing:
+        best = min(passing, key=lambda config: parameters[job_name(config)])
+        print(f"\n🏆 Smallest indistinguishable student: '{job_name(best)}' "
+              f"({parameters[job_name(best)]} parameters).")
+    else:
+        print(f"\n⚠️ No student matches the teacher within the {NOISE_QUANTILE:.0%} quantile of its own sampling noise.")
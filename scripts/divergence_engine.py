@@ -0,0 +1,305 @@
+import csv
+import glob
+import math
+import os
+import time
+from collections import Counter
+
+import numpy as np
+
+from find_grammar_rules import peel_word
+
+# --- CONFIGURATION ---
+REFERENCE_FILE = "voynich_super_clean.txt"
+FILES_TO_ANALYZE = [
+    "generated_clean_normal_temp.txt",
+    "generated_clean_low_temp.txt",
+    "generated_clean_high_temp.txt"
+]
+# Any other generated file or sweep/distillation sample found is scored too.
+EXTRA_FILES_PATTERNS = [
+    "generated_*.txt",
+    os.path.join("sweeps", "*", "generated_temp_*.txt"),
+    os.path.join("distill", "*", "generated_temp_*.txt"),
+]
+NGRAM_ORDERS = (1, 2, 3, 4)
+RANK_TOP_N = 100     # Reference's most frequent items used for the rank correlation.
+TEST_TOP_N = 50      # Reference's most frequent items kept as chi-square cells (the rest are pooled).
+SMOOTHING = 0.5      # Add-alpha smoothing of the compared corpus for KL, over the pair's joint support.
+NULL_SAMPLES = 50    # Reference samples per corpus size in each null distribution.
+NULL_SEED = 0
+NULL_SIZE_STEP = 0.05   # Corpora within ~5% of each other in size share one null distribution.
+BLOCK_SIZE = 64      # Corpora compared with the reference in one matrix operation.
+OUTPUT_DIR = "divergence"
+
+def word_features(word):
+    """Every feature of a word type, by family: character n-grams, length and peeled morphemes."""
+    prefix, root, suffix = peel_word(word)
+    features = {f"char{n}": [word[i:i + n] for i in range(len(word) - n + 1)] for n in NGRAM_ORDERS}
+    features["length"] = [len(word)]
+    # Absent morphemes ("_") are kept as a class of their own: "no prefix" is informative
+    features["prefix"] = [prefix or "_"]
+    features["root"] = [root or "_"]
+    features["suffix"] = [suffix or "_"]
+    return features
+
+class SharedVocabulary:
+    """
+    Word types of all corpora in one integer id space, with every derived feature family
+    (n-grams, lengths, morphemes) in an id space of its own. Each family maps word types to
+    features as a CSR table (pointers, feature ids), so the feature counts of a corpus are a
+    single bincount over its word counts.
+    """
+    def __init__(self):
+        self.word_ids = {}
+        self.families = {}
+
+    def add(self, word_counts):
+        """Registers the words of a corpus. Returns (word ids, counts) arrays."""
+        ids = np.fromiter((self.word_ids.setdefault(w, len(self.word_ids)) for w in word_counts),
+                          dtype=np.int64, count=len(word_counts))
+        return ids, np.fromiter(word_counts.values(), dtype=np.float64, count=len(word_counts))
+
+    def build_features(self):
+        """Builds the type -> feature tables once every corpus has been added."""
+        labels, pointers, feature_ids = {}, {}, {}
+        for word in self.word_ids:  # Insertion order, i.e. word id order
+            for family, items in word_features(word).items():
+                ids = labels.setdefault(family, {})
+                pointers.setdefault(family, [0]).append(pointers[family][-1] + len(items))
+                feature_ids.setdefault(family, []).extend(ids.setdefault(item, len(ids)) for item in items)
+        self.families = {family: (list(labels[family]), np.array(pointers[family], dtype=np.int64),
+                                  np.array(feature_ids[family], dtype=np.int64)) for family in labels}
+
+    def feature_counts(self, family, ids, counts):
+        """Counts of every feature of a family in a corpus given its (word ids, counts)."""
+        if family == "word":
+            return np.bincount(ids, weights=counts, minlength=len(self.word_ids))
+        labels, pointers, feature_ids = self.families[family]
+        starts, lengths = pointers[ids], pointers[ids + 1] - pointers[ids]
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+        return np.bincount(feature_ids[positions], weights=np.repeat(counts, lengths), minlength=len(labels))
+
+def average_ranks(matrix):
+    """Ranks along each row (1 = smallest), ties sharing their average rank."""
+    rows, columns = matrix.shape
+    order = np.argsort(matrix, axis=1, kind='stable')
+    sorted_values = np.take_along_axis(matrix, order, axis=1)
+    new_group = np.ones_like(sorted_values, dtype=bool)
+    new_group[:, 1:] = sorted_values[:, 1:] != sorted_values[:, :-1]
+    # Tie groups are numbered across all rows at once (every row starts a new group)
+    group_id = np.cumsum(new_group.ravel()) - 1
+    group_start = np.flatnonzero(new_group.ravel())
+    group_size = np.diff(np.append(group_start, new_group.size))
+    position = np.tile(np.arange(1, columns + 1), rows)
+    first_rank = position[group_start]
+    average = (first_rank + (group_size - 1) / 2)[group_id].reshape(rows, columns)
+    ranks = np.empty_like(average)
+    np.put_along_axis(ranks, order, average, axis=1)
+    return ranks
+
+def rowwise_spearman(a, b):
+    """Spearman rank correlation between matching rows of two matrices."""
+    ranks_a, ranks_b = average_ranks(a), average_ranks(b)
+    ranks_a -= ranks_a.mean(axis=1, keepdims=True)
+    ranks_b -= ranks_b.mean(axis=1, keepdims=True)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sum(ranks_a * ranks_b, axis=1) / np.sqrt(np.sum(ranks_a ** 2, axis=1) * np.sum(ranks_b ** 2, axis=1))
+
+def compare_block(reference, block, selection, include_ks=False):
+    """
+    Compares every row of a block of count vectors (one row per corpus) with a reference
+    count vector, or with its own row of a reference matrix, in the same id space.
+    `selection` (the full reference counts) picks the top items used for ranks and cells.
+    Returns a dict of per-row metric arrays. No i.i.d. p-values: words in a text are not
+    independent draws, so every metric is calibrated against reference segments instead.
+    """
+    reference = np.broadcast_to(reference, block.shape)
+    reference_totals = reference.sum(axis=1, keepdims=True)
+    totals = block.sum(axis=1, keepdims=True)
+    p, q = reference / reference_totals, block / totals
+    m = (p + q) / 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        js = 0.5 * np.sum(np.where(p > 0, p * np.log2(p / m), 0), axis=1) \
+            + 0.5 * np.sum(np.where(q > 0, q * np.log2(q / m), 0), axis=1)
+        support = (p > 0) | (block > 0)
+        smoothed = (block + SMOOTHING * support) / (totals + SMOOTHING * support.sum(axis=1, keepdims=True))
+        kl = np.sum(np.where(p > 0, p * np.log2(p / smoothed), 0), axis=1)
+
+    rank_columns = np.argsort(-selection, kind='stable')[:min(RANK_TOP_N, np.count_nonzero(selection))]
+    metrics = {"js": js, "kl": kl, "spearman": rowwise_spearman(reference[:, rank_columns], block[:, rank_columns])}
+
+    # Chi-square statistic of homogeneity: reference's top items as cells, the rest pooled
+    cells = np.argsort(-selection, kind='stable')[:min(TEST_TOP_N, np.count_nonzero(selection))]
+    observed_reference = np.column_stack([reference[:, cells], reference_totals[:, 0] - reference[:, cells].sum(axis=1)])
+    observed = np.column_stack([block[:, cells], totals[:, 0] - block[:, cells].sum(axis=1)])
+    used = (observed_reference + observed) > 0
+    grand = reference_totals + totals
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected_reference = (observed_reference + observed) * reference_totals / grand
+        expected = (observed_reference + observed) * totals / grand
+        metrics["chi2"] = np.sum(np.where(used, (observed_reference - expected_reference) ** 2 / expected_reference
+                                          + (observed - expected) ** 2 / expected, 0), axis=1)
+
+    if include_ks:
+        # Ordinal family (word lengths): Kolmogorov-Smirnov distance between the CDFs
+        metrics["ks_d"] = np.max(np.abs(np.cumsum(q, axis=1) - np.cumsum(p, axis=1)), axis=1)
+    return metrics
+
+def null_size(tokens, step=NULL_SIZE_STEP):
+    """Rounds a corpus size onto a geometric grid, so corpora of similar size share one null distribution."""
+    return int(round((1 + step) ** round(math.log(tokens) / math.log(1 + step))))
+
+def reference_segments(sequence, size, count=NULL_SAMPLES):
+    """(word ids, counts) of `count` evenly spaced contiguous reference segments of `size` tokens."""
+    starts = np.linspace(0, len(sequence) - size, count).astype(np.int64)
+    return [np.unique(sequence[start:start + size], return_counts=True) for start in starts]
+
+def reference_line_samples(sequence, line_lengths, size, rng, count=NULL_SAMPLES):
+    """
+    (word ids, counts) of `count` samples of `size` tokens made of whole reference lines drawn
+    at random, without replacement, from across the manuscript.
+    """
+    line_starts = np.cumsum(line_lengths) - line_lengths
+    samples = []
+    for _ in range(count):
+        order = rng.permutation(len(line_lengths))
+        needed = np.searchsorted(np.cumsum(line_lengths[order]), size) + 1
+        lengths = line_lengths[order[:needed]]
+        offsets = np.repeat(line_starts[order[:needed]] - (np.cumsum(lengths) - lengths), lengths)
+        positions = (offsets + np.arange(lengths.sum()))[:size]
+        samples.append(np.unique(sequence[positions], return_counts=True))
+    return samples
+
+def calibrate(value, null, higher_is_closer=False):
+    """
+    Places a metric within its null distribution: (z-score, percentile). The percentile is the
+    share of manuscript samples at least as close to the rest of the manuscript as the corpus is,
+    so about 50 is typical of the manuscript itself, 0 is closer than every sample and 100 is
+    further than every sample.
+    """
+    if higher_is_closer:
+        value, null = -value, -null
+    spread = null.std()
+    z = (value - null.mean()) / spread if spread > 0 else np.nan
+    return z, 100.0 * np.mean(null <= value)
+
+def load_corpora(files, vocabulary):
+    """Counts the words of every corpus into the shared vocabulary. Returns {file: (ids, counts)}."""
+    corpora = {}
+    for filename in files:
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                word_counts = Counter(f.read().split())
+        except FileNotFoundError:
+            print(f"❌ Error: File '{filename}' not found.")
+            continue
+        if word_counts:
+            corpora[filename] = vocabulary.add(word_counts)
+    return corpora
+
+def score_corpora(reference_file=REFERENCE_FILE, files=None, block_size=BLOCK_SIZE):
+    """
+    Scores every corpus against the reference over words, character n-grams, word lengths
+    and morphemes. Each metric is also computed between size-matched samples of the reference
+    and the rest of it (the null: how far the manuscript is from itself), and every corpus is
+    placed within two null distributions: "lines", samples of lines drawn from across the
+    manuscript, which matches text sampled from a model of the whole corpus; and "segment",
+    contiguous stretches, which also carry the section-to-section variation of the manuscript.
+    Returns one row (a dict) per corpus and family.
+    """
+    vocabulary = SharedVocabulary()
+    corpora = load_corpora([reference_file] + list(files), vocabulary)
+    if reference_file not in corpora:
+        return []
+    with open(reference_file, 'r', encoding='utf-8') as f:
+        lines = [line.split() for line in f.read().split('\n')]
+    sequence = np.array([vocabulary.word_ids[w] for words in lines for w in words], dtype=np.int64)
+    line_lengths = np.array([len(words) for words in lines if words], dtype=np.int64)
+    vocabulary.build_features()
+    print(f"✅ {len(corpora)} corpora in a shared space of {len(vocabulary.word_ids)} word types.")
+
+    others = [f for f in corpora if f != reference_file]
+    tokens = {name: int(corpora[name][1].sum()) for name in others}
+    # Held-out nulls need the rest of the reference to stay the larger part
+    sizes = sorted({null_size(n) for n in tokens.values() if null_size(n) <= len(sequence) // 2})
+    rng = np.random.default_rng(NULL_SEED)
+    samples = {"lines": {size: reference_line_samples(sequence, line_lengths, size, rng) for size in sizes},
+               "segment": {size: reference_segments(sequence, size) for size in sizes}}
+    print(f"✅ Null distributions from {NULL_SAMPLES} line samples and {NULL_SAMPLES} contiguous segments "
+          f"of the reference at {len(sizes)} corpus sizes.")
+
+    families = ["word"] + list(vocabulary.families)
+    rows = []
+    for family in families:
+        reference = vocabulary.feature_counts(family, *corpora[reference_file])
+        order = None
+        if family == "length":
+            # Lengths are compared as a distribution over 0..max, so the CDFs line up
+            order = np.argsort(vocabulary.families["length"][0])
+            reference = reference[order]
+        def counts(ids, values):
+            result = vocabulary.feature_counts(family, ids, values.astype(np.float64))
+            return result if order is None else result[order]
+
+        # Null: every sample against the reference with that sample held out
+        nulls = {kind: {} for kind in samples}
+        for kind, by_size in samples.items():
+            for size, parts in by_size.items():
+                block = np.vstack([counts(*part) for part in parts])
+                nulls[kind][size] = compare_block(reference - block, block, reference, include_ks=family == "length")
+
+        for start in range(0, len(others), block_size):
+            names = others[start:start + block_size]
+            block = np.vstack([counts(*corpora[name]) for name in names])
+            metrics = compare_block(reference, block, reference, include_ks=family == "length")
+            for row, name in enumerate(names):
+                result = {"file": name, "family": family, "tokens": tokens[name],
+                          "types": int(np.count_nonzero(block[row]))}
+                for key, values in metrics.items():
+                    result[key] = values[row].item()
+                for kind in nulls:
+                    null = nulls[kind].get(null_size(tokens[name]))
+                    if null is None:
+                        continue
+                    for key, values in metrics.items():
+                        z, percentile = calibrate(values[row], null[key], higher_is_closer=key == "spearman")
+                        result[f"{key}_{kind}_null_mean"] = float(np.nanmean(null[key]))
+                        result[f"{key}_{kind}_z"] = float(z)
+                        result[f"{key}_{kind}_percentile"] = percentile
+                rows.append(result)
+    return rows
+
+def save_scores(rows, filename):
+    keys = list(dict.fromkeys(key for row in rows for key in row))
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=keys)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: f"{value:.6g}" if isinstance(value, float) else value for key, value in row.items()})
+    print(f"\n✅ Divergence table saved to '{filename}' ({len(rows)} rows)")
+
+if __name__ == "__main__":
+    extra = sorted({f for pattern in EXTRA_FILES_PATTERNS for f in glob.glob(pattern)} - set(FILES_TO_ANALYZE))
+    files = [f for f in FILES_TO_ANALYZE + extra if f != REFERENCE_FILE]
+    print(f"--- 📐 Divergence of {len(files)} corpora from '{REFERENCE_FILE}' ---")
+    started = time.perf_counter()
+    rows = score_corpora(REFERENCE_FILE, files)
+    print(f"✅ Scored in {time.perf_counter() - started:.1f}s.")
+
+    if rows:
+        families = list(dict.fromkeys(row["family"] for row in rows))
+        # Generated text is usually further than every line sample (percentile 100), so the z-score
+        # is what still separates corpora
+        z = {(row["file"], row["family"]): row.get("js_lines_z", np.nan) for row in rows}
+        corpora = sorted({row["file"] for row in rows}, key=lambda f: np.mean([z[(f, fam)] for fam in families]))
+        print(f"\nJensen-Shannon z-score among size-matched samples of random manuscript lines "
+              f"(~0 = as close as a sample of the manuscript's own lines, positive = further; "
+              f"percentiles and the contiguous-segment null are in the table):")
+        print(f"{'File':<40} | " + " | ".join(f"{fam:>7}" for fam in families))
+        print("-" * (43 + 10 * len(families)))
+        for name in corpora[:30]:
+            print(f"{name[-40:]:<40} | " + " | ".join(f"{z[(name, fam)]:>7.1f}" for fam in families))
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        save_scores(rows, os.path.join(OUTPUT_DIR, "divergence.csv"))
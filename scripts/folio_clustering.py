@@ -0,0 +1,314 @@
+import os
+
+import numpy as np
+
+from calculate_lift_final import find_longest_root
+from calculate_lift_final import load_lexicon as load_sorted_roots
+from deep_cleaning_voynich import clean_line, parse_folio
+from find_grammar_rules import load_lexicon, peel_word
+from segment_manuscript import SECTION_MAP, get_folio_id, get_section
+
+# --- CONFIGURATION ---
+TRANSCRIPTION_FILE = "voynich.txt"
+OUTPUT_DIR = "sections_proposed"
+# Feature families are computed once; each set below is just a choice of columns
+FEATURE_SETS = {
+    "roots": ("root",),
+    "affixes": ("prefix", "suffix"),
+    "char_ngrams": ("char2", "char3"),
+    "all": ("root", "prefix", "suffix", "char2", "char3"),
+}
+N_CLUSTERS = len(SECTION_MAP)
+MIN_FOLIO_WORDS = 10     # Folios with fewer words (e.g. a lone label) are too noisy to place.
+KMEANS_RESTARTS = 10
+RANDOM_SEED = 42
+
+def load_folio_words(transcription_file=TRANSCRIPTION_FILE):
+    """
+    Reads the transcription once and returns (folio ids, words of each folio), in folio
+    order. Sub-pages like 'f70r1' are merged into their page 'f70r', as in SECTION_MAP.
+    """
+    try:
+        with open(transcription_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        print(f"❌ ERROR: Original transcription file '{transcription_file}' not found.")
+        return None, None
+
+    pages = {}
+    for line in lines:
+        folio, text = parse_folio(line), clean_line(line)
+        folio_id = get_folio_id(folio) if folio else None
+        if folio_id is not None and text:
+            pages.setdefault(folio_id, []).extend(text.split())
+    folio_ids = sorted(f for f, words in pages.items() if len(words) >= MIN_FOLIO_WORDS)
+    print(f"✅ {len(folio_ids)} folios with at least {MIN_FOLIO_WORDS} words loaded from '{transcription_file}'.")
+    return folio_ids, [pages[f] for f in folio_ids]
+
+def folio_name(folio_id):
+    return f"f{folio_id // 10}{'v' if folio_id % 10 else 'r'}"
+
+def word_features(word, family, roots, prefixes, suffixes):
+    """The features of one word type in one family, as a list of labels (repeats count)."""
+    if family == "root":
+        root = find_longest_root(word, roots)
+        return [root] if root else []
+    if family in ("prefix", "suffix"):
+        prefix, _, suffix = peel_word(word)
+        morph, valid = (prefix, prefixes) if family == "prefix" else (suffix, suffixes)
+        return [morph] if morph and morph in valid else []
+    n = int(family[-1])  # char2, char3, ...
+    padded = f"^{word}$"
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+class SparseRows:
+    """
+    A sparse CSR matrix of float weights: the entries of row `r` are data[indptr[r]:indptr[r + 1]],
+    at columns indices[...], sorted by column within each row.
+    """
+    def __init__(self, rows, columns, values, shape):
+        order = np.lexsort((columns, rows))
+        self.shape = shape
+        self.indices = np.asarray(columns, dtype=np.int64)[order]
+        self.data = np.asarray(values, dtype=np.float64)[order]
+        self.indptr = np.searchsorted(np.asarray(rows)[order], np.arange(shape[0] + 1))
+
+    def row_ids(self):
+        """The row of every stored entry."""
+        return np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    def dense_row(self, r):
+        row = np.zeros(self.shape[1])
+        row[self.indices[self.indptr[r]:self.indptr[r + 1]]] = self.data[self.indptr[r]:self.indptr[r + 1]]
+        return row
+
+    def dot(self, dense):
+        """Product with a dense (columns x m) matrix, one column of the result at a time."""
+        rows = self.row_ids()
+        return np.column_stack([np.bincount(rows, weights=self.data * dense[self.indices, c], minlength=self.shape[0])
+                                for c in range(dense.shape[1])])
+
+    def gram(self):
+        """Dot products between every pair of rows, scattering one dense row at a time."""
+        rows = self.row_ids()
+        return np.column_stack([np.bincount(rows, weights=self.data * self.dense_row(r)[self.indices],
+                                            minlength=self.shape[0]) for r in range(self.shape[0])])
+
+    def column_sums(self, row_mask):
+        """Sum of the rows selected by a boolean mask, as a dense vector."""
+        entries = row_mask[self.row_ids()]
+        return np.bincount(self.indices[entries], weights=self.data[entries], minlength=self.shape[1])
+
+class FolioFeatureMatrix:
+    """
+    Folio x feature counts for several feature families, each a sparse CSR matrix. Features
+    are extracted once per word type (a word-by-feature CSR table per family) and combined with
+    the folio-by-word counts, so building the matrix costs one pass over the tokens.
+    """
+    def __init__(self, folio_ids, folio_words, families=("root", "prefix", "suffix", "char2", "char3")):
+        self.folio_ids = list(folio_ids)
+        roots = load_sorted_roots("roots.txt") or []
+        prefixes = load_lexicon("prefixes.txt") or set()
+        suffixes = load_lexicon("suffixes.txt") or set()
+
+        tokens = [w for words in folio_words for w in words]
+        rows = np.repeat(np.arange(len(folio_words)), [len(words) for words in folio_words])
+        vocab, word_ids = np.unique(np.array(tokens), return_inverse=True)
+        # Non-zero (folio, word) cells with their counts
+        cells, cell_counts = np.unique(rows * len(vocab) + word_ids, return_counts=True)
+        cell_folios, cell_words = cells // len(vocab), cells % len(vocab)
+
+        self.labels, self.blocks = {}, {}
+        for family in families:
+            per_word = [word_features(w, family, roots, prefixes, suffixes) for w in vocab]
+            labels, feature_ids = np.unique(np.array([f for fs in per_word for f in fs] or [""]),
+                                            return_inverse=True)
+            lengths = np.array([len(fs) for fs in per_word])
+            indptr = np.concatenate([[0], np.cumsum(lengths)])
+            # Expand every (folio, word) cell into the features of its word
+            expanded = np.repeat(np.arange(len(cells)), lengths[cell_words])
+            offsets = np.arange(len(expanded)) - np.repeat(np.cumsum(lengths[cell_words]) - lengths[cell_words],
+                                                           lengths[cell_words])
+            features = feature_ids[indptr[cell_words[expanded]] + offsets]
+            # Only the non-zero (folio, feature) cells are kept
+            keys, inverse = np.unique(cell_folios[expanded] * len(labels) + features, return_inverse=True)
+            counts = np.bincount(inverse, weights=cell_counts[expanded])
+            self.blocks[family] = SparseRows(keys // len(labels), keys % len(labels), counts,
+                                             (len(folio_words), len(labels)))
+            self.labels[family] = [f"{family}:{label}" for label in labels.tolist()]
+        sizes = ", ".join(f"{family} {len(self.labels[family])}" for family in families)
+        print(f"✅ Feature matrix: {len(self.folio_ids)} folios x ({sizes}) features.")
+
+    def matrix(self, families):
+        """Returns (counts, feature labels) for a combination of feature families, side by side."""
+        rows, columns, values, offset = [], [], [], 0
+        for family in families:
+            block = self.blocks[family]
+            rows.append(block.row_ids())
+            columns.append(block.indices + offset)
+            values.append(block.data)
+            offset += block.shape[1]
+        counts = SparseRows(np.concatenate(rows), np.concatenate(columns), np.concatenate(values),
+                            (len(self.folio_ids), offset))
+        labels = [label for family in families for label in self.labels[family]]
+        return counts, labels
+
+def tfidf(counts):
+    """Sublinear TF-IDF with smoothed IDF, rows L2-normalized (so dot products are cosines)."""
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + counts.shape[0]) / (1 + df)) + 1
+    weighted = np.log1p(counts.data) * idf[counts.indices]
+    rows = counts.row_ids()
+    norms = np.sqrt(np.bincount(rows, weights=weighted ** 2, minlength=counts.shape[0]))
+    return SparseRows(rows, counts.indices, weighted / np.where(norms == 0, 1, norms)[rows], counts.shape)
+
+def cosine_similarity(vectors):
+    return vectors.gram()
+
+def kmeans(vectors, k=N_CLUSTERS, restarts=KMEANS_RESTARTS, seed=RANDOM_SEED, max_iterations=100):
+    """Spherical k-means (k-means++ seeding) on L2-normalized sparse rows; keeps the best restart."""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    best_labels, best_score = None, -np.inf
+    for _ in range(restarts):
+        centers = [vectors.dense_row(rng.integers(n))]
+        for _ in range(1, k):
+            distance = 1 - np.max(vectors.dot(np.array(centers).T), axis=1)
+            distance = np.clip(distance, 0, None)
+            probabilities = distance / distance.sum() if distance.sum() else None
+            centers.append(vectors.dense_row(rng.choice(n, p=probabilities)))
+        centers = np.array(centers)
+        labels = None
+        for _ in range(max_iterations):
+            similarity = vectors.dot(centers.T)
+            new_labels = np.argmax(similarity, axis=1)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            for c in range(k):
+                if np.any(labels == c):
+                    center = vectors.column_sums(labels == c)
+                    centers[c] = center / (np.linalg.norm(center) or 1)
+        score = np.sum(vectors.dot(centers.T)[np.arange(n), labels])
+        if score > best_score:
+            best_labels, best_score = labels, score
+    return best_labels
+
+def agglomerative(similarity, k=N_CLUSTERS, contiguous=True):
+    """
+    Ward hierarchical clustering of L2-normalized rows from their cosine similarities
+    (squared distance = 2 - 2 cos), merging until k clusters remain with Lance-Williams
+    updates on the full matrix. With `contiguous`, only neighbouring runs of folios may
+    merge, so every cluster is a folio range.
+    """
+    n = len(similarity)
+    distance = 2 - 2 * similarity.astype(np.float64)
+    np.fill_diagonal(distance, np.inf)
+    sizes = np.ones(n)
+    active = np.ones(n, dtype=bool)
+    members = [[i] for i in range(n)]
+    order = list(range(n))  # Left-to-right order of the active clusters (for contiguity)
+    while active.sum() > k:
+        if contiguous:
+            a, b = min(zip(order[:-1], order[1:]), key=lambda pair: distance[pair])
+        else:
+            masked = np.where(np.outer(active, active), distance, np.inf)
+            a, b = np.unravel_index(np.argmin(masked), masked.shape)
+        # Merge b into a: Ward's Lance-Williams update against every other cluster
+        total = sizes[a] + sizes[b] + sizes
+        merged = ((sizes[a] + sizes) * distance[a] + (sizes[b] + sizes) * distance[b] - sizes * distance[a, b]) / total
+        distance[a, :] = distance[:, a] = merged
+        distance[a, a] = np.inf
+        distance[b, :] = distance[:, b] = np.inf
+        sizes[a] += sizes[b]
+        active[b] = False
+        members[a] += members[b]
+        order.remove(b)
+    labels = np.empty(n, dtype=int)
+    for label, cluster in enumerate(i for i in range(n) if active[i]):
+        labels[members[cluster]] = label
+    return labels
+
+def reference_labels(folio_ids):
+    """The SECTION_MAP section of each folio ('other' outside every range)."""
+    return [get_section(folio_name(folio_id)) for folio_id in folio_ids]
+
+def adjusted_rand_index(labels_a, labels_b):
+    """Agreement between two partitions: 1 = identical, ~0 = chance."""
+    _, a = np.unique(np.asarray(labels_a), return_inverse=True)
+    _, b = np.unique(np.asarray(labels_b), return_inverse=True)
+    contingency = np.bincount(a * (b.max() + 1) + b).astype(np.float64)
+    pairs = lambda x: np.sum(x * (x - 1) / 2)
+    index = pairs(contingency)
+    rows, cols = pairs(np.bincount(a).astype(np.float64)), pairs(np.bincount(b).astype(np.float64))
+    expected = rows * cols / pairs(np.array([len(a)], dtype=np.float64))
+    maximum = (rows + cols) / 2
+    return float((index - expected) / (maximum - expected)) if maximum != expected else 1.0
+
+def propose_section_map(folio_ids, labels):
+    """
+    Turns cluster labels into a SECTION_MAP-style dict of (first, last) folio id ranges,
+    one per contiguous run. Each cluster is named after the current section it overlaps
+    most ('botanical', 'botanical_b', ... when several clusters pick the same one), and
+    further runs of a cluster become 'name_part2', 'name_part3', ...
+    """
+    reference = reference_labels(folio_ids)
+    names, taken = {}, {}
+    for label in np.unique(labels):
+        overlap = [section for section, l in zip(reference, labels) if l == label]
+        section = max(sorted(set(overlap)), key=overlap.count)
+        taken[section] = taken.get(section, 0) + 1
+        names[label] = section if taken[section] == 1 else f"{section}_{chr(ord('a') + taken[section] - 1)}"
+
+    section_map, runs = {}, {}
+    start = 0
+    for i in range(1, len(folio_ids) + 1):
+        if i == len(folio_ids) or labels[i] != labels[start]:
+            name = names[labels[start]]
+            runs[name] = runs.get(name, 0) + 1
+            key = name if runs[name] == 1 else f"{name}_part{runs[name]}"
+            section_map[key] = (folio_ids[start], folio_ids[i - 1])
+            start = i
+    return section_map
+
+def save_section_map(section_map, filename, description):
+    """Writes a proposed map as a SECTION_MAP literal, ready to paste into segment_manuscript.py."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f"# Proposed section map: {description}\n")
+        f.write("SECTION_MAP = {\n")
+        for name, (start, end) in section_map.items():
+            f.write(f"    {repr(name) + ':':<22} ({start}, {end}),  # {folio_name(start)} to {folio_name(end)}\n")
+        f.write("}\n")
+
+if __name__ == "__main__":
+    folio_ids, folio_words = load_folio_words()
+    if folio_ids:
+        features = FolioFeatureMatrix(folio_ids, folio_words)
+        reference = reference_labels(folio_ids)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+        print(f"\n--- 📚 Data-driven sections ({N_CLUSTERS} clusters) vs. the current SECTION_MAP ---")
+        all_labels = {}
+        for set_name, families in FEATURE_SETS.items():
+            vectors = tfidf(features.matrix(families)[0])
+            similarity = cosine_similarity(vectors)
+            methods = {
+                "contiguous": agglomerative(similarity, contiguous=True),
+                "hierarchical": agglomerative(similarity, contiguous=False),
+                "kmeans": kmeans(vectors),
+            }
+            for method, labels in methods.items():
+                all_labels[(set_name, method)] = labels
+                section_map = propose_section_map(folio_ids, labels)
+                filename = os.path.join(OUTPUT_DIR, f"{set_name}_{method}.txt")
+                save_section_map(section_map, filename, f"{method} clustering of {set_name} features")
+                print(f"  {set_name:<12} | {method:<12} | ARI vs SECTION_MAP {adjusted_rand_index(reference, labels):6.3f}"
+                      f" | {len(section_map):>3} ranges -> '{filename}'")
+
+        # Sensitivity: how much do the partitions depend on the feature choice?
+        print("\n--- Agreement between feature sets (ARI, contiguous clustering) ---")
+        names = list(FEATURE_SETS)
+        print(f"{'':<12}" + "".join(f" {n:>12}" for n in names))
+        for a in names:
+            row = [adjusted_rand_index(all_labels[(a, "contiguous")], all_labels[(b, "contiguous")]) for b in names]
+            print(f"{a:<12}" + "".join(f" {value:>12.3f}" for value in row))
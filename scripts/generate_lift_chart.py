@@ -1,6 +1,12 @@
-import matplotlib.pyplot as plt
-import os
+import csv
+from collections import Counter
 
+from calculate_lift_final import (BASELINE_FILE, ROOTS_FILE, TRANSCRIPTION_FILE, compute_lift, extract_context_words,
+                                  find_longest_root, load_lexicon)
+from chart_renderer import LIFT_TABLE, lift_chart_job, read_lift_table, render_charts
+from track_root_patterns import ZODIAC_FOLIOS_TO_ANALYZE
+
+# --- CONFIGURATION ---
 # --- Data from Appendix A of the paper ---
 # Planetary roots and their calculated lift scores
 planetary_roots = {
@@ -13,51 +19,78 @@ planetary_roots = {
 # Control root and its lift score
 control_root = {'che': 1.05}
 
+# Optional recomputation from the transcription. This is a different measurement (one lift
+# per root, pooled over the labels of every zodiac folio), so it gets its own table, chart and title.
+RECOMPUTE_POOLED_LIFT = False
+POOLED_LIFT_TABLE = "lift_scores_zodiac_pooled.csv"
+POOLED_LIFT_CHART = "charts/lift_score_chart_zodiac_pooled.png"
+POOLED_LIFT_TITLE = 'Lift of Planetary Roots Pooled over All Zodiac Label Folios (Recomputed)'
+
+def compute_lift_scores(roots, folios=ZODIAC_FOLIOS_TO_ANALYZE):
+    """
+    Computes the lift of every root in the labels of the zodiac folios, as in calculate_lift_final.py.
+    Returns a dict root -> lift (None when it cannot be computed), or None if an input is missing.
+    """
+    all_roots = load_lexicon(ROOTS_FILE)
+    if not all_roots:
+        print(f"❌ ERROR: Lexicon file '{ROOTS_FILE}' not found.")
+        return None
+    try:
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline_words = f.read().split()
+        with open(TRANSCRIPTION_FILE, 'r', encoding='utf-8') as f:
+            transcription_lines = f.readlines()
+    except FileNotFoundError as e:
+        print(f"❌ ERROR: File '{e.filename}' not found.")
+        return None
+
+    baseline_root_counts = Counter(find_longest_root(w, all_roots) for w in baseline_words)
+    context_words = [w for folio in folios for w in extract_context_words(transcription_lines, folio)]
+    scores = {}
+    for root in roots:
+        result = compute_lift(root, context_words, all_roots, baseline_root_counts, len(baseline_words))
+        scores[root] = result["lift"] if result else None
+    return scores
+
+def save_lift_table(scores, filename=LIFT_TABLE):
+    """Writes a lift table the chart renderer draws from."""
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["root", "group", "lift"])
+        for root, lift in scores.items():
+            if lift is None:
+                print(f"⚠️ Cannot calculate lift for '{root}': root not found in baseline or context is empty.")
+                continue
+            group = "Neutral Control Root" if root in control_root else "Planetary Roots"
+            writer.writerow([root, group, f"{lift:.4f}"])
+    print(f"✅ Lift table saved to '{filename}'")
+
 def generate_lift_score_chart():
     """
     Generates and saves a publication-quality bar chart of the Statistical Lift Scores.
+    The chart is drawn from the precomputed lift table, seeded with the Appendix A scores if missing.
     """
     print("--- Generating Statistical Lift Score Chart ---")
+    rows = read_lift_table()
+    if rows is None:
+        save_lift_table({**planetary_roots, **control_root})
+        rows = read_lift_table()
+    render_charts([lift_chart_job(rows)], workers=1)
 
-    # Prepare data for plotting
-    all_labels = list(planetary_roots.keys()) + list(control_root.keys())
-    planetary_labels = list(planetary_roots.keys())
-    planetary_scores = list(planetary_roots.values())
-    control_label = list(control_root.keys())[0]
-    control_score = list(control_root.values())[0]
-
-    plt.style.use('seaborn-v0_8-whitegrid')
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    # Plot the main planetary roots
-    ax.bar(planetary_labels, planetary_scores, color='#008080', label='Planetary Roots')
-    # Plot the control root in a different color to distinguish it
-    ax.bar(control_label, control_score, color='grey', label='Neutral Control Root')
-
-    # Add a horizontal line at y=1.0 to represent the baseline
-    # Anything above this line has a positive correlation.
-    ax.axhline(y=1.0, color='r', linestyle='--', linewidth=1.5, label='Baseline (No Correlation)')
-
-    # Add titles and labels for clarity
-    ax.set_title('Statistical Lift Score of Planetary Roots in Zodiacal Contexts', fontsize=16)
-    ax.set_xlabel('Core Root', fontsize=12)
-    ax.set_ylabel('Statistical Lift Score', fontsize=12)
-    ax.tick_params(axis='x', rotation=0)
-    ax.set_ylim(bottom=0, top=max(planetary_scores) * 1.15) # Set y-axis limit
-
-    # Add the legend to explain the colors and the baseline
-    ax.legend()
-
-    # Create the 'charts' directory if it doesn't exist
-    output_dir = 'charts'
-    os.makedirs(output_dir, exist_ok=True)
-    
-    output_filename = os.path.join(output_dir, "lift_score_chart.png")
-    
-    # Save the figure in high resolution
-    plt.savefig(output_filename, dpi=300, bbox_inches='tight')
-    
-    print(f"✅ Chart successfully saved to '{output_filename}'")
+def generate_pooled_lift_chart():
+    """Recomputes the lifts pooled over the zodiac label folios and charts them under their own title."""
+    print("--- Recomputing Lift Scores Pooled over the Zodiac Folios ---")
+    scores = compute_lift_scores(list(planetary_roots) + list(control_root))
+    if not scores:
+        return
+    for root, lift in scores.items():
+        print(f"  {root:<6} | {lift:.2f}" if lift is not None else f"  {root:<6} | n/a")
+    save_lift_table(scores, POOLED_LIFT_TABLE)
+    rows = read_lift_table(POOLED_LIFT_TABLE)
+    if rows:
+        render_charts([lift_chart_job(rows, POOLED_LIFT_TITLE, POOLED_LIFT_CHART)], workers=1)
 
 if __name__ == "__main__":
-    generate_lift_score_chart()
\ No newline at end of file
+    generate_lift_score_chart()
+    if RECOMPUTE_POOLED_LIFT:
+        generate_pooled_lift_chart()
@@ -0,0 +1,179 @@
+import bisect
+import math
+from collections import Counter
+
+# --- CONFIGURATION ---
+REFERENCE_FILE = "voynich_super_clean.txt"
+CHECK_EVERY = 500          # Words generated between two convergence checks.
+MIN_WORDS = 5000           # No decision is taken before this many words.
+CONVERGENCE_TOL = 0.01     # Max relative change between checks to count as "stable".
+PATIENCE = 3               # Consecutive stable checks needed to stop.
+DIVERGENCE_TOL = 0.50      # Max relative deviation from the reference before giving up.
+ZIPF_TOP_N = 200           # Ranks used for the Zipf slope fit.
+TRACKED_STATS = ("entropy", "avg_word_length", "zipf_slope", "type_token_ratio")
+# The type/token ratio keeps falling as a text grows, so it is only used for divergence.
+CONVERGENCE_STATS = ("entropy", "avg_word_length", "zipf_slope")
+
+class OnlineTextStats:
+    """
+    Maintains word-frequency, entropy, word-length and Zipf-slope estimates incrementally
+    as characters are fed one at a time.
+    """
+    def __init__(self):
+        self.word_counts = Counter()
+        self.char_counts = Counter()
+        self.total_words = 0
+        self.total_length = 0
+        self.current_word = []
+
+    def feed(self, char):
+        """Adds one character. Returns True when it completes a word."""
+        if char.isspace():
+            if self.current_word:
+                word = ''.join(self.current_word)
+                self.current_word = []
+                self.word_counts[word] += 1
+                self.total_words += 1
+                self.total_length += len(word)
+                return True
+            return False
+        self.current_word.append(char)
+        self.char_counts[char] += 1
+        return False
+
+    def entropy(self):
+        total = sum(self.char_counts.values())
+        return -sum((c / total) * math.log2(c / total) for c in self.char_counts.values())
+
+    def zipf_slope(self, top_n=ZIPF_TOP_N):
+        """Least-squares slope of log(frequency) against log(rank) over the top ranks."""
+        frequencies = [count for _, count in self.word_counts.most_common(top_n)]
+        if len(frequencies) < 2:
+            return 0.0
+        xs = [math.log(rank) for rank in range(1, len(frequencies) + 1)]
+        ys = [math.log(count) for count in frequencies]
+        mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+        covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+        variance = sum((x - mean_x) ** 2 for x in xs)
+        return covariance / variance
+
+    def snapshot(self):
+        """Returns the current value of every tracked statistic."""
+        if not self.total_words:
+            return dict.fromkeys(TRACKED_STATS, 0.0)
+        return {
+            "entropy": self.entropy(),
+            "avg_word_length": self.total_length / self.total_words,
+            "zipf_slope": self.zipf_slope(),
+            "type_token_ratio": len(self.word_counts) / self.total_words
+        }
+
+def _relative_change(a, b):
+    return abs(a - b) / max(abs(b), 1e-9)
+
+class ConvergenceMonitor:
+    """
+    Watches the statistics of a text while it is generated and decides when to stop:
+    'converged' once every statistic is stable within `tol` for `patience` checks, or
+    'diverged' once any statistic drifts further than `divergence_tol` from the reference.
+    The reference is a trajectory {word count: snapshot} (see load_reference_trajectory),
+    because vocabulary-based statistics depend on the sample size; each check compares with
+    the nearest recorded word count, so the reference may be recorded at any spacing.
+    """
+    def __init__(self, reference=None, check_every=CHECK_EVERY, min_words=MIN_WORDS,
+                 tol=CONVERGENCE_TOL, patience=PATIENCE, divergence_tol=DIVERGENCE_TOL):
+        self.stats = OnlineTextStats()
+        self.reference = reference
+        self.reference_counts = sorted(reference) if reference else []
+        self.check_every = check_every
+        self.min_words = min_words
+        self.tol = tol
+        self.patience = patience
+        self.divergence_tol = divergence_tol
+        self.previous = None
+        self.stable_checks = 0
+        self.history = []
+        self.stop_reason = None
+
+    def feed(self, char):
+        """Adds one generated character. Returns True when generation should stop."""
+        if not self.stats.feed(char) or self.stats.total_words % self.check_every:
+            return False
+        return self._check()
+
+    def _check(self):
+        current = self.stats.snapshot()
+        self.history.append((self.stats.total_words, current))
+
+        if self.previous is not None:
+            changes = [_relative_change(current[k], self.previous[k]) for k in CONVERGENCE_STATS]
+            self.stable_checks = self.stable_checks + 1 if max(changes) <= self.tol else 0
+        self.previous = current
+
+        if self.stats.total_words < self.min_words:
+            return False
+        if self.reference:
+            expected = self.reference[self._nearest_reference_count(self.stats.total_words)]
+            drift = {k: _relative_change(current[k], expected[k]) for k in TRACKED_STATS}
+            worst = max(drift, key=drift.get)
+            if drift[worst] > self.divergence_tol:
+                self.stop_reason = f"diverged ({worst} is {drift[worst]:.0%} away from the reference)"
+                return True
+        if self.stable_checks >= self.patience:
+            self.stop_reason = f"converged (all statistics stable within {self.tol:.0%})"
+            return True
+        return False
+
+    def _nearest_reference_count(self, words):
+        """The recorded word count of the reference trajectory closest to `words`."""
+        i = bisect.bisect_left(self.reference_counts, words)
+        candidates = self.reference_counts[max(i - 1, 0):i + 1]
+        return min(candidates, key=lambda count: abs(count - words))
+
+def load_reference_trajectory(filename=REFERENCE_FILE, check_every=CHECK_EVERY):
+    """
+    Feeds the reference corpus through OnlineTextStats and records its statistics every
+    `check_every` words. Returns a dict: {word count: snapshot}.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"❌ ERROR: Reference file '{filename}' not found.")
+        return None
+    stats = OnlineTextStats()
+    trajectory = {}
+    for char in text + ' ':
+        if stats.feed(char) and stats.total_words % check_every == 0:
+            trajectory[stats.total_words] = stats.snapshot()
+    print(f"✅ Reference trajectory for '{filename}' recorded over {stats.total_words} words.")
+    return trajectory
+
+if __name__ == "__main__":
+    # Replay the existing generated samples through the monitor to see where
+    # generation could have stopped.
+    reference = load_reference_trajectory()
+    if reference:
+        for filename in ["generated_clean_low_temp.txt",
+                         "generated_clean_normal_temp.txt",
+                         "generated_clean_high_temp.txt"]:
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    text = f.read()
+            except FileNotFoundError:
+                print(f"⚠️ Warning: '{filename}' not found.")
+                continue
+            monitor = ConvergenceMonitor(reference)
+            stopped_at = next((i for i, char in enumerate(text) if monitor.feed(char)), None)
+            print(f"\n## {filename}")
+            if stopped_at is None:
+                print(f"  Ran to the end ({len(text)} characters) without a decision.")
+            else:
+                print(f"  Would stop after {stopped_at + 1} of {len(text)} characters: {monitor.stop_reason}")
+            if not monitor.history:
+                continue
+            words, last = monitor.history[-1]
+            reference_words = monitor._nearest_reference_count(words)
+            expected = reference[reference_words]
+            for key, value in last.items():
+                print(f"  {key:<18} {value:.4f} after {words} words (reference {expected[key]:.4f} after {reference_words})")
@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+import tensorflow as tf
+
+# --- CONFIGURATION ---
+# training_and_generation.ipynb imports these and the functions below, so training and generation agree.
+TRAINING_FILE = "voynich_super_clean.txt"
+CHECKPOINT_DIR = "./training_checkpoints"
+EMBEDDING_DIM = 256
+RNN_UNITS = 1024
+EPOCHS = 20
+SEQ_LENGTH = 100
+BATCH_SIZE = 64
+BUFFER_SIZE = 10000
+
+def load_vocabulary(path_to_file=TRAINING_FILE):
+    """
+    Loads the training text and rebuilds the character vocabulary exactly as the notebook does.
+    Returns a tuple: (text, vocab, char2idx, idx2char).
+    """
+    text = open(path_to_file, 'r', encoding='utf-8').read()
+    vocab = sorted(set(text))
+    char2idx = {u: i for i, u in enumerate(vocab)}
+    idx2char = np.array(vocab)
+    return text, vocab, char2idx, idx2char
+
+def make_dataset(text_as_int, seq_length=SEQ_LENGTH, batch_size=BATCH_SIZE, buffer_size=BUFFER_SIZE):
+    """Builds the notebook's shuffled (input, target) training dataset of character sequences."""
+    def split_input_target(chunk):
+        return chunk[:-1], chunk[1:]
+
+    sequences = tf.data.Dataset.from_tensor_slices(text_as_int).batch(seq_length + 1, drop_remainder=True)
+    dataset = sequences.map(split_input_target)
+    return dataset.shuffle(buffer_size).batch(batch_size, drop_remainder=True)
+
+def loss(labels, logits):
+    return tf.keras.losses.sparse_categorical_crossentropy(labels, logits, from_logits=True)
+
+def build_model(vocab_size, embedding_dim=EMBEDDING_DIM, rnn_units=RNN_UNITS, batch_size=1, stateful=True,
+                cell="lstm"):
+    """
+    Builds the notebook's Embedding -> LSTM -> Dense model (or Embedding -> GRU -> Dense with cell="gru").
+    A non-stateful model shares the same weights and is used to score whole batches of sequences.
+    """
+    recurrent_layer = tf.keras.layers.GRU if cell == "gru" else tf.keras.layers.LSTM
+    model = tf.keras.Sequential([
+        tf.keras.layers.Embedding(vocab_size, embedding_dim),
+        recurrent_layer(rnn_units,
+                        return_sequences=True,
+                        stateful=stateful,
+                        recurrent_initializer='glorot_uniform'),
+        tf.keras.layers.Dense(vocab_size)
+    ])
+    model.build(tf.TensorShape([batch_size, None]))
+    return model
+
+def checkpoint_path(epoch, checkpoint_dir=CHECKPOINT_DIR):
+    """Returns the path of the weights saved by the notebook's ModelCheckpoint callback."""
+    return os.path.join(checkpoint_dir, f"ckpt_{epoch}.weights.h5")
+
+def load_trained_model(vocab_size, epoch=EPOCHS, batch_size=1, stateful=True,
+                       embedding_dim=EMBEDDING_DIM, rnn_units=RNN_UNITS, checkpoint_dir=CHECKPOINT_DIR, cell="lstm"):
+    """Rebuilds the model and loads the weights of a training checkpoint."""
+    model = build_model(vocab_size, embedding_dim, rnn_units, batch_size, stateful, cell)
+    weights_file = checkpoint_path(epoch, checkpoint_dir)
+    model.load_weights(weights_file)
+    print(f"✅ Weights loaded from '{weights_file}'.")
+    return model
+
+def reset_model_states(model):
+    """Clears the hidden state of every stateful layer before a new, independent sample."""
+    for layer in model.layers:
+        if getattr(layer, 'stateful', False):
+            layer.reset_states()
+
+def generate_text(model, start_string, char2idx, idx2char, num_generate=50000, temp=1.0, monitor=None,
+                  automaton=None, encode=None):
+    """
+    Generates text using the trained model (as in the notebook's final cell).
+    If a ConvergenceMonitor is given, every generated character is fed to it and
+    generation stops early as soon as the monitor asks for it.
+    If a GrammarAutomaton is given, characters that would leave the legal language
+    are masked out before sampling, so every generated word is grammatical.
+    Models over multi-character tokens (see morpheme_tokenizer.py) pass an `encode`
+    function for the seed; idx2char then maps each id to the text of its token.
+    """
+    input_eval = encode(start_string) if encode else [char2idx[s] for s in start_string]
+    input_eval = tf.expand_dims(input_eval, 0)
+    text_generated = []
+    temperature = temp
+
+    if monitor is not None:
+        for char in start_string:
+            monitor.feed(char)
+    if automaton is not None:
+        state = automaton.feed(automaton.start_state, start_string)
+
+    for i in range(num_generate):
+        predictions = model(input_eval)
+        predictions = tf.squeeze(predictions, 0)
+        predictions = predictions / temperature
+        if automaton is not None:
+            predictions = predictions + automaton.logit_mask(state)
+        predicted_id = tf.random.categorical(predictions, num_samples=1)[-1,0].numpy()
+        input_eval = tf.expand_dims([predicted_id], 0)
+        text_generated.append(idx2char[predicted_id])
+        if automaton is not None:
+            state = automaton.step(state, idx2char[predicted_id])
+
+        if monitor is not None:
+            stopped = False
+            for char in idx2char[predicted_id]:
+                stopped = monitor.feed(char) or stopped
+            if stopped:
+                print(f"⏹️ Stopped after {i + 1} steps: {monitor.stop_reason}")
+                break
+
+    return (start_string + ''.join(text_generated))
+
+if __name__ == "__main__":
+    from generation_monitor import ConvergenceMonitor, load_reference_trajectory
+
+    print("--- 🤖 Starting Generation with the 'Super Clean' Model ---")
+    text, vocab, char2idx, idx2char = load_vocabulary()
+    model = load_trained_model(len(vocab))
+    reference = load_reference_trajectory()
+
+    start_seed = "daiin "
+    for label, temperature in [("normal", 0.7), ("low", 0.5), ("high", 1.2)]:
+        print(f"\nGenerating text at {label} temperature ({temperature})...")
+        reset_model_states(model)
+        generated = generate_text(model, start_seed, char2idx, idx2char, temp=temperature,
+                                  monitor=ConvergenceMonitor(reference))
+        output_file = f"generated_clean_{label}_temp.txt"
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(generated)
+        print(f"✅ Text at temp {temperature} saved to '{output_file}'.")
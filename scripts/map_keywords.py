@@ -5,32 +5,19 @@ KEYWORD_TO_MAP = 'ro'  # The root we want to investigate
 TARGET_SECTION_FOLIOS = range(67, 74) # Folios for the Astronomical section (f67r to f73v)
 TRANSCRIPTION_FILE = "voynich.txt"
 
-def map_keyword_locations(keyword, target_folios, filename):
+def keyword_locations(keyword, target_folios, lines):
     """
-    Searches the original transcription for a keyword and maps its exact locations
-    (folio and line number) within a specific section.
+    Yields (folio marker, line number, highlighted context, match count) for every line
+    of the transcription, within the target folios, that contains the keyword.
     """
-    print(f"--- Mapping all occurrences of the root '{keyword}' in the Astronomical Section ---")
-    
-    try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"❌ ERROR: Original transcription file '{filename}' not found.")
-        return
-
     current_folio = None
     current_folio_num = 0
-    found_count = 0
-    
+
     # We create a simple regex to find the keyword as a whole word or part of a word.
     # \b matches word boundaries, so this would find 'ro' but not 'oro'.
     # For Voynich, it's better to find it anywhere.
     keyword_regex = re.compile(r'\b\w*' + re.escape(keyword) + r'\w*\b')
 
-    print(f"Searching for words containing '{keyword}' in folios f{target_folios.start} to f{target_folios.stop-1}...")
-    print("-" * 30)
-
     for i, line in enumerate(lines):
         # Check for folio markers like <f67r>
         folio_match = re.search(r'<f(\d+)[rv]>', line)
@@ -44,7 +31,6 @@ def map_keyword_locations(keyword, target_folios, filename):
         # Search for the keyword in the current line
         matches = keyword_regex.findall(line)
         if matches:
-            line_num = i + 1
             # Clean up the line for printing by removing comments
             clean_line = re.sub(r'\{.*?\}|\[.*?\]', '', line).strip()
             
@@ -53,10 +39,32 @@ def map_keyword_locations(keyword, target_folios, filename):
             for match in set(matches):
                 highlighted_line = highlighted_line.replace(match, f"**{match}**")
 
-            print(f"Location: {current_folio}, Line: {line_num}")
-            print(f"  Context: {highlighted_line}")
-            print("-" * 10)
-            found_count += len(matches)
+            yield current_folio, i + 1, highlighted_line, len(matches)
+
+def map_keyword_locations(keyword, target_folios, filename):
+    """
+    Searches the original transcription for a keyword and maps its exact locations
+    (folio and line number) within a specific section.
+    """
+    print(f"--- Mapping all occurrences of the root '{keyword}' in the Astronomical Section ---")
+    
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        print(f"❌ ERROR: Original transcription file '{filename}' not found.")
+        return
+
+    found_count = 0
+
+    print(f"Searching for words containing '{keyword}' in folios f{target_folios.start} to f{target_folios.stop-1}...")
+    print("-" * 30)
+
+    for current_folio, line_num, highlighted_line, count in keyword_locations(keyword, target_folios, lines):
+        print(f"Location: {current_folio}, Line: {line_num}")
+        print(f"  Context: {highlighted_line}")
+        print("-" * 10)
+        found_count += count
 
     print(f"\n--- Mapping Complete ---")
     print(f"✅ Found {found_count} total occurrences of words containing '{keyword}' in the target section.")
@@ -0,0 +1,161 @@
+import math
+import os
+import random
+import re
+from collections import Counter
+
+from build_lexicon import MINIMUM_FREQUENCY, save_lexicon
+
+# --- CONFIGURATION ---
+CORPUS_FILE = "voynich_super_clean.txt"
+OUTPUT_DIR = "lexicon_mdl"   # Kept apart from the hand-built lexicon; copy the files over to use them.
+MAX_ITERATIONS = 30
+MIN_IMPROVEMENT = 1e-4       # Stop when the description length improves by less than this fraction.
+RANDOM_SEED = 42
+CLASSES = ("prefix", "root", "suffix")
+MAX_AFFIX_LENGTH = 3         # Longest prefix or suffix considered; longer material is part of the root.
+# Bits per letter of a lexicon entry, relative to the plain spelling cost. Affixes are a small
+# closed class: with the plain cost, word-specific prefixes and suffixes are nearly free (every
+# word type is encoded once), so thousands of them are found. The heavier prior keeps them shared.
+LEXICON_WEIGHTS = {"prefix": 4.0, "root": 1.0, "suffix": 4.0}
+
+def load_word_types(filename=CORPUS_FILE):
+    """Loads the corpus and returns its unique words (segmentation works at the type level)."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+        words = sorted(set(re.findall(r'[a-z]+', text.lower())))
+        print(f"✅ Corpus '{filename}' loaded. Segmenting {len(words)} unique words.")
+        return words
+    except FileNotFoundError:
+        print(f"❌ ERROR: File '{filename}' not found.")
+        return None
+
+class MDLSegmenter:
+    """
+    Unsupervised prefix + root + suffix segmentation by minimum description length.
+    The cost of a lexicon is the bits needed to spell its morphemes; the cost of the
+    corpus is -log2 of each morpheme's probability within its class. Each iteration
+    re-segments every word type with Viterbi DP (O(types x length^2)), updating the counts
+    after each word, Morfessor-style.
+    """
+    def __init__(self, words, seed=RANDOM_SEED, lexicon_weights=LEXICON_WEIGHTS,
+                 max_affix_length=MAX_AFFIX_LENGTH):
+        self.words = words
+        self.lexicon_weights = lexicon_weights
+        self.max_affix_length = max_affix_length
+        alphabet = {c for w in words for c in w}
+        self.letter_cost = math.log2(len(alphabet) + 1)  # +1 for the end-of-morpheme marker
+        # Random initial splits give every class material to start re-estimating from
+        rng = self.rng = random.Random(seed)
+        self.segmentations = {}
+        for word in words:
+            i = rng.randint(0, min(len(word) - 1, max_affix_length))
+            j = rng.randint(max(i + 1, len(word) - max_affix_length), len(word))
+            self.segmentations[word] = (word[:i], word[i:j], word[j:])
+        self._count()
+
+    def _count(self):
+        self.counts = {c: Counter() for c in CLASSES}
+        for parts in self.segmentations.values():
+            for c, morph in zip(CLASSES, parts):
+                self.counts[c][morph] += 1
+
+    def spelling_cost(self, morph, c="root"):
+        return self.lexicon_weights[c] * (len(morph) + 1) * self.letter_cost
+
+    def description_length(self):
+        """Total bits: morpheme spellings (the lexicon) plus the encoded corpus."""
+        lexicon_bits = sum(self.spelling_cost(m, c) for c in CLASSES for m in self.counts[c] if m)
+        corpus_bits = 0.0
+        for c in CLASSES:
+            total = sum(self.counts[c].values())
+            corpus_bits -= sum(n * math.log2(n / total) for n in self.counts[c].values())
+        return lexicon_bits + corpus_bits
+
+    def _viterbi(self, word):
+        """
+        Cheapest (prefix, root, suffix) split of one word against the current counts, from
+        which the word's own split has been removed; prefix and suffix may be empty.
+        """
+        # Every other word has one morpheme (possibly empty) per class, plus one unit for unseen morphemes
+        mass = len(self.words)
+        def cost(c, morph):
+            n = self.counts[c].get(morph, 0)
+            if n > 0:
+                return -math.log2(n / mass)
+            return -math.log2(1 / mass) + self.spelling_cost(morph, c)
+
+        n = len(word)
+        # best_suffix[j] = cheapest way to encode word[j:] as a suffix
+        best_suffix = [cost("suffix", word[j:]) for j in range(n + 1)]
+        best = None
+        for i in range(min(n, self.max_affix_length + 1)):
+            prefix_cost = cost("prefix", word[:i])
+            for j in range(max(i + 1, n - self.max_affix_length), n + 1):
+                total = prefix_cost + cost("root", word[i:j]) + best_suffix[j]
+                if best is None or total < best[0]:
+                    best = (total, i, j)
+        _, i, j = best
+        return word[:i], word[i:j], word[j:]
+
+    def iterate(self):
+        """
+        One pass over the word types in random order, Morfessor-style: each word's split is
+        taken out of the counts, re-chosen, and put back. A morpheme that only this word uses
+        therefore pays its lexicon cost again, so poor splits can be undone.
+        Returns the number of words whose split changed.
+        """
+        changed = 0
+        for word in self.rng.sample(self.words, len(self.words)):
+            old = self.segmentations[word]
+            for c, morph in zip(CLASSES, old):
+                self.counts[c][morph] -= 1
+                if not self.counts[c][morph]:
+                    del self.counts[c][morph]
+            parts = self._viterbi(word)
+            for c, morph in zip(CLASSES, parts):
+                self.counts[c][morph] += 1
+            self.segmentations[word] = parts
+            changed += parts != old
+        return changed
+
+    def fit(self, max_iterations=MAX_ITERATIONS, min_improvement=MIN_IMPROVEMENT):
+        previous = self.description_length()
+        print(f"  Iteration  0 | {previous:,.0f} bits")
+        for iteration in range(1, max_iterations + 1):
+            changed = self.iterate()
+            current = self.description_length()
+            print(f"  Iteration {iteration:>2} | {current:,.0f} bits | {changed} words re-segmented")
+            if changed == 0 or (previous - current) / previous < min_improvement:
+                break
+            previous = current
+        return self
+
+def save_segmentations(segmentations, filename):
+    """Saves the split chosen for every word type, for inspection."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("# Word | Prefix-Root-Suffix\n")
+        for word, parts in sorted(segmentations.items()):
+            f.write(f"{word:<15} | {'-'.join(p if p else '_' for p in parts)}\n")
+    print(f"✅ Segmentations saved to '{filename}'")
+
+if __name__ == "__main__":
+    words = load_word_types()
+    if words:
+        print("\n--- Minimum Description Length Segmentation ---")
+        segmenter = MDLSegmenter(words).fit()
+
+        found = {c: len(segmenter.counts[c]) - ('' in segmenter.counts[c]) for c in CLASSES}
+        kept = {c: sum(1 for m, n in segmenter.counts[c].items() if m and n >= MINIMUM_FREQUENCY) for c in CLASSES}
+        print(f"\nFound {found['prefix']} prefixes, {found['root']} roots and {found['suffix']} suffixes "
+              f"({kept['prefix']}, {kept['root']} and {kept['suffix']} used by at least {MINIMUM_FREQUENCY} word types).")
+
+        # Empty prefixes/suffixes are not morphemes and are left out of the lexicon files
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        prefixes = Counter({m: n for m, n in segmenter.counts["prefix"].items() if m})
+        suffixes = Counter({m: n for m, n in segmenter.counts["suffix"].items() if m})
+        save_lexicon(prefixes, os.path.join(OUTPUT_DIR, "prefixes.txt"), "Voynich Language Prefixes (MDL)")
+        save_lexicon(segmenter.counts["root"], os.path.join(OUTPUT_DIR, "roots.txt"), "Voynich Language Core Roots (MDL)")
+        save_lexicon(suffixes, os.path.join(OUTPUT_DIR, "suffixes.txt"), "Voynich Language Suffixes (MDL)")
+        save_segmentations(segmenter.segmentations, os.path.join(OUTPUT_DIR, "segmentations.txt"))
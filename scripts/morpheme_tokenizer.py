@@ -0,0 +1,171 @@
+import os
+import re
+import time
+from collections import Counter
+
+import numpy as np
+
+from find_grammar_rules import load_lexicon, peel_word
+
+# --- CONFIGURATION ---
+TRAINING_FILE = "voynich_super_clean.txt"
+CHECKPOINT_DIR = "./training_checkpoints_morpheme"
+SEQ_LENGTH = 40          # About the same span of text as the character model's 100 characters.
+TEMPERATURES = [("normal", 0.7), ("low", 0.5), ("high", 1.2)]
+START_SEED = "daiin "
+# Opt-in: the most frequent words as single tokens, and the whitespace after a word merged into
+# its last token. Both cut decoding steps further, at the cost of a larger, word-level vocabulary.
+WORD_TOKENS = 0
+MERGE_SEPARATORS = False
+MODE = "train"           # 'train', 'generate' or 'stats' (tokenization statistics only, no TensorFlow).
+
+class MorphemeTokenizer:
+    """
+    Tokenizes text into prefix, root and suffix tokens using the lexicon and the shared
+    peeling logic, with one token per whitespace character. Material the lexicon does not
+    cover is split by longest root match, then into single characters. Optionally, the
+    `word_tokens` most frequent words are single tokens and the whitespace after a word is
+    merged into its last token. Every token's text is a piece of the input, so decoding
+    (concatenating token texts) is lossless.
+    """
+    def __init__(self, prefixes, roots, suffixes, text, word_tokens=WORD_TOKENS, merge_separators=MERGE_SEPARATORS):
+        self.prefixes, self.roots, self.suffixes = prefixes, roots, suffixes
+        self.whole_words = {w for w, _ in Counter(text.split()).most_common(word_tokens)} if word_tokens else set()
+        self.merge_separators = merge_separators
+        self.roots_by_length = sorted(roots, key=len, reverse=True)
+        self._word_cache = {}
+        # Class-tagged labels keep e.g. the prefix 'ch' apart from a root 'ch' ('w:' is whitespace,
+        # 't:' a whole word). Single characters stay in the vocabulary so any text can be encoded
+        spaces = {c for c in text if c.isspace()}
+        characters = {c for c in text if not c.isspace()}
+        labels = {"w:" + c for c in spaces} | {"c:" + c for c in characters}
+        labels |= {"p:" + m for m in prefixes} | {"r:" + m for m in roots} | {"s:" + m for m in suffixes}
+        labels |= set(self.tokenize(text))
+        if merge_separators:
+            labels |= {"c:" + c + space for c in characters for space in spaces}
+        self.labels = sorted(labels)
+        self.label2idx = {label: i for i, label in enumerate(self.labels)}
+        # Text of every token, indexed like idx2char in lstm_model.py
+        self.idx2text = np.array([label[2:] for label in self.labels], dtype=object)
+
+    def _segment(self, morph):
+        """Splits material the lexicon does not cover by longest root match, else one character at a time."""
+        labels, i = [], 0
+        while i < len(morph):
+            match = next((r for r in self.roots_by_length if morph.startswith(r, i)), None)
+            if match:
+                labels.append(f"r:{match}")
+                i += len(match)
+            else:
+                labels.append(f"c:{morph[i]}")
+                i += 1
+        return labels
+
+    def _word_labels(self, word):
+        labels = self._word_cache.get(word)
+        if labels is None:
+            if word in self.whole_words:
+                labels = [f"t:{word}"]
+            else:
+                prefix, root, suffix = peel_word(word)
+                labels = []
+                for tag, morph, lexicon in (("p", prefix, self.prefixes), ("r", root, self.roots),
+                                            ("s", suffix, self.suffixes)):
+                    if not morph:
+                        continue
+                    labels.extend([f"{tag}:{morph}"] if morph in lexicon else self._segment(morph))
+            self._word_cache[word] = labels
+        return labels
+
+    def tokenize(self, text):
+        """Returns the list of token labels of a text."""
+        labels, after_word = [], False
+        for piece in re.split(r'(\s)', text):
+            if not piece:
+                continue
+            if piece.isspace():
+                if after_word and self.merge_separators:
+                    labels[-1] += piece  # The separator rides on the word's last token
+                else:
+                    labels.append(f"w:{piece}")
+                after_word = False
+            else:
+                labels.extend(self._word_labels(piece))
+                after_word = True
+        return labels
+
+    def encode(self, text):
+        """Token ids of a text; a label outside the vocabulary falls back to its single characters."""
+        ids = []
+        for label in self.tokenize(text):
+            if label in self.label2idx:
+                ids.append(self.label2idx[label])
+            else:
+                ids.extend(self.label2idx[("w:" if c.isspace() else "c:") + c] for c in label[2:])
+        return ids
+
+    def decode(self, ids):
+        return "".join(self.idx2text[i] for i in ids)
+
+def load_tokenizer(path_to_file=TRAINING_FILE):
+    """Loads the training text and builds its tokenizer. Returns a tuple: (text, tokenizer)."""
+    text = open(path_to_file, 'r', encoding='utf-8').read()
+    prefixes = load_lexicon("prefixes.txt") or set()
+    roots = load_lexicon("roots.txt") or set()
+    suffixes = load_lexicon("suffixes.txt") or set()
+    tokenizer = MorphemeTokenizer(prefixes, roots, suffixes, text)
+    print(f"✅ Morpheme tokenizer built with {len(tokenizer.labels)} tokens.")
+    return text, tokenizer
+
+def tokenization_report(text, tokenizer):
+    """Compares the sequential steps per word of character and morpheme tokenization."""
+    ids = tokenizer.encode(text)
+    assert tokenizer.decode(ids) == text, "Morpheme tokenization is not lossless."
+    words = len(text.split())
+    kinds = Counter(tokenizer.labels[i][0] for i in ids)
+    print("\n--- ✂️ Tokenization Report ---")
+    print(f"  Vocabulary size:                      {len(tokenizer.labels)} tokens")
+    print(f"  Characters per word (char model):     {len(text) / words:.2f}")
+    print(f"  Tokens per word (morpheme model):     {len(ids) / words:.2f}")
+    print(f"  Reduction in decoding steps:          {len(text) / len(ids):.2f}x")
+    print(f"  Token mix: {kinds['p']} prefixes, {kinds['r']} roots, {kinds['s']} suffixes, "
+          f"{kinds['c']} fallback characters, {kinds['t']} whole words, {kinds['w']} separators")
+    return ids
+
+if __name__ == "__main__":
+    text, tokenizer = load_tokenizer()
+    ids = tokenization_report(text, tokenizer)
+
+    if MODE != "stats":
+        import tensorflow as tf
+        from lstm_model import (build_model, checkpoint_path, generate_text, load_trained_model, loss,
+                                make_dataset, reset_model_states, EPOCHS)
+
+        if MODE == "train":
+            # Same architecture and training loop as the notebook, over morpheme tokens
+            model = build_model(len(tokenizer.labels), batch_size=64)
+            model.compile(optimizer='adam', loss=loss)
+            dataset = make_dataset(np.array(ids), seq_length=SEQ_LENGTH)
+            callback = tf.keras.callbacks.ModelCheckpoint(
+                filepath=os.path.join(CHECKPOINT_DIR, "ckpt_{epoch}.weights.h5"), save_weights_only=True)
+            started = time.perf_counter()
+            model.fit(dataset, epochs=EPOCHS, callbacks=[callback])
+            print(f"✅ Trained {EPOCHS} epochs in {time.perf_counter() - started:.0f}s "
+                  f"(weights in '{checkpoint_path(EPOCHS, CHECKPOINT_DIR)}').")
+
+        elif MODE == "generate":
+            model = load_trained_model(len(tokenizer.labels), checkpoint_dir=CHECKPOINT_DIR)
+            # As many steps as needed for about the same amount of text as the character model
+            num_generate = int(50000 * len(ids) / len(text))
+            for label, temperature in TEMPERATURES:
+                print(f"\nGenerating text at {label} temperature ({temperature}), {num_generate} steps...")
+                reset_model_states(model)
+                started = time.perf_counter()
+                generated = generate_text(model, START_SEED, None, tokenizer.idx2text, num_generate, temperature,
+                                          encode=tokenizer.encode)
+                elapsed = time.perf_counter() - started
+                output_file = f"generated_morpheme_{label}_temp.txt"
+                with open(output_file, "w", encoding="utf-8") as f:
+                    f.write(generated)
+                print(f"✅ {len(generated)} characters in {elapsed:.1f}s "
+                      f"({len(generated) / elapsed:.0f} chars/s) saved to '{output_file}'.")
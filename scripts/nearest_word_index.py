@@ -0,0 +1,225 @@
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from validate_word import VoynichValidator
+
+# --- CONFIGURATION ---
+CORPUS_FILE = "voynich_super_clean.txt"
+FILE_TO_REPAIR = "generated_clean_high_temp.txt"
+MAX_DISTANCE = 2     # Maximum edit distance searched for a suggestion.
+TOP_K = 3            # Number of suggestions returned per word.
+VOCABULARY = "both"  # 'attested', 'legal' or 'both'.
+WORKERS = 4          # Size of the process pool used for whole files.
+
+def deletion_neighborhood(word, max_distance):
+    """Returns every string obtainable by deleting up to `max_distance` characters from a word."""
+    neighborhood = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        next_frontier -= neighborhood
+        neighborhood |= next_frontier
+        frontier = next_frontier
+    return neighborhood
+
+def edit_script(source, target):
+    """
+    Computes the Levenshtein distance between two words and the edits that turn
+    `source` into `target`. Returns a tuple: (distance, [edit descriptions]).
+    """
+    rows, cols = len(source) + 1, len(target) + 1
+    table = [[0] * cols for _ in range(rows)]
+    for i in range(rows):
+        table[i][0] = i
+    for j in range(cols):
+        table[0][j] = j
+    for i in range(1, rows):
+        for j in range(1, cols):
+            cost = 0 if source[i - 1] == target[j - 1] else 1
+            table[i][j] = min(table[i - 1][j] + 1,
+                              table[i][j - 1] + 1,
+                              table[i - 1][j - 1] + cost)
+
+    # Walk back through the table to recover the edits (reported left to right)
+    edits = []
+    i, j = len(source), len(target)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and source[i - 1] == target[j - 1] and table[i][j] == table[i - 1][j - 1]:
+            i, j = i - 1, j - 1
+        elif i > 0 and j > 0 and table[i][j] == table[i - 1][j - 1] + 1:
+            edits.append(f"substitute '{source[i - 1]}'->'{target[j - 1]}' at {i - 1}")
+            i, j = i - 1, j - 1
+        elif i > 0 and table[i][j] == table[i - 1][j] + 1:
+            edits.append(f"delete '{source[i - 1]}' at {i - 1}")
+            i -= 1
+        else:
+            edits.append(f"insert '{target[j - 1]}' at {i}")
+            j -= 1
+    edits.reverse()
+    return table[-1][-1], edits
+
+def load_attested_words(filename=CORPUS_FILE):
+    """Loads the corpus and returns a Counter of every attested word."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            words = re.findall(r'[a-z]+', f.read().lower())
+        print(f"✅ Corpus '{filename}' loaded with {len(words)} words.")
+        return Counter(words)
+    except FileNotFoundError:
+        print(f"❌ ERROR: Corpus file '{filename}' not found.")
+        return None
+
+def enumerate_legal_words(validator):
+    """
+    Enumerates the finite language accepted by the validator: every root on its own,
+    every prefix+suffix pair, and every prefix/root/suffix combination allowed by the rules.
+    Candidates are re-checked with the validator because peeling is greedy.
+    """
+    prefixes_for_root = {}
+    for prefix, root in validator.prefix_root_rules:
+        prefixes_for_root.setdefault(root, set()).add(prefix)
+    suffixes_for_root = {}
+    for root, suffix in validator.root_suffix_rules:
+        suffixes_for_root.setdefault(root, set()).add(suffix)
+
+    candidates = {p + s for p in validator.prefixes for s in validator.suffixes}
+    for root in validator.roots:
+        prefixes = [''] + sorted(prefixes_for_root.get(root, ()))
+        suffixes = [''] + sorted(suffixes_for_root.get(root, ()))
+        for prefix in prefixes:
+            for suffix in suffixes:
+                candidates.add(prefix + root + suffix)
+
+    return {word for word in candidates if validator.check_word(word)[0]}
+
+class NearestWordIndex:
+    """
+    A SymSpell-style edit-distance index: every dictionary word is stored under each
+    string of its deletion neighborhood, so a query only needs to generate its own
+    deletions and verify the few candidates that share one of them.
+    """
+    def __init__(self, word_frequencies, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.frequencies = dict(word_frequencies)
+        self.deletes = {}
+        for word in self.frequencies:
+            for variant in deletion_neighborhood(word, max_distance):
+                self.deletes.setdefault(variant, []).append(word)
+        print(f"✅ Index built over {len(self.frequencies)} words "
+              f"({len(self.deletes)} deletion keys, distance <= {max_distance}).")
+
+    def lookup(self, word, top_k=TOP_K, max_distance=None):
+        """
+        Returns up to `top_k` dictionary words within `max_distance` edits of `word`,
+        closest first, then most frequent. Each result is a dict with the keys
+        'word', 'distance', 'frequency' and 'edits'.
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        candidates = set()
+        for variant in deletion_neighborhood(word, max_distance):
+            candidates.update(self.deletes.get(variant, ()))
+
+        results = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance, edits = edit_script(word, candidate)
+            if distance <= max_distance:
+                results.append({
+                    "word": candidate,
+                    "distance": distance,
+                    "frequency": self.frequencies[candidate],
+                    "edits": edits
+                })
+        results.sort(key=lambda r: (r["distance"], -r["frequency"], r["word"]))
+        return results[:top_k]
+
+    def lookup_batch(self, words, top_k=TOP_K, max_distance=None):
+        """Looks up many words at once, querying each distinct word only once."""
+        cache = {}
+        for word in words:
+            if word not in cache:
+                cache[word] = self.lookup(word, top_k, max_distance)
+        return cache
+
+# --- Process-pool helpers: each worker receives the index once, at start-up ---
+_worker_index = None
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+def _lookup_chunk(args):
+    words, top_k, max_distance = args
+    return _worker_index.lookup_batch(words, top_k, max_distance)
+
+def build_index(validator, vocabulary=VOCABULARY, corpus_file=CORPUS_FILE, max_distance=MAX_DISTANCE):
+    """Builds a NearestWordIndex over the attested vocabulary, the enumerated legal language, or both."""
+    frequencies = Counter()
+    if vocabulary in ("legal", "both"):
+        legal_words = enumerate_legal_words(validator)
+        print(f"✅ Enumerated {len(legal_words)} grammatical words from the lexicon and rules.")
+        frequencies.update({word: 0 for word in legal_words})
+    if vocabulary in ("attested", "both"):
+        attested = load_attested_words(corpus_file)
+        if attested is None:
+            return None
+        # Only grammatical words are useful as suggestions
+        for word, count in attested.items():
+            if validator.check_word(word)[0]:
+                frequencies[word] += count
+    return NearestWordIndex(frequencies, max_distance)
+
+def repair_file(filename, validator, index, top_k=TOP_K, max_distance=None, workers=WORKERS):
+    """
+    Validates every word in a file and looks up the nearest grammatical words for the
+    rejected ones across a process pool. Returns a dict: {rejected word: suggestions}.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            words = re.findall(r'[a-z]+', f.read().lower())
+    except FileNotFoundError:
+        print(f"❌ ERROR: File '{filename}' not found.")
+        return None
+
+    rejected = sorted({word for word in words if not validator.check_word(word)[0]})
+    print(f"🔎 '{filename}': {len(rejected)} distinct rejected words out of {len(set(words))}.")
+    if not rejected:
+        return {}
+
+    chunk_size = max(1, len(rejected) // (workers * 4))
+    chunks = [(rejected[i:i + chunk_size], top_k, max_distance)
+              for i in range(0, len(rejected), chunk_size)]
+
+    suggestions = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(index,)) as pool:
+        for partial in pool.map(_lookup_chunk, chunks):
+            suggestions.update(partial)
+    return suggestions
+
+if __name__ == "__main__":
+    validator = VoynichValidator()
+    if validator.is_ready:
+        index = build_index(validator)
+        if index:
+            validator.suggestion_index = index
+
+            print("\n--- Testing some 'illegal' words with suggestions ---")
+            validator.is_valid_word("cheyqo")
+            validator.is_valid_word("qokain")
+
+            print(f"\n--- Repairing '{FILE_TO_REPAIR}' ---")
+            report = repair_file(FILE_TO_REPAIR, validator, index)
+            if report:
+                repaired = sum(1 for s in report.values() if s)
+                print(f"✅ {repaired} of {len(report)} rejected words have a grammatical neighbour "
+                      f"within {index.max_distance} edits.")
+                for word, found in list(report.items())[:10]:
+                    best = f"'{found[0]['word']}' ({', '.join(found[0]['edits'])})" if found else "none"
+                    print(f"  {word:<15} -> {best}")
@@ -0,0 +1,233 @@
+import csv
+import json
+import os
+import re
+
+import numpy as np
+
+# --- CONFIGURATION ---
+TRAINING_FILE = "voynich_super_clean.txt"
+INDEX_DIR = "corpus_index"
+OUTPUT_DIR = "novelty"
+KEY_LENGTH = 64   # Characters compared in one vectorized step; longer matches are extended exactly.
+HISTOGRAM_BINS = [1, 5, 10, 20, 50, 100]
+FILES_TO_ANALYZE = [
+    "generated_clean_low_temp.txt",
+    "generated_clean_normal_temp.txt",
+    "generated_clean_high_temp.txt"
+]
+
+def normalize_text(text):
+    """Collapses all whitespace (including line breaks) to single spaces, so spans compare equally."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+def build_suffix_array(data):
+    """
+    Builds the suffix array of a uint8 array by prefix doubling: suffixes are sorted
+    by their first k characters, then 2k, ... until every rank is unique.
+    """
+    n = len(data)
+    rank = data.astype(np.int64)
+    sa = np.argsort(rank, kind='stable')
+    k = 1
+    while True:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+        first_sorted, second_sorted = rank[sa], second[sa]
+        changed = np.empty(n, dtype=bool)
+        changed[0] = True
+        changed[1:] = (first_sorted[1:] != first_sorted[:-1]) | (second_sorted[1:] != second_sorted[:-1])
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa] = np.cumsum(changed) - 1
+        rank = new_rank
+        if rank.max() == n - 1:
+            return sa.astype(np.int32)
+        k *= 2
+
+def build_lcp(data, sa):
+    """Kasai's algorithm: lcp[i] is the common prefix length of suffixes sa[i-1] and sa[i] (lcp[0] = 0)."""
+    n = len(data)
+    text = data.tobytes()
+    rank = np.empty(n, dtype=np.int64)
+    rank[sa] = np.arange(n)
+    rank = rank.tolist()
+    sa_list = sa.tolist()
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa_list[r - 1]
+        while i + h < n and j + h < n and text[i + h] == text[j + h]:
+            h += 1
+        lcp[r] = h
+        if h:
+            h -= 1
+    return np.array(lcp, dtype=np.int32)
+
+def _windows(data, length):
+    """Returns an (n, length) view of the first `length` characters of every suffix, zero-padded."""
+    padded = np.concatenate([data, np.zeros(length, dtype=np.uint8)])
+    return np.lib.stride_tricks.sliding_window_view(padded, length)[:len(data)]
+
+class CorpusIndex:
+    """A suffix array (with LCP) over the training corpus, persisted as memory-mappable .npy files."""
+    def __init__(self, corpus_file=TRAINING_FILE, index_dir=INDEX_DIR):
+        with open(corpus_file, 'r', encoding='utf-8') as f:
+            text = normalize_text(f.read())
+        self.data = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+        self.words = set(text.split())
+        with open(corpus_file, 'r', encoding='utf-8') as f:
+            self.lines = {normalize_text(line) for line in f if line.strip()}
+
+        sa_file = os.path.join(index_dir, "suffix_array.npy")
+        lcp_file = os.path.join(index_dir, "lcp.npy")
+        meta_file = os.path.join(index_dir, "index.json")
+        meta = {"corpus_file": corpus_file, "characters": int(len(self.data)),
+                "mtime": os.path.getmtime(corpus_file)}
+
+        if os.path.exists(meta_file):
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        else:
+            stored = None
+
+        if stored == meta and os.path.exists(sa_file) and os.path.exists(lcp_file):
+            self.sa = np.load(sa_file, mmap_mode='r')
+            self.lcp = np.load(lcp_file, mmap_mode='r')
+            print(f"✅ Suffix array for '{corpus_file}' loaded from '{index_dir}/'.")
+        else:
+            print(f"🔨 Building suffix array for '{corpus_file}' ({len(self.data)} characters)...")
+            os.makedirs(index_dir, exist_ok=True)
+            np.save(sa_file, build_suffix_array(self.data))
+            np.save(lcp_file, build_lcp(self.data, np.load(sa_file)))
+            with open(meta_file, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            self.sa = np.load(sa_file, mmap_mode='r')
+            self.lcp = np.load(lcp_file, mmap_mode='r')
+            print(f"✅ Suffix array and LCP saved to '{index_dir}/'.")
+
+        # Fixed-width keys of the sorted suffixes, compared as byte strings by searchsorted
+        self.keys = np.ascontiguousarray(_windows(self.data, KEY_LENGTH)[self.sa]).view(f'S{KEY_LENGTH}').ravel()
+
+    def _extend(self, query, position, sorted_index):
+        """Exact longest match for a query whose first KEY_LENGTH characters all match."""
+        # All suffixes sharing the full key form a contiguous block delimited by the LCP array
+        low = sorted_index
+        while low > 0 and self.lcp[low] >= KEY_LENGTH:
+            low -= 1
+        high = sorted_index
+        while high + 1 < len(self.sa) and self.lcp[high + 1] >= KEY_LENGTH:
+            high += 1
+        best = KEY_LENGTH
+        corpus = self.data
+        for start in self.sa[low:high + 1]:
+            length = KEY_LENGTH
+            while (position + length < len(query) and start + length < len(corpus)
+                   and query[position + length] == corpus[start + length]):
+                length += 1
+            best = max(best, length)
+        return best
+
+    def longest_matches(self, text):
+        """
+        For every position of `text`, returns the length of the longest substring starting
+        there that occurs verbatim in the corpus (the matching statistics), in one
+        vectorized binary search over the suffix array.
+        """
+        query = np.frombuffer(normalize_text(text).encode('utf-8'), dtype=np.uint8)
+        windows = _windows(query, KEY_LENGTH)
+        query_keys = np.ascontiguousarray(windows).view(f'S{KEY_LENGTH}').ravel()
+        insert = np.searchsorted(self.keys, query_keys)
+
+        # The longest common prefix with any sorted suffix is reached at a neighbour
+        best = np.zeros(len(query), dtype=np.int64)
+        best_index = np.zeros(len(query), dtype=np.int64)
+        for neighbour in (insert - 1, insert):
+            valid = (neighbour >= 0) & (neighbour < len(self.sa))
+            idx = np.clip(neighbour, 0, len(self.sa) - 1)
+            corpus_windows = _windows(self.data, KEY_LENGTH)[self.sa[idx]]
+            equal = (corpus_windows == windows) & (windows != 0)
+            lengths = np.where(equal.all(axis=1), KEY_LENGTH, np.argmin(equal, axis=1))
+            lengths = np.where(valid, lengths, 0)
+            better = lengths > best
+            best[better] = lengths[better]
+            best_index[better] = idx[better]
+
+        for position in np.flatnonzero(best == KEY_LENGTH):
+            best[position] = self._extend(query, position, best_index[position])
+        return best
+
+def copy_spans(matches):
+    """
+    Returns the maximal copied spans as (start, length) pairs and, for every position,
+    the length of the longest copied span covering it.
+    """
+    positions = np.arange(len(matches))
+    ends = positions + matches
+    # A span is maximal when it reaches further than the span starting one position earlier
+    maximal = np.ones(len(matches), dtype=bool)
+    maximal[1:] = ends[1:] > ends[:-1]
+    maximal &= matches > 0
+    starts = positions[maximal]
+    lengths = matches[maximal]
+    coverage = np.zeros(len(matches), dtype=np.int64)
+    for start, length in zip(starts, lengths):
+        np.maximum(coverage[start:start + length], length, out=coverage[start:start + length])
+    return list(zip(starts.tolist(), lengths.tolist())), coverage
+
+def analyze_novelty(filename, index, output_dir=OUTPUT_DIR):
+    """Reports copy lengths, novel-word and novel-line rates of a generated file against the corpus."""
+    print(f"\n--- 🧬 Novelty Analysis of '{filename}' ---")
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"❌ Error: File '{filename}' not found.")
+        return None
+
+    matches = index.longest_matches(text)
+    spans, coverage = copy_spans(matches)
+    span_lengths = np.array([length for _, length in spans])
+
+    words = text.split()
+    lines = [normalize_text(line) for line in text.splitlines() if line.strip()]
+    novel_tokens = sum(1 for w in words if w not in index.words)
+    novel_types = sum(1 for w in set(words) if w not in index.words)
+    novel_lines = sum(1 for line in lines if line not in index.lines)
+
+    print(f"  Longest copied span:            {int(span_lengths.max()) if len(span_lengths) else 0} characters")
+    print(f"  Median copy covering a position: {float(np.median(coverage)):.1f} characters")
+    print(f"  Novel word rate (tokens):        {novel_tokens / len(words):.2%}")
+    print(f"  Novel word rate (types):         {novel_types / len(set(words)):.2%}")
+    print(f"  Novel line rate:                 {novel_lines / max(len(lines), 1):.2%}")
+
+    bins = HISTOGRAM_BINS + [max(int(coverage.max()) + 1, HISTOGRAM_BINS[-1] + 1)]
+    span_hist, _ = np.histogram(span_lengths, bins=bins)
+    coverage_hist, _ = np.histogram(coverage, bins=bins)
+    rows = []
+    print("\n  Copy length      | Maximal spans | Share of positions")
+    for low, high, n_spans, n_positions in zip(bins, bins[1:], span_hist, coverage_hist):
+        label = f"{low}-{high - 1}" if high - 1 > low else f"{low}"
+        if high == bins[-1]:
+            label = f"{low}+"
+        share = n_positions / len(coverage)
+        print(f"  {label:<16} | {n_spans:>13} | {share:.2%}")
+        rows.append((label, int(n_spans), int(n_positions), f"{share:.6f}"))
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f"copy_lengths_{os.path.basename(filename).replace('.txt', '')}.csv")
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["copy_length", "maximal_spans", "positions", "share_of_positions"])
+        writer.writerows(rows)
+    print(f"✅ Histogram saved to '{output_file}'")
+    return matches
+
+if __name__ == "__main__":
+    corpus_index = CorpusIndex()
+    for file in FILES_TO_ANALYZE:
+        analyze_novelty(file, corpus_index)
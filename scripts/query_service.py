@@ -0,0 +1,208 @@
+import json
+import time
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from calculate_lift_final import compute_lift, extract_context_words, find_longest_root
+from calculate_lift_final import load_lexicon as load_sorted_roots
+from map_keywords import keyword_locations
+from nearest_word_index import build_index
+from validate_word import VoynichValidator, peel_word
+
+# --- CONFIGURATION ---
+HOST = "127.0.0.1"            # Localhost only: the service has no authentication.
+PORT = 8765
+THREADS = 8                   # Worker threads answering concurrent clients.
+BASELINE_FILE = "voynich_super_clean.txt"
+TRANSCRIPTION_FILE = "voynich.txt"
+ROOTS_FILE = "roots.txt"
+SUGGESTIONS = True            # Build the nearest-word index so rejected words come with suggestions.
+CACHE_SIZE = 65536            # Memoized validations, keyword maps and lift contexts.
+
+class QueryEngine:
+    """
+    Everything the one-off scripts reload on every run, loaded once: the validator
+    (lexicon and rules), the longest-first root list, the baseline root counts and the
+    transcription lines. Each query is a dict with an "op" key; results are JSON-ready.
+    """
+    def __init__(self):
+        started = time.perf_counter()
+        self.validator = VoynichValidator()
+        if not self.validator.is_ready:
+            raise RuntimeError("Validator could not be initialized (missing lexicon or rule files).")
+        if SUGGESTIONS:
+            self.validator.suggestion_index = build_index(self.validator)
+        self.roots = load_sorted_roots(ROOTS_FILE)
+
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            baseline_words = f.read().split()
+        self.baseline_total = len(baseline_words)
+        self.baseline_root_counts = Counter(find_longest_root(w, self.roots) for w in baseline_words)
+
+        try:
+            with open(TRANSCRIPTION_FILE, 'r', encoding='utf-8') as f:
+                self.transcription_lines = f.readlines()
+        except FileNotFoundError:
+            print(f"⚠️ Warning: '{TRANSCRIPTION_FILE}' not found. 'map' and 'lift' queries will fail.")
+            self.transcription_lines = None
+
+        self.operations = {
+            "validate": self.validate,
+            "peel": self.peel,
+            "map": self.map_keyword,
+            "lift": self.lift,
+        }
+        print(f"✅ Query engine ready in {time.perf_counter() - started:.2f}s.")
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def validate(self, word, suggest=True):
+        is_valid, reason = self.validator.check_word(word)
+        result = {"word": word, "valid": is_valid, "reason": reason}
+        if not is_valid and suggest and self.validator.suggestion_index is not None:
+            result["suggestions"] = self.validator.suggestion_index.lookup(word)
+        return result
+
+    def peel(self, word):
+        prefix, root, suffix = peel_word(word)
+        return {"word": word, "prefix": prefix, "root": root, "suffix": suffix}
+
+    def _require_transcription(self):
+        if self.transcription_lines is None:
+            raise FileNotFoundError(f"Transcription file '{TRANSCRIPTION_FILE}' not loaded.")
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _locations(self, keyword, first_folio, last_folio):
+        return tuple(keyword_locations(keyword, range(first_folio, last_folio + 1), self.transcription_lines))
+
+    def map_keyword(self, keyword, first_folio=67, last_folio=73):
+        """Occurrences of a keyword within folios f<first_folio> to f<last_folio> (inclusive)."""
+        self._require_transcription()
+        locations = self._locations(keyword, int(first_folio), int(last_folio))
+        return {
+            "keyword": keyword,
+            "total": sum(count for *_, count in locations),
+            "locations": [{"folio": folio, "line": line, "context": context, "count": count}
+                          for folio, line, context, count in locations],
+        }
+
+    @lru_cache(maxsize=CACHE_SIZE)
+    def _context_words(self, folio_prefix):
+        return tuple(extract_context_words(self.transcription_lines, folio_prefix))
+
+    def lift(self, root, folio_prefix):
+        """Lift of a root in the labels of a folio (e.g. 'f70r1'), as in calculate_lift_final.py."""
+        self._require_transcription()
+        result = compute_lift(root, self._context_words(folio_prefix), self.roots,
+                              self.baseline_root_counts, self.baseline_total)
+        if result is None:
+            raise ValueError("Cannot calculate lift: root not found in baseline or context is empty.")
+        result["folio_prefix"] = folio_prefix
+        return result
+
+    def answer(self, query):
+        """Answers one query. Errors are reported per query so one bad entry does not fail a batch."""
+        try:
+            arguments = dict(query)
+        except (TypeError, ValueError):
+            return {"error": f"A query must be a JSON object, got: {query!r}"}
+        op = arguments.pop("op", None)
+        if not isinstance(op, str) or op not in self.operations:
+            return {"error": f"Unknown or missing operation: {op!r}"}
+        for name, value in arguments.items():
+            if name in ("word", "keyword", "root", "folio_prefix") and not isinstance(value, str):
+                return {"error": f"Argument '{name}' must be a string, got: {value!r}"}
+        try:
+            return self.operations[op](**arguments)
+        except Exception as e:
+            # Any failure inside an operation stays local to its query
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    def answer_batch(self, queries):
+        return [self.answer(q) for q in queries]
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """POST /query with a JSON query or a list of queries; GET /health for a liveness check."""
+    engine = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "operations": sorted(self.engine.operations)})
+        else:
+            self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+
+    def do_POST(self):
+        if self.path != "/query":
+            self._send_json(404, {"error": f"Unknown path '{self.path}'."})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except (ValueError, UnicodeDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if isinstance(payload, list):
+            self._send_json(200, self.engine.answer_batch(payload))
+        elif isinstance(payload, dict):
+            self._send_json(200, self.engine.answer(payload))
+        else:
+            self._send_json(400, {"error": "Expected a query object or a list of queries."})
+
+    def log_message(self, format, *args):
+        # Thousands of queries per session would flood the console
+        pass
+
+class PooledHTTPServer(HTTPServer):
+    """An HTTP server that hands each connection to a fixed pool of worker threads."""
+    request_queue_size = 128  # Connections waiting for a free thread (the default of 5 drops bursts)
+
+    def __init__(self, address, handler, threads=THREADS):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="query")
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+def serve(host=HOST, port=PORT, threads=THREADS):
+    """Loads the engine once and serves queries until interrupted."""
+    QueryHandler.engine = QueryEngine()
+    server = PooledHTTPServer((host, port), QueryHandler, threads)
+    print(f"✅ Serving on http://{host}:{port}/query with {threads} threads (Ctrl+C to stop).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        server.server_close()
+
+def query(queries, host=HOST, port=PORT, timeout=30):
+    """Client helper: sends one query (dict) or a batch (list) and returns the decoded answer."""
+    request = urllib.request.Request(f"http://{host}:{port}/query", data=json.dumps(queries).encode('utf-8'),
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+if __name__ == "__main__":
+    serve()
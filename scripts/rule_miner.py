@@ -0,0 +1,140 @@
+import os
+import re
+
+import numpy as np
+
+from deep_cleaning_voynich import load_line_folios
+from find_grammar_rules import MINIMUM_RULE_FREQUENCY, load_lexicon, peel_word
+
+# --- CONFIGURATION ---
+CORPUS_FILE = "voynich_super_clean.txt"
+TRANSCRIPTION_FILE = "voynich.txt"   # Used only to recover the folio of each line.
+OUTPUT_DIR = "."
+NONE = "_"                           # Label of an absent (or out-of-lexicon) morpheme.
+LINE_POSITIONS = ["initial", "medial", "final", "single"]
+
+# Every rule family is just a query: which columns to group by, and an optional filter.
+RULE_FAMILIES = {
+    # The two families produced by find_grammar_rules.py
+    "prefix_root_rules.txt": ("Prefix-Root Combination Rules", ("prefix", "root"), None),
+    "root_suffix_rules.txt": ("Root-Suffix Combination Rules", ("root", "suffix"), None),
+    # Higher-order and positional families
+    "prefix_root_suffix_rules.txt": ("Prefix-Root-Suffix Combination Rules", ("prefix", "root", "suffix"), None),
+    "suffix_next_prefix_rules.txt": ("Suffix -> Next-Word-Prefix Transition Rules", ("suffix", "next_prefix"), None),
+    "root_next_root_rules.txt": ("Root -> Next-Word-Root Transition Rules", ("root", "next_root"), None),
+    "line_initial_prefix_rules.txt": ("Line-Initial Prefix Rules", ("prefix",), {"line_pos": ("initial", "single")}),
+    "line_final_suffix_rules.txt": ("Line-Final Suffix Rules", ("suffix",), {"line_pos": ("final", "single")}),
+}
+
+class ColumnarCorpus:
+    """
+    The corpus peeled once into integer-coded columns, one row per word token:
+    word, prefix, root, suffix, next_prefix, next_root, next_suffix, line_pos, line, folio.
+    Each column has a list of labels so ids can be turned back into strings.
+    """
+    def __init__(self, corpus_file=CORPUS_FILE, transcription_file=TRANSCRIPTION_FILE):
+        with open(corpus_file, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f.read().split('\n')]
+        valid = {
+            "prefix": load_lexicon("prefixes.txt") or set(),
+            "root": load_lexicon("roots.txt") or set(),
+            "suffix": load_lexicon("suffixes.txt") or set(),
+        }
+        if transcription_file:
+            folios = load_line_folios(transcription_file, lines)
+        else:
+            folios = ['unknown'] * len(lines)
+
+        tokens, line_ids, positions = [], [], []
+        for line_id, line in enumerate(lines):
+            words = re.findall(r'[a-z]+', line.lower())
+            for i, word in enumerate(words):
+                tokens.append(word)
+                line_ids.append(line_id)
+                if len(words) == 1:
+                    positions.append(3)
+                else:
+                    positions.append(0 if i == 0 else 2 if i == len(words) - 1 else 1)
+
+        self.columns, self.labels = {}, {}
+        word_labels, word_ids = np.unique(np.array(tokens), return_inverse=True)
+        self._add("word", word_ids, word_labels.tolist())
+
+        # Peel every unique word once; morphemes missing from the lexicon count as absent,
+        # exactly as in find_grammar_rules.py
+        peeled = [peel_word(w) for w in self.labels["word"]]
+        for k, name in enumerate(("prefix", "root", "suffix")):
+            parts = [p[k] if p[k] in valid[name] else NONE for p in peeled]
+            part_labels, part_of_word = np.unique(np.array(parts), return_inverse=True)
+            self._add(name, part_of_word[word_ids], part_labels.tolist())
+
+        # Next-word columns, which do not cross line breaks (-1 = no next word)
+        line_ids = np.array(line_ids)
+        same_line = np.append(line_ids[1:] == line_ids[:-1], False)
+        for name in ("prefix", "root", "suffix"):
+            following = np.append(self.columns[name][1:], -1)
+            self._add(f"next_{name}", np.where(same_line, following, -1), self.labels[name])
+
+        self._add("line_pos", np.array(positions), LINE_POSITIONS)
+        self._add("line", line_ids, [str(i + 1) for i in range(len(lines))])
+        folio_labels, folio_of_line = np.unique(np.array(folios), return_inverse=True)
+        self._add("folio", folio_of_line[line_ids], folio_labels.tolist())
+        print(f"✅ Corpus '{corpus_file}' peeled into {len(tokens)} rows x {len(self.columns)} columns.")
+
+    def _add(self, name, ids, labels):
+        self.columns[name] = np.asarray(ids, dtype=np.int64)
+        self.labels[name] = list(labels)
+
+    def mine(self, group_by, where=None, min_count=MINIMUM_RULE_FREQUENCY, keep_absent=False):
+        """
+        Counts every combination of the `group_by` columns with one vectorized np.unique.
+        `where` maps a column to the label (or tuple of labels) rows must have.
+        Combinations involving an absent morpheme are dropped unless `keep_absent` is set.
+        Returns a list of (labels tuple, count), most frequent first.
+        """
+        mask = np.ones(len(self.columns["word"]), dtype=bool)
+        for name, wanted in (where or {}).items():
+            wanted = wanted if isinstance(wanted, tuple) else (wanted,)
+            ids = [self.labels[name].index(label) for label in wanted if label in self.labels[name]]
+            mask &= np.isin(self.columns[name], ids)
+        for name in group_by:
+            mask &= self.columns[name] >= 0
+            if not keep_absent and NONE in self.labels[name]:
+                mask &= self.columns[name] != self.labels[name].index(NONE)
+
+        # Mixed-radix encoding of the grouped columns into a single integer key
+        key = np.zeros(int(mask.sum()), dtype=np.int64)
+        for name in group_by:
+            key = key * len(self.labels[name]) + self.columns[name][mask]
+        unique_keys, counts = np.unique(key, return_counts=True)
+
+        keep = counts >= min_count
+        unique_keys, counts = unique_keys[keep], counts[keep]
+        decoded = []
+        for name in reversed(group_by):
+            radix = len(self.labels[name])
+            decoded.append(unique_keys % radix)
+            unique_keys = unique_keys // radix
+        decoded.reverse()
+
+        order = np.argsort(-counts, kind='stable')
+        return [(tuple(self.labels[name][ids[i]] for name, ids in zip(group_by, decoded)), int(counts[i]))
+                for i in order]
+
+def save_rules(rules, filename, header):
+    """Saves mined rules in the format of find_grammar_rules.py (parts joined by '-')."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f"# {header}\n")
+        f.write("# Combination      | Frequency\n")
+        f.write("="*28 + "\n")
+        for parts, count in rules:
+            combination_str = "-".join(parts)
+            f.write(f"{combination_str:<18} | {count}\n")
+    print(f"✅ {len(rules)} rules saved to '{filename}'")
+
+if __name__ == "__main__":
+    corpus = ColumnarCorpus()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    for filename, (header, group_by, where) in RULE_FAMILIES.items():
+        rules = corpus.mine(group_by, where)
+        save_rules(rules, os.path.join(OUTPUT_DIR, filename), header)
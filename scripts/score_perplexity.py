@@ -0,0 +1,157 @@
+import csv
+import math
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from deep_cleaning_voynich import load_line_folios
+from lstm_model import CHECKPOINT_DIR, EPOCHS, TRAINING_FILE, checkpoint_path, load_trained_model, load_vocabulary
+from segment_manuscript import get_section
+
+# --- CONFIGURATION ---
+TRANSCRIPTION_FILE = "voynich.txt"   # Used only to recover the folio of each cleaned line.
+OUTPUT_DIR = "perplexity"
+WINDOW_LENGTH = 500   # Characters scored per sequence.
+CONTEXT_LENGTH = 100  # Characters of burn-in context fed before each window (not scored).
+BATCH_SIZE = 256      # Sequences scored per forward pass.
+
+def make_windows(text_as_int, window_length=WINDOW_LENGTH, context_length=CONTEXT_LENGTH):
+    """
+    Cuts the encoded corpus into overlapping windows. Each row holds `context_length`
+    characters of context followed by the `window_length` characters it scores;
+    rows are right-padded with 0. Returns (inputs, targets, mask, positions).
+    """
+    n = len(text_as_int)
+    width = context_length + window_length
+    starts = np.arange(1, n, window_length)
+    rows = len(starts)
+
+    inputs = np.zeros((rows, width), dtype=np.int32)
+    targets = np.zeros((rows, width), dtype=np.int32)
+    mask = np.zeros((rows, width), dtype=bool)
+    positions = np.zeros((rows, width), dtype=np.int64)
+
+    offsets = np.arange(width)
+    for row, start in enumerate(starts):
+        # Target positions covered by this row: [start - context, start + window)
+        target_pos = start - context_length + offsets
+        valid = (target_pos >= 1) & (target_pos < n)
+        inputs[row, valid] = text_as_int[target_pos[valid] - 1]
+        targets[row, valid] = text_as_int[target_pos[valid]]
+        mask[row, valid & (offsets >= context_length)] = True
+        positions[row, valid] = target_pos[valid]
+    return inputs, targets, mask, positions
+
+def score_characters(model, text_as_int, batch_size=BATCH_SIZE):
+    """
+    Returns the negative log-likelihood (in nats) of every character of the corpus given
+    everything before it, scored in large padded batches. The first character has no
+    context and is given a loss of NaN.
+    """
+    inputs, targets, mask, positions = make_windows(text_as_int)
+
+    @tf.function
+    def batch_losses(batch_inputs, batch_targets):
+        logits = model(batch_inputs, training=False)
+        return tf.nn.sparse_softmax_cross_entropy_with_logits(labels=batch_targets, logits=logits)
+
+    losses = np.full(len(text_as_int), np.nan, dtype=np.float32)
+    for start in range(0, len(inputs), batch_size):
+        stop = start + batch_size
+        batch_inputs = inputs[start:stop]
+        batch_targets = targets[start:stop]
+        padding = batch_size - len(batch_inputs)
+        if padding:
+            # Keep a fixed batch shape so the traced graph is reused
+            batch_inputs = np.pad(batch_inputs, ((0, padding), (0, 0)))
+            batch_targets = np.pad(batch_targets, ((0, padding), (0, 0)))
+        batch_loss = batch_losses(batch_inputs, batch_targets).numpy()[:len(inputs[start:stop])]
+        batch_mask = mask[start:stop]
+        losses[positions[start:stop][batch_mask]] = batch_loss[batch_mask]
+    return losses
+
+def aggregate(losses, keys):
+    """Groups per-character losses by key. Returns {key: (characters, mean loss, perplexity)}."""
+    scored = ~np.isnan(losses)
+    labels, inverse = np.unique(np.asarray(keys)[scored], return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(labels))
+    totals = np.bincount(inverse, weights=losses[scored].astype(np.float64), minlength=len(labels))
+    return {label.item(): (int(n), total / n, math.exp(total / n))
+            for label, n, total in zip(labels, counts, totals) if n}
+
+def save_table(rows, filename, header):
+    """Writes an aggregated perplexity table to a CSV file."""
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    print(f"✅ Table saved to '{filename}'")
+
+def score_checkpoint(epoch=EPOCHS, corpus_file=TRAINING_FILE, output_dir=OUTPUT_DIR):
+    """
+    Scores the whole corpus with one training checkpoint and writes per-line, per-folio
+    and per-section perplexities plus a memory-mapped array of per-character losses.
+    """
+    print(f"\n--- 📈 Scoring '{corpus_file}' with checkpoint epoch {epoch} ---")
+    if not os.path.exists(checkpoint_path(epoch)):
+        print(f"❌ ERROR: Checkpoint '{checkpoint_path(epoch)}' not found.")
+        return None
+
+    text, vocab, char2idx, _ = load_vocabulary(corpus_file)
+    text_as_int = np.array([char2idx[c] for c in text], dtype=np.int32)
+    model = load_trained_model(len(vocab), epoch, batch_size=BATCH_SIZE, stateful=False)
+
+    losses = score_characters(model, text_as_int)
+
+    # Save the per-character losses as a memory-mappable .npy file
+    os.makedirs(output_dir, exist_ok=True)
+    losses_file = os.path.join(output_dir, f"char_losses_ckpt_{epoch}.npy")
+    memmap = np.lib.format.open_memmap(losses_file, mode='w+', dtype=np.float32, shape=losses.shape)
+    memmap[:] = losses
+    memmap.flush()
+    print(f"✅ Per-character losses saved to '{losses_file}'")
+
+    # Every character (including the newline ending it) belongs to a line
+    clean_lines = text.split('\n')
+    line_ids = np.zeros(len(text), dtype=np.int64)
+    line_ids[1:] = np.cumsum(text_as_int[:-1] == char2idx['\n'])
+    folios = load_line_folios(TRANSCRIPTION_FILE, clean_lines)
+    sections = [get_section(folio) for folio in folios]
+
+    per_line = aggregate(losses, line_ids)
+    per_folio = aggregate(losses, np.array(folios)[line_ids])
+    per_section = aggregate(losses, np.array(sections)[line_ids])
+
+    save_table([(line + 1, folios[line], sections[line], n, f"{mean:.4f}", f"{ppl:.4f}")
+                for line, (n, mean, ppl) in sorted(per_line.items())],
+               os.path.join(output_dir, f"per_line_ckpt_{epoch}.csv"),
+               ["line", "folio", "section", "characters", "mean_nll", "perplexity"])
+    save_table([(folio, n, f"{mean:.4f}", f"{ppl:.4f}") for folio, (n, mean, ppl) in per_folio.items()],
+               os.path.join(output_dir, f"per_folio_ckpt_{epoch}.csv"),
+               ["folio", "characters", "mean_nll", "perplexity"])
+    save_table([(section, n, f"{mean:.4f}", f"{ppl:.4f}") for section, (n, mean, ppl) in per_section.items()],
+               os.path.join(output_dir, f"per_section_ckpt_{epoch}.csv"),
+               ["section", "characters", "mean_nll", "perplexity"])
+
+    overall = float(np.nanmean(losses))
+    print("\n--- Perplexity Results ---")
+    print(f"  Corpus perplexity: {math.exp(overall):.4f} ({overall / math.log(2):.4f} bits per character)")
+    for section, (n, mean, ppl) in sorted(per_section.items(), key=lambda item: item[1][2]):
+        print(f"  {section:<16} | perplexity {ppl:.4f} over {n} characters")
+    return losses
+
+def score_all_checkpoints(checkpoint_dir=CHECKPOINT_DIR):
+    """Scores the corpus with every 'ckpt_{epoch}.weights.h5' checkpoint found, in epoch order."""
+    try:
+        names = os.listdir(checkpoint_dir)
+    except FileNotFoundError:
+        print(f"❌ ERROR: Checkpoint directory '{checkpoint_dir}' not found.")
+        return
+    epochs = sorted(int(name[len("ckpt_"):-len(".weights.h5")]) for name in names
+                    if name.startswith("ckpt_") and name.endswith(".weights.h5"))
+    for epoch in epochs:
+        score_checkpoint(epoch)
+
+if __name__ == "__main__":
+    score_all_checkpoints()
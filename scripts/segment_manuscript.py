@@ -24,6 +24,16 @@ def get_folio_id(folio_str):
         page_id += 1
     return page_id
 
+def get_section(folio_str):
+    """Maps a folio (e.g. 'f70r1') to its SECTION_MAP section, or 'other'."""
+    folio_id = get_folio_id(folio_str)
+    if folio_id is None:
+        return 'other'
+    for section_name, (start_id, end_id) in SECTION_MAP.items():
+        if start_id <= folio_id <= end_id:
+            return section_name
+    return 'other'
+
 def segment_manuscript(original_file="voynich.txt", output_dir="sections"):
     """
     Reads the original transcription file and segments it into thematic sections
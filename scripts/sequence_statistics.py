@@ -0,0 +1,160 @@
+import csv
+import os
+
+import numpy as np
+
+from rule_miner import ColumnarCorpus
+
+# --- CONFIGURATION ---
+FILES_TO_ANALYZE = [
+    "voynich_super_clean.txt",
+    "generated_clean_normal_temp.txt",
+    "generated_clean_low_temp.txt",
+    "generated_clean_high_temp.txt"
+]
+MAX_DISTANCE = 50
+OUTPUT_DIR = "sequence_stats"
+TOP_N = 5
+SHUFFLES = 5            # Shuffled copies of each sequence for the MI bias baseline.
+SEED = 0
+
+class TransitionMatrix:
+    """
+    A sparse CSR matrix of transition counts between integer token ids:
+    the counts of row `a` are data[indptr[a]:indptr[a + 1]], at columns indices[...].
+    """
+    def __init__(self, current, following, size):
+        keys, counts = np.unique(current * size + following, return_counts=True)
+        rows = keys // size
+        self.size = size
+        self.indices = keys % size
+        self.data = counts
+        self.indptr = np.searchsorted(rows, np.arange(size + 1))
+
+    def row(self, a):
+        start, stop = self.indptr[a], self.indptr[a + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def conditional_entropy(self):
+        """H(next | current) in bits, computed over all non-zero cells at once."""
+        rows = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        per_cell_total = np.bincount(rows, weights=self.data, minlength=self.size)[rows]
+        p_joint = self.data / self.data.sum()
+        return float(-np.sum(p_joint * np.log2(self.data / per_cell_total)))
+
+    def next_entropy(self):
+        """H(next) in bits, from the column totals."""
+        return distribution_entropy(np.bincount(self.indices, weights=self.data, minlength=self.size))
+
+def transitions(ids, lines, size):
+    """Builds the transition matrix of a token sequence, skipping pairs that cross a line break."""
+    same_line = lines[1:] == lines[:-1]
+    valid = same_line & (ids[:-1] >= 0) & (ids[1:] >= 0)
+    return TransitionMatrix(ids[:-1][valid], ids[1:][valid], size)
+
+def conditional_entropy(ids, lines, size, shuffles=SHUFFLES, seed=SEED):
+    """
+    H(next | current) in bits within lines, corrected for its small-sample bias with the same
+    shuffled baseline as mutual_information: in a shuffled copy the next token does not depend
+    on the current one, so its true conditional entropy is H(next), and the plug-in estimate's
+    shortfall from it is the bias. Corpora of different sizes can then be compared.
+    """
+    rng = np.random.default_rng(seed)
+    bias = np.mean([matrix.conditional_entropy() - matrix.next_entropy()
+                    for matrix in (transitions(rng.permutation(ids), lines, size) for _ in range(shuffles))])
+    return transitions(ids, lines, size).conditional_entropy() - float(bias)
+
+def plug_in_mutual_information(ids, size, max_distance=MAX_DISTANCE):
+    """Plug-in I(X_i; X_i+d) in bits for d = 1..max_distance, one vectorized pair count per distance."""
+    results = []
+    for d in range(1, max_distance + 1):
+        first, second = ids[:-d], ids[d:]
+        n = len(first)
+        if n == 0:
+            results.append(0.0)
+            continue
+        keys, joint = np.unique(first * size + second, return_counts=True)
+        p_first = np.bincount(first, minlength=size) / n
+        p_second = np.bincount(second, minlength=size) / n
+        p_joint = joint / n
+        results.append(float(np.sum(p_joint * np.log2(p_joint / (p_first[keys // size] * p_second[keys % size])))))
+    return np.array(results)
+
+def mutual_information(ids, size, max_distance=MAX_DISTANCE, shuffles=SHUFFLES, seed=SEED):
+    """
+    I(X_i; X_i+d) in bits for d = 1..max_distance, minus the mean plug-in MI of shuffled copies
+    of the same sequence. Shuffling keeps the token counts but destroys all order, so the baseline
+    is the small-sample bias of the estimator (several bits for words) and what remains is structure.
+    """
+    rng = np.random.default_rng(seed)
+    baseline = np.mean([plug_in_mutual_information(rng.permutation(ids), size, max_distance)
+                        for _ in range(shuffles)], axis=0)
+    return [float(v) for v in plug_in_mutual_information(ids, size, max_distance) - baseline]
+
+def distribution_entropy(counts):
+    p = counts[counts > 0] / counts.sum()
+    return float(-np.sum(p * np.log2(p)))
+
+def sequence_statistics(filename):
+    """Computes transition, mutual-information and line-position statistics for one corpus."""
+    print(f"\n--- 🔗 Sequence Statistics for '{filename}' ---")
+    if not os.path.exists(filename):
+        print(f"❌ Error: File '{filename}' not found.")
+        return None
+
+    corpus = ColumnarCorpus(filename, transcription_file=None)
+    lines = corpus.columns["line"]
+    results = {"file": filename}
+
+    # 1. Word and morpheme-class transitions, within lines
+    for name in ("word", "prefix", "root", "suffix"):
+        # Absent morphemes ("_") are kept as a class of their own: "no prefix" is informative
+        ids = corpus.columns[name]
+        matrix = transitions(ids, lines, len(corpus.labels[name]))
+        results[f"H({name} next | {name})"] = conditional_entropy(ids, lines, len(corpus.labels[name]))
+        results[f"{name} transitions"] = int(matrix.data.sum())
+
+    # 2. Mutual information between words (and between suffix classes) at distance d
+    word_ids = corpus.columns["word"]
+    results["mutual_information"] = mutual_information(word_ids, len(corpus.labels["word"]))
+    results["suffix_mutual_information"] = mutual_information(corpus.columns["suffix"], len(corpus.labels["suffix"]))
+
+    # 3. Line-first and line-last word distributions
+    positions = corpus.columns["line_pos"]
+    initial = np.isin(positions, [corpus.labels["line_pos"].index(p) for p in ("initial", "single")])
+    final = np.isin(positions, [corpus.labels["line_pos"].index(p) for p in ("final", "single")])
+    for label, mask in (("line-first", initial), ("line-last", final)):
+        counts = np.bincount(word_ids[mask], minlength=len(corpus.labels["word"]))
+        top = np.argsort(-counts, kind='stable')[:TOP_N]
+        results[f"{label} entropy"] = distribution_entropy(counts)
+        results[f"{label} top"] = [(corpus.labels["word"][i], int(counts[i])) for i in top if counts[i]]
+
+    for key, value in results.items():
+        if key in ("file", "mutual_information", "suffix_mutual_information"):
+            continue
+        if isinstance(value, float):
+            print(f"  {key:<30} {value:.4f}")
+        elif isinstance(value, list):
+            print(f"  {key:<30} {', '.join(f'{w} ({c})' for w, c in value)}")
+        else:
+            print(f"  {key:<30} {value}")
+    for key, label in (("mutual_information", "word MI(d)"), ("suffix_mutual_information", "suffix MI(d)")):
+        mi = results[key]
+        print(f"  {label + ' in bits':<30} d=1: {mi[0]:.4f}, d=5: {mi[4]:.4f}, d={len(mi)}: {mi[-1]:.4f}")
+    return results
+
+def save_mutual_information(all_results, filename):
+    """Writes word and suffix MI-by-distance columns per corpus, for comparing long-range structure."""
+    keys = {"mutual_information": "word", "suffix_mutual_information": "suffix"}
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["distance"] + [f"{r['file']} ({label})" for label in keys.values() for r in all_results])
+        for d in range(MAX_DISTANCE):
+            writer.writerow([d + 1] + [f"{r[key][d]:.6f}" for key in keys for r in all_results])
+    print(f"\n✅ Mutual information by distance saved to '{filename}'")
+
+if __name__ == "__main__":
+    all_results = [r for r in (sequence_statistics(f) for f in FILES_TO_ANALYZE) if r]
+    if all_results:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        save_mutual_information(all_results, os.path.join(OUTPUT_DIR, "mutual_information.csv"))
@@ -0,0 +1,315 @@
+import hashlib
+import math
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --- CONFIGURATION ---
+# Memory is fixed by these parameters, not by the size of the input file.
+TOP_K_CAPACITY = 1000     # Items tracked exactly by each Space-Saving summary.
+SKETCH_EPSILON = 0.0005   # Count-Min over-estimate is at most EPSILON * total tokens...
+SKETCH_DELTA = 0.001      # ...with probability at least 1 - DELTA.
+HLL_PRECISION = 14        # HyperLogLog uses 2**14 registers for the vocabulary estimate.
+CHUNK_BYTES = 8 * 1024 * 1024
+WORKERS = 4
+
+def _hash64(item):
+    """A deterministic 64-bit hash (Python's hash() is salted per process, so it cannot be merged)."""
+    return int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary. Each tracked item keeps an over-estimated count and
+    the maximum over-estimation error, so its true count lies in [count - error, count].
+    """
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def _floor(self):
+        """Upper bound on the count of any item that is not tracked."""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """Merges another summary (or an exact Counter wrapped as one) into this one."""
+        floor_self, floor_other = self._floor(), other._floor()
+        merged_counts, merged_errors = {}, {}
+        for item in self.counts.keys() | other.counts.keys():
+            merged_counts[item] = (self.counts.get(item, floor_self) +
+                                   other.counts.get(item, floor_other))
+            merged_errors[item] = (self.errors.get(item, floor_self) +
+                                   other.errors.get(item, floor_other))
+        kept = sorted(merged_counts, key=merged_counts.get, reverse=True)[:self.capacity]
+        self.counts = {item: merged_counts[item] for item in kept}
+        self.errors = {item: merged_errors[item] for item in kept}
+
+    def update(self, exact_counts):
+        """Adds a chunk's exact counts (a Counter) to the summary."""
+        chunk = SpaceSaving(len(exact_counts) + 1)  # Never full, so untracked items count 0
+        chunk.counts = dict(exact_counts)
+        chunk.errors = dict.fromkeys(exact_counts, 0)
+        self.merge(chunk)
+
+    def most_common(self, n):
+        """Returns the `n` items with the highest counts as (item, count, error) tuples."""
+        ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)[:n]
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+class CountMinSketch:
+    """Count-Min sketch: never under-estimates, over-estimates by <= epsilon * total with probability 1 - delta."""
+    def __init__(self, epsilon=SKETCH_EPSILON, delta=SKETCH_DELTA):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, hashes):
+        """Derives one column per row from a 64-bit hash (Kirsch-Mitzenmacher double hashing)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def update(self, hashes, counts):
+        """Adds a batch of (hash, count) pairs to the sketch."""
+        if not len(hashes):
+            return
+        counts = np.asarray(counts, dtype=np.int64)
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+        self.total += int(counts.sum())
+
+    def estimate(self, item):
+        columns = self._columns([_hash64(item)])
+        return int(self.table[np.arange(self.depth), columns[:, 0]].min())
+
+    def error_bound(self):
+        return math.ceil(self.epsilon * self.total)
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+
+class HyperLogLog:
+    """HyperLogLog cardinality estimator, used for the (approximate) vocabulary size."""
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        if not len(hashes):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        bits = 64 - self.precision
+        index = (hashes >> np.uint64(bits)).astype(np.int64)
+        rest = (hashes & np.uint64((1 << bits) - 1)) | np.uint64(1)
+        # Rank = position of the leftmost 1-bit in the remaining bits
+        rank = (bits - np.floor(np.log2(rest.astype(np.float64))).astype(np.int64)).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(2.0 ** -self.registers.astype(np.float64))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))  # Linear counting for small ranges
+        return int(round(raw))
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+class StreamingStats:
+    """
+    Fixed-memory, mergeable equivalent of the statistics printed by analyze_voynich.full_analysis.
+    Small alphabets (characters, word lengths, first/last characters) are counted exactly.
+    """
+    def __init__(self):
+        self.total_words = 0
+        self.total_length = 0
+        self.words = SpaceSaving()
+        self.bigrams = SpaceSaving()
+        self.word_sketch = CountMinSketch()
+        self.bigram_sketch = CountMinSketch()
+        self.vocabulary = HyperLogLog()
+        self.chars = Counter()
+        self.lengths = Counter()
+        self.starts = Counter()
+        self.ends = Counter()
+        # Kept so that the bigram spanning two merged partials is not lost
+        self.first_word = None
+        self.last_word = None
+
+    def add_words(self, words):
+        """Adds a chunk of consecutive words (a list) to the statistics."""
+        if not words:
+            return
+        word_counts = Counter(words)
+        bigram_counts = Counter(f"{w1} {w2}" for w1, w2 in zip(words, words[1:]))
+        if self.last_word is not None:
+            bigram_counts[f"{self.last_word} {words[0]}"] += 1
+        if self.first_word is None:
+            self.first_word = words[0]
+        self.last_word = words[-1]
+
+        self.total_words += len(words)
+        self._add_counts(word_counts, bigram_counts)
+
+    def _add_counts(self, word_counts, bigram_counts):
+        word_hashes = [_hash64(w) for w in word_counts]
+        self.words.update(word_counts)
+        self.word_sketch.update(word_hashes, list(word_counts.values()))
+        self.vocabulary.update(word_hashes)
+        self.bigrams.update(bigram_counts)
+        self.bigram_sketch.update([_hash64(b) for b in bigram_counts], list(bigram_counts.values()))
+        for word, count in word_counts.items():
+            self.total_length += len(word) * count
+            self.lengths[len(word)] += count
+            self.starts[word[0]] += count
+            self.ends[word[-1]] += count
+            for char in word:
+                self.chars[char] += count
+
+    def merge(self, other):
+        """Merges the statistics of the chunk that immediately follows this one."""
+        if other.total_words == 0:
+            return
+        if self.last_word is not None:
+            boundary = Counter({f"{self.last_word} {other.first_word}": 1})
+            self.bigrams.update(boundary)
+            self.bigram_sketch.update([_hash64(b) for b in boundary], [1])
+        if self.first_word is None:
+            self.first_word = other.first_word
+        self.last_word = other.last_word
+
+        self.total_words += other.total_words
+        self.total_length += other.total_length
+        self.words.merge(other.words)
+        self.bigrams.merge(other.bigrams)
+        self.word_sketch.merge(other.word_sketch)
+        self.bigram_sketch.merge(other.bigram_sketch)
+        self.vocabulary.merge(other.vocabulary)
+        self.chars.update(other.chars)
+        self.lengths.update(other.lengths)
+        self.starts.update(other.starts)
+        self.ends.update(other.ends)
+
+    def top_items(self, summary, sketch, n):
+        """
+        Returns the top `n` items as (item, lower_bound, upper_bound). The upper bound is the
+        tighter of the Space-Saving and Count-Min estimates.
+        """
+        return [(item, count - error, min(count, sketch.estimate(item)))
+                for item, count, error in summary.most_common(n)]
+
+    def char_entropy(self):
+        total = sum(self.chars.values())
+        return -sum((c / total) * math.log2(c / total) for c in self.chars.values())
+
+def _split_ranges(filename, parts):
+    """Splits a file into `parts` byte ranges whose boundaries fall on whitespace."""
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, 'rb') as f:
+        for i in range(1, parts):
+            position = max(size * i // parts, boundaries[-1])
+            f.seek(position)
+            while True:
+                byte = f.read(1)
+                if not byte or byte.isspace():
+                    break
+                position += 1
+            boundaries.append(min(position, size))
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+def _analyze_range(args):
+    """Streams one byte range of a file in CHUNK_BYTES pieces. Runs inside a worker process."""
+    filename, start, end, chunk_bytes = args
+    stats = StreamingStats()
+    carry = b''
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(chunk_bytes, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            block = carry + block
+            # Hold back a word that may continue in the next block
+            cut = max(block.rfind(b' '), block.rfind(b'\n'))
+            if remaining > 0 and cut >= 0:
+                block, carry = block[:cut], block[cut:]
+            else:
+                carry = b''
+            stats.add_words(block.decode('utf-8', errors='ignore').split())
+    stats.add_words(carry.decode('utf-8', errors='ignore').split())
+    return stats
+
+def streaming_analysis(file_input, workers=WORKERS, chunk_bytes=CHUNK_BYTES):
+    """
+    Performs the statistics of analyze_voynich.full_analysis on files of any size,
+    reading them in chunks across a process pool with fixed memory per worker.
+    """
+    print(f"\n--- 🌊 Starting Streaming Analysis on '{file_input}' ---")
+    if not os.path.exists(file_input):
+        print(f"❌ Error: File '{file_input}' not found.")
+        return None
+
+    ranges = _split_ranges(file_input, workers)
+    jobs = [(file_input, start, end, chunk_bytes) for start, end in ranges]
+    stats = StreamingStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_analyze_range, jobs):
+            stats.merge(partial)
+
+    if stats.total_words == 0:
+        print("❌ File is empty.")
+        return None
+
+    print("\n--- 📊 General Statistics ---")
+    print(f"Total number of words: {stats.total_words}")
+    print(f"Number of unique words (HyperLogLog estimate): ~{stats.vocabulary.estimate()}")
+    print(f"Average word length: {stats.total_length / stats.total_words:.2f} characters")
+
+    print("\n--- 🏆 Top 20 Most Common Words (true count lies within the range) ---")
+    for word, low, high in stats.top_items(stats.words, stats.word_sketch, 20):
+        print(f"{word:<15} | {low}..{high} times")
+    print(f"(Tail words: Count-Min over-estimate <= {stats.word_sketch.error_bound()} "
+          f"with probability {1 - SKETCH_DELTA:.3f})")
+
+    print("\n--- 🔬 Structural Analysis ---")
+    print(f"\n💡 Entropy (per character): {stats.char_entropy():.4f} bits")
+    print("\n🗺️ Most common STARTING characters:", [f"'{c}'" for c, _ in stats.starts.most_common(5)])
+    print("🗺️ Most common ENDING characters:  ", [f"'{c}'" for c, _ in stats.ends.most_common(5)])
+    print("📏 Most common word LENGTHS:       ", [length for length, _ in stats.lengths.most_common(5)])
+
+    print("\n🔗 Top 20 Most Common Word Pairs (Bigrams):")
+    for bigram, low, high in stats.top_items(stats.bigrams, stats.bigram_sketch, 20):
+        print(f"'{bigram}': {low}..{high} times")
+    print(f"(Tail bigrams: Count-Min over-estimate <= {stats.bigram_sketch.error_bound()} "
+          f"with probability {1 - SKETCH_DELTA:.3f})")
+
+    print("\n" + "="*53)
+    print(f"--- ✅ Streaming Analysis of '{file_input}' Complete ---")
+    return stats
+
+if __name__ == "__main__":
+    files_to_analyze = [
+        "voynich_super_clean.txt",
+        "generated_clean_normal_temp.txt",
+        "generated_clean_low_temp.txt",
+        "generated_clean_high_temp.txt"
+    ]
+    for file in files_to_analyze:
+        streaming_analysis(file)
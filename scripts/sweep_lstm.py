@@ -0,0 +1,187 @@
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from analyze_voynich import text_statistics
+
+# --- CONFIGURATION ---
+# Every combination of the lists below is trained once and sampled at every temperature.
+GRID = {
+    "embedding_dim": [128, 256],
+    "rnn_units": [256, 512, 1024],
+    "epochs": [20],
+    "seq_length": [100],
+    "batch_size": [64],
+    "learning_rate": [0.001],
+}
+TEMPERATURES = [0.5, 0.7, 1.2]
+NUM_GENERATE = 50000
+START_SEED = "daiin "
+SWEEP_DIR = "sweeps"
+RESULTS_FILE = os.path.join(SWEEP_DIR, "results.csv")
+WORKERS = 4
+# Threads given to TensorFlow inside each job, so that WORKERS jobs together
+# do not oversubscribe the machine's cores.
+THREADS_PER_JOB = max(1, (os.cpu_count() or 1) // WORKERS)
+
+def expand_grid(grid=GRID):
+    """Returns one training configuration (a dict) per combination of grid values."""
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+def job_name(config):
+    """A readable, stable directory name for a training configuration."""
+    return "_".join(f"{key}-{config[key]}" for key in sorted(config))
+
+def _limit_threads(threads):
+    """Process-pool initializer: caps the threads TensorFlow may use in this worker."""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+def _latest_checkpoint(job_dir):
+    """Returns the highest epoch with a saved 'ckpt_{epoch}.weights.h5' in a job directory (0 if none)."""
+    epochs = [int(name[len("ckpt_"):-len(".weights.h5")]) for name in os.listdir(job_dir)
+              if name.startswith("ckpt_") and name.endswith(".weights.h5")]
+    return max(epochs, default=0)
+
+def _training_state(model, job_dir):
+    """
+    The model and optimizer state of a job (Adam moments and step count), kept for its last
+    epoch under 'train_state/ckpt-{epoch}', so an interrupted job resumes exactly where it stopped.
+    """
+    import tensorflow as tf
+    state = tf.train.Checkpoint(model=model, optimizer=model.optimizer)
+    return tf.train.CheckpointManager(state, os.path.join(job_dir, "train_state"), max_to_keep=1)
+
+def run_job(config, sweep_dir=SWEEP_DIR, temperatures=TEMPERATURES, num_generate=NUM_GENERATE):
+    """
+    Trains one configuration (resuming from its last checkpoint), samples it at every
+    temperature and returns one result row per temperature. Runs inside a worker process.
+    """
+    # TensorFlow is imported here, after _limit_threads has configured the worker
+    import numpy as np
+    import tensorflow as tf
+    from lstm_model import (build_model, checkpoint_path, generate_text, load_vocabulary, loss,
+                            make_dataset, reset_model_states)
+
+    job_dir = os.path.join(sweep_dir, job_name(config))
+    os.makedirs(job_dir, exist_ok=True)
+    result_file = os.path.join(job_dir, "result.json")
+    if os.path.exists(result_file):
+        with open(result_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    text, vocab, char2idx, idx2char = load_vocabulary()
+    text_as_int = np.array([char2idx[c] for c in text])
+
+    # 1. Training, resumed from the last completed epoch
+    done_epochs = _latest_checkpoint(job_dir)
+    if done_epochs < config["epochs"]:
+        model = build_model(len(vocab), config["embedding_dim"], config["rnn_units"], config["batch_size"])
+        model.compile(optimizer=tf.keras.optimizers.Adam(config["learning_rate"]), loss=loss)
+        manager = _training_state(model, job_dir)
+        if done_epochs:
+            saved_state = os.path.join(manager.directory, f"ckpt-{done_epochs}")
+            if manager.latest_checkpoint == saved_state:
+                # The optimizer's slots must exist before they can be restored
+                model.optimizer.build(model.trainable_variables)
+                manager.checkpoint.restore(saved_state).assert_existing_objects_matched()
+            else:
+                print(f"⚠️ No optimizer state for epoch {done_epochs} of '{job_name(config)}', "
+                      "resuming from the weights with a fresh optimizer.")
+                model.load_weights(checkpoint_path(done_epochs, job_dir))
+        dataset = make_dataset(text_as_int, config["seq_length"], config["batch_size"])
+        callbacks = [
+            tf.keras.callbacks.ModelCheckpoint(filepath=os.path.join(job_dir, "ckpt_{epoch}.weights.h5"),
+                                               save_weights_only=True),
+            tf.keras.callbacks.LambdaCallback(on_epoch_end=lambda epoch, logs: manager.save(checkpoint_number=epoch + 1)),
+            tf.keras.callbacks.CSVLogger(os.path.join(job_dir, "training_log.csv"), append=True)
+        ]
+        model.fit(dataset, epochs=config["epochs"], initial_epoch=done_epochs, callbacks=callbacks, verbose=0)
+
+    with open(os.path.join(job_dir, "training_log.csv"), 'r', encoding='utf-8') as f:
+        final_loss = float(list(csv.DictReader(f))[-1]["loss"])
+
+    # 2. Generation and analysis at every temperature
+    model = build_model(len(vocab), config["embedding_dim"], config["rnn_units"], batch_size=1)
+    model.load_weights(checkpoint_path(config["epochs"], job_dir))
+    rows = []
+    for temperature in temperatures:
+        output_file = os.path.join(job_dir, f"generated_temp_{temperature}.txt")
+        reset_model_states(model)
+        started = time.perf_counter()
+        generated = generate_text(model, START_SEED, char2idx, idx2char, num_generate, temperature)
+        elapsed = time.perf_counter() - started
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(generated)
+
+        stats = text_statistics(generated.split())
+        rows.append({
+            "job": job_name(config),
+            **config,
+            "temperature": temperature,
+            "final_loss": round(final_loss, 4),
+            "generation_seconds": round(elapsed, 1),
+            "chars_per_second": round(len(generated) / elapsed, 1),
+            "total_words": stats["total_words"],
+            "unique_words": stats["unique_words"],
+            "avg_word_length": round(stats["avg_word_length"], 4),
+            "entropy": round(stats["entropy"], 4),
+            "top_words": " ".join(w for w, _ in stats["word_counts"].most_common(5)),
+            "output_file": output_file
+        })
+
+    # The result file marks the job as complete for later runs
+    with open(result_file, 'w', encoding='utf-8') as f:
+        json.dump(rows, f, indent=2)
+    return rows
+
+def save_results(rows, filename=RESULTS_FILE):
+    """Writes every collected result row into one CSV table."""
+    if not rows:
+        print("⚠️ No results to save.")
+        return
+    rows = sorted(rows, key=lambda r: (r["job"], r["temperature"]))
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✅ Results table saved to '{filename}' ({len(rows)} rows)")
+
+def run_sweep(grid=GRID, workers=WORKERS, threads_per_job=THREADS_PER_JOB):
+    """
+    Runs every configuration of the grid across a local process pool. Completed jobs are
+    skipped and interrupted ones resume from their last checkpoint (weights and optimizer), so the sweep can
+    simply be restarted after an interruption.
+    """
+    configs = expand_grid(grid)
+    os.makedirs(SWEEP_DIR, exist_ok=True)
+    print(f"--- 🧪 Starting sweep: {len(configs)} configurations x {len(TEMPERATURES)} temperatures ---")
+    print(f"Using {workers} workers with {threads_per_job} TensorFlow threads each.")
+
+    rows = []
+    # 'spawn' gives every worker a fresh interpreter, so TensorFlow is never forked
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_limit_threads, initargs=(threads_per_job,)) as pool:
+        futures = {pool.submit(run_job, config): config for config in configs}
+        for future in as_completed(futures):
+            name = job_name(futures[future])
+            try:
+                rows.extend(future.result())
+                print(f"✅ Job '{name}' complete.")
+            except Exception as e:
+                print(f"❌ Job '{name}' failed: {e} (it will resume on the next run)")
+
+    save_results(rows)
+
+if __name__ == "__main__":
+    run_sweep()
@@ -0,0 +1,258 @@
+import csv
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from deep_cleaning_voynich import clean_line
+
+# --- CONFIGURATION ---
+TRANSCRIPTION_FILE = "voynich.txt"   # An interlinear file with one line per locus and transcriber.
+OUTPUT_DIR = "transcribers"
+CONSENSUS_FILE = "voynich_consensus.txt"
+WORKERS = 4
+CHUNK_SIZE = 1024                    # Loci sent to a worker at a time.
+BATCH_SIZE = 512                     # Pairs of readings aligned together in one DP table.
+# Order of preference when several readings tie for medoid (e.g. a locus read by only two
+# transcribers). Unlisted transcribers come after these, alphabetically.
+PREFERRED_TRANSCRIBERS = ["H", "C", "F", "U", "V", "N"]
+
+# '<f70r1.3,@Lz;H>' -> locus 'f70r1.3', locus type '@Lz', transcriber 'H'.
+# Older interlinear files have no locus type: '<f1r.P1.1;H>'.
+LOCUS_REGEX = re.compile(r'\s*<(f\d+[rv]\d*\.[^,;>]+)(?:,([^;>]+))?;(\w+)>')
+
+def parse_reading(line):
+    """Returns (locus, transcriber, words) for a transcription line, or None."""
+    match = LOCUS_REGEX.match(line)
+    if not match:
+        return None
+    text = clean_line(line)
+    return match.group(1), match.group(3), text.split() if text else []
+
+def load_readings(filename=TRANSCRIPTION_FILE):
+    """
+    Groups the parallel readings of every locus by transcriber.
+    Returns a dict locus -> {transcriber: words}, in the order loci first appear.
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        print(f"❌ ERROR: Original transcription file '{filename}' not found.")
+        return None
+
+    readings = {}
+    for line in lines:
+        parsed = parse_reading(line)
+        if parsed:
+            locus, transcriber, words = parsed
+            readings.setdefault(locus, {})[transcriber] = words
+    transcribers = Counter(t for versions in readings.values() for t in versions)
+    print(f"✅ {len(readings)} loci loaded from '{filename}', "
+          f"transcribers: {', '.join(f'{t} ({n})' for t, n in sorted(transcribers.items()))}.")
+    return readings
+
+def _trace_back(a, b, table):
+    """Recovers the aligned pairs of two readings from their DP table as nested lists (None marks a gap)."""
+    pairs, i, j = [], len(a), len(b)
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and table[i][j] == table[i - 1][j - 1] + (a[i - 1] != b[j - 1]):
+            pairs.append((a[i - 1], b[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and table[i][j] == table[i - 1][j] + 1:
+            pairs.append((a[i - 1], None))
+            i -= 1
+        else:
+            pairs.append((None, b[j - 1]))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+def align_batch(jobs, batch_size=BATCH_SIZE):
+    """
+    Token-level Levenshtein alignment of many pairs of readings at once. Pairs of similar
+    length are padded into one (pairs x rows x columns) table and filled a row at a time
+    for the whole batch: substitutions and deletions are elementwise, and the insertion
+    chain along a row is a running minimum (D[j] = min_k (C[k] + j - k)).
+    Returns (distance, aligned pairs) for each (a, b) job, in order.
+    """
+    vocab = {}
+    encoded = [([vocab.setdefault(w, len(vocab)) for w in a], [vocab.setdefault(w, len(vocab)) for w in b])
+               for a, b in jobs]
+    order = sorted(range(len(jobs)), key=lambda k: (len(jobs[k][0]), len(jobs[k][1])))
+    results = [None] * len(jobs)
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        n = max(len(jobs[k][0]) for k in batch)
+        m = max(len(jobs[k][1]) for k in batch)
+        # Padding uses different sentinels on each side, so it never matches
+        ids_a = np.full((len(batch), n), -1, dtype=np.int64)
+        ids_b = np.full((len(batch), m), -2, dtype=np.int64)
+        for row, k in enumerate(batch):
+            ids_a[row, :len(encoded[k][0])] = encoded[k][0]
+            ids_b[row, :len(encoded[k][1])] = encoded[k][1]
+
+        columns = np.arange(m + 1)
+        table = np.empty((len(batch), n + 1, m + 1), dtype=np.int32)
+        table[:, 0] = columns
+        candidates = np.empty((len(batch), m + 1), dtype=np.int32)
+        for i in range(1, n + 1):
+            previous = table[:, i - 1]
+            candidates[:, 0] = i
+            candidates[:, 1:] = np.minimum(previous[:, :-1] + (ids_b != ids_a[:, i - 1:i]), previous[:, 1:] + 1)
+            table[:, i] = np.minimum.accumulate(candidates - columns, axis=1) + columns
+
+        for row, k in enumerate(batch):
+            a, b = jobs[k]
+            cells = table[row, :len(a) + 1, :len(b) + 1].tolist()  # Python lists index much faster than numpy
+            results[k] = (cells[-1][-1], _trace_back(a, b, cells))
+    return results
+
+def align_tokens(a, b):
+    """Aligns a single pair of readings. Returns (distance, aligned pairs)."""
+    return align_batch([(a, b)])[0]
+
+def vote_consensus(backbone, alignments):
+    """
+    Majority vote over a backbone reading and the alignments of the other readings to it:
+    each backbone token is kept, replaced, or deleted (a gap vote). Insertions relative to
+    the backbone are not voted on. Ties keep the backbone's token.
+    """
+    votes = [Counter({token: 1}) for token in backbone]
+    for pairs in alignments:
+        position = 0
+        for backbone_token, token in pairs:
+            if backbone_token is None:
+                continue
+            votes[position][token] += 1
+            position += 1
+
+    consensus = []
+    for token, vote in zip(backbone, votes):
+        best = max(vote.values())
+        winner = token if vote[token] == best else next(t for t, n in vote.most_common() if n == best)
+        if winner is not None:
+            consensus.append(winner)
+    return consensus
+
+def preference_rank(transcriber, preferred=PREFERRED_TRANSCRIBERS):
+    """Sort key of a transcriber in the medoid tie-break: its place in the preference list, then its name."""
+    return (preferred.index(transcriber) if transcriber in preferred else len(preferred), transcriber)
+
+def _align_chunk(chunk):
+    """
+    Worker: consensus and disagreement counts for a list of (locus, versions), with every
+    alignment of the chunk batched together. The medoid reading of a locus (smallest total
+    distance to the others, ties going to the preferred transcriber) is the consensus
+    backbone. Counts are (differing tokens, aligned positions), pairwise and against the
+    consensus.
+    """
+    # 1. Every pair of readings of every locus
+    jobs, keys = [], []
+    for locus, versions in chunk:
+        transcribers = sorted(versions)
+        for x, first in enumerate(transcribers):
+            for second in transcribers[x + 1:]:
+                jobs.append((versions[first], versions[second]))
+                keys.append((locus, first, second))
+    aligned = dict(zip(keys, align_batch(jobs)))
+
+    # 2. Consensus from the medoid and its existing alignments (flipped when needed)
+    consensus_of, jobs, keys = {}, [], []
+    for locus, versions in chunk:
+        transcribers = sorted(versions)
+        total = Counter()
+        for x, first in enumerate(transcribers):
+            for second in transcribers[x + 1:]:
+                distance, _ = aligned[(locus, first, second)]
+                total[first] += distance
+                total[second] += distance
+        medoid = min(transcribers, key=lambda t: (total[t], preference_rank(t)))
+        alignments = []
+        for other in transcribers:
+            if other == medoid:
+                continue
+            if (locus, medoid, other) in aligned:
+                alignments.append(aligned[(locus, medoid, other)][1])
+            else:
+                alignments.append([(b, a) for a, b in aligned[(locus, other, medoid)][1]])
+        consensus_of[locus] = vote_consensus(versions[medoid], alignments)
+        for transcriber in transcribers:
+            jobs.append((versions[transcriber], consensus_of[locus]))
+            keys.append((locus, transcriber))
+    versus_consensus = dict(zip(keys, align_batch(jobs)))
+
+    # 3. Per-locus counts
+    results = []
+    for locus, versions in chunk:
+        transcribers = sorted(versions)
+        pairwise = {(first, second): (aligned[(locus, first, second)][0], len(aligned[(locus, first, second)][1]))
+                    for x, first in enumerate(transcribers) for second in transcribers[x + 1:]}
+        against_consensus = {t: (versus_consensus[(locus, t)][0], len(versus_consensus[(locus, t)][1]))
+                             for t in transcribers}
+        results.append((locus, consensus_of[locus], pairwise, against_consensus))
+    return results
+
+def align_all(readings, workers=WORKERS, chunk_size=CHUNK_SIZE):
+    """Aligns every locus across a process pool. Returns the per-locus results in locus order."""
+    items = list(readings.items())
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [result for chunk in pool.map(_align_chunk, chunks) for result in chunk]
+
+def disagreement_rates(results):
+    """Sums the per-locus counts into rates: {pair: rate} and {transcriber: rate vs consensus}."""
+    pairwise, against_consensus = Counter(), Counter()
+    pairwise_positions, consensus_positions = Counter(), Counter()
+    for _, _, pairs, versus in results:
+        for key, (distance, positions) in pairs.items():
+            pairwise[key] += distance
+            pairwise_positions[key] += positions
+        for key, (distance, positions) in versus.items():
+            against_consensus[key] += distance
+            consensus_positions[key] += positions
+    pair_rates = {key: pairwise[key] / pairwise_positions[key] for key in pairwise_positions if pairwise_positions[key]}
+    consensus_rates = {key: (against_consensus[key] / consensus_positions[key], consensus_positions[key])
+                       for key in consensus_positions if consensus_positions[key]}
+    return pair_rates, consensus_rates
+
+def save_corpus(lines, filename):
+    """Writes one reading per line, in the format of voynich_super_clean.txt."""
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("\n".join(" ".join(words) for words in lines if words))
+    print(f"✅ Corpus saved to '{filename}' ({sum(len(w) for w in lines)} words).")
+
+def save_disagreements(pair_rates, consensus_rates, filename):
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["transcriber", "other", "disagreement_rate"])
+        for transcriber, (rate, _) in sorted(consensus_rates.items()):
+            writer.writerow([transcriber, "consensus", f"{rate:.6f}"])
+        for (first, second), rate in sorted(pair_rates.items()):
+            writer.writerow([first, second, f"{rate:.6f}"])
+    print(f"✅ Disagreement rates saved to '{filename}'")
+
+if __name__ == "__main__":
+    readings = load_readings()
+    if readings:
+        print(f"\n--- 🔀 Aligning variant readings with {WORKERS} workers ---")
+        results = align_all(readings)
+        pair_rates, consensus_rates = disagreement_rates(results)
+
+        print(f"\n{'Transcriber':<12} | {'Aligned tokens':>14} | {'Disagreement vs consensus':>25}")
+        print("-" * 58)
+        for transcriber, (rate, positions) in sorted(consensus_rates.items(), key=lambda item: item[1][0]):
+            print(f"{transcriber:<12} | {positions:>14} | {rate:>25.2%}")
+        if pair_rates:
+            print("\nPairwise disagreement (most divergent first):")
+            for (first, second), rate in sorted(pair_rates.items(), key=lambda item: -item[1])[:20]:
+                print(f"  {first} vs {second}: {rate:.2%}")
+
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        save_corpus([consensus for _, consensus, _, _ in results], CONSENSUS_FILE)
+        for transcriber in sorted(consensus_rates):
+            lines = [versions[transcriber] for versions in readings.values() if transcriber in versions]
+            save_corpus(lines, os.path.join(OUTPUT_DIR, f"voynich_{transcriber}.txt"))
+        save_disagreements(pair_rates, consensus_rates, os.path.join(OUTPUT_DIR, "disagreement.csv"))
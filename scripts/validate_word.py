@@ -63,13 +63,16 @@ def peel_word(word):
 
 class VoynichValidator:
     """A class to validate if a word conforms to the discovered Voynich grammar."""
-    def __init__(self):
+    def __init__(self, suggestion_index=None):
         print("--- Initializing Voynich Grammatical Validator ---")
         self.prefixes = load_lexicon("prefixes.txt")
         self.roots = load_lexicon("roots.txt")
         self.suffixes = load_lexicon("suffixes.txt")
         self.prefix_root_rules = load_rules("prefix_root_rules.txt")
         self.root_suffix_rules = load_rules("root_suffix_rules.txt")
+        # Optional nearest-word index (see nearest_word_index.py) used to
+        # suggest the closest grammatical words when a word is rejected.
+        self.suggestion_index = suggestion_index
         
         self.is_ready = all([self.prefixes, self.roots, self.suffixes, 
                              self.prefix_root_rules, self.root_suffix_rules])
@@ -78,19 +81,14 @@ class VoynichValidator:
         else:
             print("❌ Validator initialization failed due to missing files.")
 
-    def is_valid_word(self, word):
+    def check_word(self, word):
         """
-        Checks if a word is 'grammatically legal' according to our model.
-        Returns True if valid, False otherwise.
+        Applies the grammatical rules to a word without printing anything.
+        Returns a tuple: (is_valid, reason).
         """
-        if not self.is_ready:
-            print("Validator is not ready. Cannot perform check.")
-            return False
-
         # RULE 1: Check if the entire word is a known root.
         if word in self.roots:
-            print(f"'{word}' -> ✅ ACCEPTED: Word is a known core root.")
-            return True
+            return True, "Word is a known core root."
 
         prefix, root, suffix = peel_word(word)
 
@@ -99,29 +97,49 @@ class VoynichValidator:
             # For now, let's accept any valid prefix + suffix combination.
             # A more advanced model could have specific prefix-suffix rules.
             if prefix in self.prefixes and suffix in self.suffixes:
-                 print(f"'{word}' -> ✅ ACCEPTED: Valid Prefix-Suffix structure ('{prefix}-{suffix}').")
-                 return True
+                return True, f"Valid Prefix-Suffix structure ('{prefix}-{suffix}')."
 
         # RULE 3: Check for Prefix + Root + Suffix structure.
         if root not in self.roots:
-            print(f"'{word}' -> ❌ REJECTED: Root '{root}' not found in lexicon.")
-            return False
+            return False, f"Root '{root}' not found in lexicon."
         if prefix and prefix not in self.prefixes:
-            print(f"'{word}' -> ❌ REJECTED: Prefix '{prefix}' not found in lexicon.")
-            return False
+            return False, f"Prefix '{prefix}' not found in lexicon."
         if suffix and suffix not in self.suffixes:
-            print(f"'{word}' -> ❌ REJECTED: Suffix '{suffix}' not found in lexicon.")
-            return False
+            return False, f"Suffix '{suffix}' not found in lexicon."
 
         if prefix and (prefix, root) not in self.prefix_root_rules:
-            print(f"'{word}' -> ❌ REJECTED: Combination rule '{prefix}-{root}' not found.")
-            return False
+            return False, f"Combination rule '{prefix}-{root}' not found."
         if suffix and (root, suffix) not in self.root_suffix_rules:
-            print(f"'{word}' -> ❌ REJECTED: Combination rule '{root}-{suffix}' not found.")
+            return False, f"Combination rule '{root}-{suffix}' not found."
+
+        return True, "Follows all discovered grammatical rules."
+
+    def is_valid_word(self, word, verbose=True):
+        """
+        Checks if a word is 'grammatically legal' according to our model.
+        Returns True if valid, False otherwise.
+        """
+        if not self.is_ready:
+            print("Validator is not ready. Cannot perform check.")
             return False
-            
-        print(f"'{word}' -> ✅ ACCEPTED: Follows all discovered grammatical rules.")
-        return True
+
+        is_valid, reason = self.check_word(word)
+        if not verbose:
+            return is_valid
+
+        if is_valid:
+            print(f"'{word}' -> ✅ ACCEPTED: {reason}")
+            return True
+
+        print(f"'{word}' -> ❌ REJECTED: {reason}")
+        if self.suggestion_index is not None:
+            suggestions = self.suggestion_index.lookup(word)
+            if not suggestions:
+                print("    ↳ No grammatical word found within the search distance.")
+            for suggestion in suggestions:
+                print(f"    ↳ Did you mean '{suggestion['word']}'? "
+                      f"({suggestion['distance']} edit(s): {', '.join(suggestion['edits'])})")
+        return False
 
 
 if __name__ == "__main__":
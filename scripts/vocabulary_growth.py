@@ -0,0 +1,156 @@
+import csv
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from chart_renderer import render_charts, sheet_job
+from generation_monitor import ZIPF_TOP_N
+
+# --- CONFIGURATION ---
+FILES_TO_ANALYZE = [
+    "voynich_super_clean.txt",
+    "generated_clean_normal_temp.txt",
+    "generated_clean_low_temp.txt",
+    "generated_clean_high_temp.txt"
+]
+EXTRA_FILES_PATTERN = "generated_*.txt"   # Any other generated file found is analyzed too.
+NUM_CHECKPOINTS = 60                      # Log-spaced token counts at which the curves are sampled.
+ROLLING_WINDOW = 10                       # Checkpoints used by the rolling Heaps fit.
+WORKERS = 4
+OUTPUT_DIR = "growth"
+CHART_FILE = "charts/vocabulary_growth.png"
+
+def log_checkpoints(total, count=NUM_CHECKPOINTS):
+    """Log-spaced token positions from 1 to `total` (always including `total`)."""
+    return np.unique(np.append(np.geomspace(1, total, count).astype(np.int64), total))
+
+def occurrence_numbers(ids):
+    """For every token, how many times its word has occurred so far (1 = first occurrence)."""
+    order = np.argsort(ids, kind='stable')
+    sorted_ids = ids[order]
+    group_start = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+    starts = np.repeat(group_start, np.diff(np.r_[group_start, len(ids)]))
+    occurrence = np.empty(len(ids), dtype=np.int64)
+    occurrence[order] = np.arange(len(ids)) - starts + 1
+    return occurrence
+
+def least_squares_slope(x, y):
+    x_mean, y_mean = x.mean(), y.mean()
+    variance = np.sum((x - x_mean) ** 2)
+    return float(np.sum((x - x_mean) * (y - y_mean)) / variance) if variance else 0.0
+
+def rolling_slopes(x, y, window=ROLLING_WINDOW):
+    """Least-squares slope over the last `window` points at every point (cumulative sums, no loop)."""
+    def windowed(values):
+        cumulative = np.concatenate([[0.0], np.cumsum(values)])
+        start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+        return cumulative[1:] - cumulative[start]
+    n = windowed(np.ones_like(x))
+    sx, sy, sxy, sxx = windowed(x), windowed(y), windowed(x * y), windowed(x * x)
+    denominator = n * sxx - sx ** 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, (n * sxy - sx * sy) / denominator, np.nan)
+
+def growth_curves(filename):
+    """
+    Streams the tokens of a corpus once and returns its growth table: types, hapax and
+    dis legomena at every log-spaced checkpoint come from cumulative sums of per-token
+    events (a word's 1st, 2nd and 3rd occurrence); the Zipf slope is refitted at each
+    checkpoint from word counts updated incrementally between checkpoints.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        words = f.read().split()
+    if not words:
+        return None
+    _, ids = np.unique(np.array(words), return_inverse=True)
+    occurrence = occurrence_numbers(ids)
+
+    # Event streams: a type appears at its 1st occurrence; a hapax appears at the 1st and
+    # disappears at the 2nd; a dis legomenon appears at the 2nd and disappears at the 3rd
+    types = np.cumsum(occurrence == 1)
+    hapax = np.cumsum((occurrence == 1).astype(np.int64) - (occurrence == 2))
+    dis_legomena = np.cumsum((occurrence == 2).astype(np.int64) - (occurrence == 3))
+
+    checkpoints = log_checkpoints(len(ids))
+    counts = np.zeros(ids.max() + 1, dtype=np.int64)
+    zipf_slopes, previous = [], 0
+    for checkpoint in checkpoints:
+        counts += np.bincount(ids[previous:checkpoint], minlength=len(counts))
+        previous = checkpoint
+        top = np.sort(counts[counts > 0])[::-1][:ZIPF_TOP_N]
+        ranks = np.arange(1, len(top) + 1)
+        zipf_slopes.append(least_squares_slope(np.log(ranks), np.log(top)) if len(top) > 1 else 0.0)
+
+    at = checkpoints - 1
+    log_tokens, log_types = np.log(checkpoints), np.log(types[at])
+    table = {
+        "tokens": checkpoints,
+        "types": types[at],
+        "hapax": hapax[at],
+        "dis_legomena": dis_legomena[at],
+        "type_token_ratio": types[at] / checkpoints,
+        "hapax_ratio": hapax[at] / types[at],
+        "heaps_beta": rolling_slopes(log_tokens, log_types),
+        "zipf_slope": np.array(zipf_slopes),
+    }
+    # Global Heaps fit V = K * N^beta, over the checkpoints past the first hundred tokens
+    fit = checkpoints >= min(100, checkpoints[-1])
+    beta = least_squares_slope(log_tokens[fit], log_types[fit])
+    heaps_k = float(np.exp(np.mean(log_types[fit] - beta * log_tokens[fit])))
+    return {"file": filename, "table": table, "heaps_beta": beta, "heaps_k": heaps_k}
+
+def save_growth_table(result, output_dir=OUTPUT_DIR):
+    name = os.path.splitext(os.path.basename(result["file"]))[0]
+    filename = os.path.join(output_dir, f"growth_{name}.csv")
+    table = result["table"]
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(table.keys())
+        for row in zip(*table.values()):
+            writer.writerow([f"{v:.6g}" if isinstance(v, float) else int(v) for v in row])
+    print(f"✅ Growth table saved to '{filename}'")
+
+def growth_chart_jobs(results):
+    """One curves job per growth statistic, every corpus overlaid (the legend on the first panel only)."""
+    panels = [
+        ("types", "Vocabulary Size (Heaps)", "Types", True),
+        ("hapax_ratio", "Hapax Legomena / Types", "Ratio", False),
+        ("heaps_beta", f"Rolling Heaps Exponent ({ROLLING_WINDOW} checkpoints)", "Beta", False),
+        ("zipf_slope", f"Zipf Slope (top {ZIPF_TOP_N} ranks)", "Slope", False),
+    ]
+    return [{
+        "template": "curves",
+        "output": os.path.join(OUTPUT_DIR, f"growth_{key}.png"),
+        "data": {
+            "title": title, "xlabel": "Tokens", "ylabel": ylabel, "log_x": True, "log_y": log_y, "legend": i == 0,
+            "series": [{"name": os.path.basename(result["file"]), "x": result["table"]["tokens"].tolist(),
+                        "y": result["table"][key].tolist()} for result in results],
+        }
+    } for i, (key, title, ylabel, log_y) in enumerate(panels)]
+
+def plot_growth(results, chart_name=CHART_FILE):
+    """Overlays the growth curves of every corpus on one 2x2 chart."""
+    print(f"\n📊 Creating vocabulary growth chart...")
+    render_charts([sheet_job(growth_chart_jobs(results), "Vocabulary Growth", chart_name, columns=2)], workers=1)
+
+if __name__ == "__main__":
+    files = FILES_TO_ANALYZE + sorted(set(glob.glob(EXTRA_FILES_PATTERN)) - set(FILES_TO_ANALYZE))
+    files = [f for f in files if os.path.exists(f)]
+    print(f"--- 📈 Vocabulary growth of {len(files)} corpora ({WORKERS} workers) ---")
+    with ProcessPoolExecutor(max_workers=WORKERS) as pool:
+        results = [r for r in pool.map(growth_curves, files) if r]
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    print(f"\n{'File':<36} | {'Tokens':>8} | {'Types':>7} | {'Hapax':>7} | {'Heaps K':>8} | {'Heaps beta':>10} | {'Zipf slope':>10}")
+    print("-" * 102)
+    for result in results:
+        table = result["table"]
+        print(f"{os.path.basename(result['file']):<36} | {table['tokens'][-1]:>8} | {table['types'][-1]:>7} | "
+              f"{table['hapax'][-1]:>7} | {result['heaps_k']:>8.2f} | {result['heaps_beta']:>10.3f} | "
+              f"{table['zipf_slope'][-1]:>10.3f}")
+    for result in results:
+        save_growth_table(result)
+    if results:
+        plot_growth(results)
@@ -0,0 +1,157 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from nearest_word_index import deletion_neighborhood, load_attested_words
+
+# --- CONFIGURATION ---
+CORPUS_FILE = "voynich_super_clean.txt"
+FAMILY_FILE = "word_families.txt"
+MAX_DISTANCE = 1     # Words within this edit distance are linked into the same family.
+MIN_FREQUENCY = 1    # Rarer word types are left out of the clustering (and stay on their own).
+WORKERS = 4
+CHUNK_SIZE = 20000   # Candidate pairs verified per task.
+
+def bounded_distance(a, b, limit):
+    """Levenshtein distance of two words, or limit + 1 as soon as it must exceed `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+def candidate_pairs(words, max_distance=MAX_DISTANCE):
+    """
+    Blocking: two words within distance k share a string reachable by deleting at most
+    k characters from each, so only words in the same deletion bucket are compared.
+    Returns a set of (i, j) index pairs with i < j.
+    """
+    buckets = {}
+    for index, word in enumerate(words):
+        for key in deletion_neighborhood(word, max_distance):
+            buckets.setdefault(key, []).append(index)
+    pairs = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pairs.add((members[x], members[y]))
+    return pairs
+
+def _verify_chunk(args):
+    """Worker: keeps the candidate pairs whose true edit distance is within the limit."""
+    pairs, max_distance = args
+    return [(a, b, d) for a, b in pairs if (d := bounded_distance(a, b, max_distance)) <= max_distance]
+
+class UnionFind:
+    """Disjoint sets with path halving and union by size."""
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, x):
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+def find_families(word_counts, max_distance=MAX_DISTANCE, min_frequency=MIN_FREQUENCY, workers=WORKERS):
+    """
+    Groups the vocabulary into families of near-duplicates: every member is within
+    max_distance of the family's head, its most frequent member, which names the family.
+    Returns (dict word -> family, list of verified (word, word, distance) links).
+    """
+    words = sorted(w for w, c in word_counts.items() if c >= min_frequency)
+    pairs = sorted(candidate_pairs(words, max_distance))
+    print(f"✅ Blocking: {len(pairs)} candidate pairs instead of {len(words) * (len(words) - 1) // 2} "
+          f"for {len(words)} word types.")
+
+    jobs = [([(words[a], words[b]) for a, b in pairs[i:i + CHUNK_SIZE]], max_distance)
+            for i in range(0, len(pairs), CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        links = [link for chunk in pool.map(_verify_chunk, jobs) for link in chunk]
+    print(f"✅ Verification: {len(links)} pairs within edit distance {max_distance}.")
+
+    # Star families: links are taken from the most frequent words down, and a word only
+    # joins a family through a link to the family's head (its most frequent member).
+    # Plain single linkage would chain most of the vocabulary into one component.
+    index = {w: i for i, w in enumerate(words)}
+    frequency = [word_counts[w] for w in words]
+    links.sort(key=lambda link: sorted((-word_counts[link[0]], -word_counts[link[1]])))
+    sets = UnionFind(len(words))
+    head = list(range(len(words)))
+    for a, b, _ in links:
+        a, b = index[a], index[b]
+        if (frequency[b], words[b]) > (frequency[a], words[a]):
+            a, b = b, a
+        root_a, root_b = sets.find(a), sets.find(b)
+        # `a` must lead its family, and `b` must still be on its own
+        if root_a == root_b or head[root_a] != a or sets.size[root_b] > 1:
+            continue
+        sets.union(a, b)
+        head[sets.find(a)] = a
+
+    families = {word: words[head[sets.find(index[word])]] for word in words}
+    return families, links
+
+def save_families(families, word_counts, filename=FAMILY_FILE):
+    """Writes the family table (families with more than one member), largest families first."""
+    by_family = {}
+    for word, family in families.items():
+        by_family.setdefault(family, []).append(word)
+    totals = Counter({family: sum(word_counts[w] for w in members) for family, members in by_family.items()})
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(f"# Voynich Word Families (edit distance <= {MAX_DISTANCE})\n")
+        f.write("# Word | Family | Frequency\n")
+        f.write("="*32 + "\n")
+        for family, total in totals.most_common():
+            members = by_family[family]
+            if len(members) < 2:
+                continue
+            for word in sorted(members, key=lambda w: -word_counts[w]):
+                f.write(f"{word:<15} | {family:<15} | {word_counts[word]}\n")
+    print(f"✅ Family table saved to '{filename}'")
+
+def load_families(filename=FAMILY_FILE):
+    """Loads a family table into a dict word -> family (words not listed are their own family)."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            rows = [line.split('|') for line in f if not line.startswith('#') and '|' in line]
+        families = {row[0].strip(): row[1].strip() for row in rows}
+        print(f"✅ Family table '{filename}' loaded: {len(families)} words in {len(set(families.values()))} families.")
+        return families
+    except FileNotFoundError:
+        print(f"❌ ERROR: Family file '{filename}' not found. Please run word_families.py first.")
+        return None
+
+if __name__ == "__main__":
+    word_counts = load_attested_words(CORPUS_FILE)
+    if word_counts:
+        print(f"\n--- 👪 Near-duplicate word families (edit distance <= {MAX_DISTANCE}) ---")
+        families, links = find_families(word_counts)
+        sizes = Counter(families.values())
+        multi = {f: n for f, n in sizes.items() if n > 1}
+        print(f"\nFound {len(multi)} families with 2+ members "
+              f"({sum(multi.values())} of {len(families)} word types).")
+        print("\nLargest families by total frequency:")
+        totals = Counter()
+        for word, family in families.items():
+            totals[family] += word_counts[word]
+        for family, total in [(f, t) for f, t in totals.most_common() if f in multi][:10]:
+            members = sorted((w for w, f in families.items() if f == family), key=lambda w: -word_counts[w])
+            print(f"  {family:<12} | {total:>6} tokens | {sizes[family]:>4} members | {', '.join(members[:8])}"
+                  f"{', ...' if len(members) > 8 else ''}")
+        save_families(families, word_counts)